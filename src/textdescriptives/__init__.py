@@ -1,5 +1,30 @@
 from .about import __title__, __version__  # noqa: F401
-from .components.quality import QualityThresholds  # noqa: F401
-from .extractors import extract_df, extract_dict, extract_metrics  # noqa: F401
+from .components.near_duplicates import MinHashLSH  # noqa: F401
+from .components.ngram_lm import NgramLanguageModel  # noqa: F401
+from .components.quality import (  # noqa: F401
+    CompiledQualityThresholds,
+    QualityThresholds,
+    apply_quality_thresholds,
+    quality_check_names,
+    quality_prefilter,
+)
+from .components.sentence_embeddings import SentenceEmbedder  # noqa: F401
+from .corpus_duplicates import CorpusDuplicateCounter  # noqa: F401
+from .extractors import (  # noqa: F401
+    ExtractionPlan,
+    extract_df,
+    extract_dict,
+    extract_iter,
+    extract_metrics,
+)
 from .load_components import TextDescriptives  # noqa: F401
-from .utils import get_doc_assigns, get_valid_metrics  # noqa: F401
+from .utils import (  # noqa: F401
+    clear_pipeline_pool,
+    clear_syllable_cache,
+    get_doc_assigns,
+    get_valid_metrics,
+    load_syllable_cache,
+    save_syllable_cache,
+    set_pipeline_pool_size,
+    set_syllable_cache_size,
+)
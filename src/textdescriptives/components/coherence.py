@@ -1,35 +1,172 @@
-from typing import Callable, List
+import warnings
+from collections.abc import Iterable, Iterator
+from typing import Callable, Optional
 
 import numpy as np
+from spacy.errors import Warnings
 from spacy.language import Language
 from spacy.tokens import Doc
+from spacy.util import minibatch
+from spacy.vectors import Mode, Vectors
 
+from .sentence_embeddings import SentenceEmbedder
+from .utils import token_features, validate_memo
 
-def n_order_coherence(doc: Doc, order: int) -> List[float]:
-    """Calculate coherence for a `Doc` for a given order.
+_ORDINALS = [
+    "first",
+    "second",
+    "third",
+    "fourth",
+    "fifth",
+    "sixth",
+    "seventh",
+    "eighth",
+    "ninth",
+    "tenth",
+]
+
+
+def _order_name(order: int) -> str:
+    """Get the name of the coherence of an order, e.g. `first_order_coherence`."""
+    if order <= len(_ORDINALS):
+        return f"{_ORDINALS[order - 1]}_order_coherence"
+    return f"order_{order}_coherence"
+
+
+def _token_vectors(doc: Doc) -> np.ndarray:
+    """Get the vectors of the tokens in a `Doc` as a (n_tokens, width) matrix,
+    mirroring `Token.vector` without creating the tokens."""
+    vectors = doc.vocab.vectors
+    if vectors.size == 0 and doc.tensor.size != 0:
+        return doc.tensor
+    if vectors.size == 0:
+        return np.zeros((len(doc), doc.vocab.vectors_length), dtype="f")
+    keys = doc.to_array(vectors.attr)
+    if vectors.mode == Mode.floret:
+        return vectors.get_batch(keys)
+    rows = vectors.find(keys=keys)
+    token_vectors = vectors.data[rows]
+    # words without a vector get a vector of zeros
+    token_vectors[rows < 0] = 0
+    return token_vectors
+
+
+def sentence_vectors(doc: Doc) -> np.ndarray:
+    """Get the L2-normalised vectors of the sentences in a `Doc`.
+
+    The vector of a sentence is the mean of its token vectors, as for
+    `Span.vector`, and is computed for all sentences at once. Sentences without
+    a vector are left as vectors of zeros.
 
     Args:
-        doc: A `Doc` object.
-        order: The order of coherence to calculate. For example, order=1 will
-            calculate the semantic similarity between consecutive sentences. And
-            order=2 will calculate the semantic similarity between sentences that
-            are two sentences apart.
+        doc (Doc): A `Doc` with sentence boundaries.
 
     Returns:
-        A list of floats representing the semantic similarity between sentences
+        np.ndarray: A (n_sentences, width) matrix with a row for each sentence.
     """
+    hooks = doc.user_span_hooks.keys() | doc.user_token_hooks.keys()
+    sent_starts = token_features(doc).sent_starts
+    if (
+        "vector" in hooks
+        or sent_starts is None
+        or not isinstance(doc.vocab.vectors, Vectors)
+    ):
+        matrix = np.array([sent.vector for sent in doc.sents], dtype=np.float64)
+    else:
+        # the mean and the sum of the token vectors have the same direction
+        matrix = np.add.reduceat(
+            _token_vectors(doc).astype(np.float64),
+            sent_starts,
+            axis=0,
+        )
+    return _normalise_rows(matrix)
 
+
+def _normalise_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale the rows of a matrix to unit length, leaving rows of zeros as is."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def _has_vectors(doc: Doc) -> bool:
+    """Whether `Doc.vector` is non-empty, without computing it unless it is set
+    by a hook."""
+    if "vector" in doc.user_hooks or "vector" in doc.user_token_hooks:
+        return doc.vector.size != 0
+    if doc.vocab.vectors.size == 0 and doc.tensor.size != 0:
+        return True
+    return doc.vocab.vectors_length != 0
+
+
+def _sentence_keys(doc: Doc) -> np.ndarray:
+    """Get the token attributes used to match word vectors of each sentence as
+    bytes, which are equal for sentences consisting of the same words."""
+    attrs = doc.to_array(getattr(doc.vocab.vectors, "attr", "ORTH"))
+    sent_starts = token_features(doc).sent_starts
+    if sent_starts is None:
+        # raises an informative error if sentence boundaries are not set
+        sent_starts = [sent.start for sent in doc.sents]
+    bounds = np.append(sent_starts, len(doc)).astype(np.int64)
+    keys = np.empty(len(bounds) - 1, dtype=object)
+    keys[:] = [
+        attrs[start:end].tobytes() for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+    return keys
+
+
+def coherence_values(
+    doc: Doc,
+    orders: Iterable[int],
+    embeddings: Optional[np.ndarray] = None,
+) -> dict[int, list[float]]:
+    """Calculate the coherence of a `Doc` for several orders at once.
+
+    The sentence vectors are normalised once, such that the similarities of all
+    pairs of sentences `order` sentences apart are the row-wise dot products of
+    two offset views of the same matrix. Without `embeddings`, the similarities
+    are the same as those of `Span.similarity`.
+
+    Args:
+        doc: A `Doc` object.
+        orders: The orders of coherence to calculate.
+        embeddings: A (n_sentences, width) array with an embedding of each
+            sentence, used instead of the vectors of the spaCy pipeline. Defaults
+            to None.
+
+    Returns:
+        A dict with a list of similarities between sentences for each order, or
+            `[np.nan]` if the `Doc` has too few sentences for the order.
+    """
     if not doc.has_annotation("SENT_START"):
         raise ValueError(
             "A sentence boundary detector has not been run on this Doc, which is "
             + "required to calculate coherence. Have you added a model with a "
             + "sentencizer and word vectors to the pipeline?",
         )
+    orders = list(orders)
     sents = list(doc.sents)
-    if len(sents) < order + 1:
-        return [np.nan]
+    values: dict[int, list[float]] = {order: [np.nan] for order in orders}
+    orders = [order for order in orders if len(sents) >= order + 1]
+    if not orders:
+        return values
 
-    if doc.vector.size == 0:
+    if embeddings is not None:
+        if len(embeddings) != len(sents):
+            raise ValueError(
+                f"Got {len(embeddings)} sentence embeddings for a Doc with "
+                + f"{len(sents)} sentences.",
+            )
+        matrix = _normalise_rows(embeddings)
+        for order in orders:
+            values[order] = np.einsum(
+                "ij,ij->i",
+                matrix[:-order],
+                matrix[order:],
+            ).tolist()
+        return values
+
+    if not _has_vectors(doc):
         raise ValueError(
             "Sentence vectors are not available. Thus it is not possible to "
             + "calculate the coherence between sentences. Please add a component "
@@ -37,101 +174,195 @@ def n_order_coherence(doc: Doc, order: int) -> List[float]:
             + "See https://spacy.io/usage/vectors-similarity for more details.",
         )
 
-    similarities: List[float] = []
-    for i, sent in enumerate(sents):
-        if i == len(sents) - order:
-            break
-        similarities.append(sent.similarity(sents[i + order]))
-    return similarities
+    if "similarity" in doc.user_span_hooks:
+        for order in orders:
+            values[order] = [
+                sent.similarity(other) for sent, other in zip(sents, sents[order:])
+            ]
+        return values
+
+    if doc.vocab.vectors.n_keys == 0:
+        warnings.warn(Warnings.W007.format(obj="Span"))
+    matrix = sentence_vectors(doc)
+    keys = _sentence_keys(doc)
+    for order in orders:
+        similarities = np.einsum("ij,ij->i", matrix[:-order], matrix[order:])
+        # like Span.similarity, sentences with the same words are identical
+        similarities[keys[:-order] == keys[order:]] = 1.0
+        values[order] = similarities.tolist()
+    return values
+
+
+def n_order_coherence(doc: Doc, order: int) -> list[float]:
+    """Calculate coherence for a `Doc` for a given order.
+
+    Args:
+        doc: A `Doc` object.
+        order: The order of coherence to calculate. For example, order=1 will
+            calculate the semantic similarity between consecutive sentences. And
+            order=2 will calculate the semantic similarity between sentences that
+            are two sentences apart.
+
+    Returns:
+        A list of floats representing the semantic similarity between sentences
+    """
+    return coherence_values(doc, orders=[order])[order]
 
 
 class Coherence:
     """Spacy v.3.0 component that adds attributes with coherence to `Doc` and
     `Span` objects."""
 
-    def __init__(self, nlp: Language):
+    def __init__(self, nlp: Language, max_order: int = 2):
         """Initialise component."""
+        if max_order < 1:
+            raise ValueError(f"max_order must be at least 1, got {max_order}.")
+        self.max_order = max_order
+        self.sentence_embedder: Optional[SentenceEmbedder] = None
         extensions = [
             "first_order_coherence_values",
             "second_order_coherence_values",
+            "coherence_values",
             "coherence",
+            "sentence_embeddings",
         ]
         for extension in extensions:
             if not Doc.has_extension(extension):
                 Doc.set_extension(extension, default=None)
 
-    @staticmethod
-    def _first_order_coherence(doc: Doc) -> List[float]:
-        """Calculate first order coherence for a `Doc`, i.e. the semantic
-        similarity between consecutive sentences."""
-        return n_order_coherence(doc=doc, order=1)
+    def set_sentence_embedder(self, embedder: Optional[SentenceEmbedder]) -> None:
+        """Sets the model used to embed the sentences, instead of the vectors of
+        the spaCy pipeline. With `nlp.pipe`, the sentences of a batch of
+        documents are embedded at once. Note that the embedder is not shared
+        between processes when using `nlp.pipe(..., n_process=n)`.
 
-    @staticmethod
-    def _second_order_coherence(doc: Doc) -> List[float]:
-        """Calculate second order coherence for a `Doc`, i.e. the semantic
-        similarity between sentences that are two sentences apart."""
-        return n_order_coherence(doc, order=2)
+        Args:
+            embedder (Optional[SentenceEmbedder]): The embedder. If None, the
+                vectors of the spaCy pipeline are used.
+        """
+        self.sentence_embedder = embedder
 
-    def coherence(self, doc: Doc) -> None:
+    def _embed(self, docs: list[Doc]) -> list[Optional[np.ndarray]]:
+        """Get the sentence embeddings of each `Doc`, embedding the sentences of
+        all the documents in one call to the embedder. Precomputed embeddings in
+        `doc._.sentence_embeddings` are used as is."""
+        embeddings: list[Optional[np.ndarray]] = [
+            doc._.sentence_embeddings for doc in docs
+        ]
+        if self.sentence_embedder is None:
+            return embeddings
+        sentences: list[list[str]] = [[] for _ in docs]
+        for i, doc in enumerate(docs):
+            # documents with a single sentence have no coherence
+            if embeddings[i] is None and doc.has_annotation("SENT_START"):
+                sents = [sent.text for sent in doc.sents]
+                if len(sents) > 1:
+                    sentences[i] = sents
+        flat = [sentence for sents in sentences for sentence in sents]
+        if not flat:
+            return embeddings
+        matrix = self.sentence_embedder.embed(flat)
+        bounds = np.cumsum([0] + [len(sents) for sents in sentences])
+        for i, sents in enumerate(sentences):
+            if sents:
+                embeddings[i] = matrix[bounds[i] : bounds[i + 1]]
+        return embeddings
+
+    def coherence(self, doc: Doc, embeddings: Optional[np.ndarray] = None) -> None:
         """Calculate mean semantic coherence for a `Doc` and set the coherence
         attribute.
 
         Coherence is calculated by taking the mean of the similarity between
         sentence embeddings. See the documentation for more details.
+
+        Args:
+            doc (Doc): The document.
+            embeddings (Optional[np.ndarray]): The embeddings of the sentences. If
+                None, the vectors of the spaCy pipeline are used. Defaults to None.
         """
-        first_order_coherence = self._first_order_coherence(doc)
-        second_order_coherence = self._second_order_coherence(doc)
+        values = coherence_values(
+            doc,
+            orders=range(1, self.max_order + 1),
+            embeddings=embeddings,
+        )
 
         # get mean of coherence values
-        if len(first_order_coherence) < 2:
-            first_order_coherence_mean = first_order_coherence[0]
-        else:
-            first_order_coherence_mean = np.nanmean(first_order_coherence)
-        if len(second_order_coherence) < 2:
-            second_order_coherence_mean = second_order_coherence[0]
-        else:
-            second_order_coherence_mean = np.nanmean(second_order_coherence)
+        means = {}
+        for order, order_values in values.items():
+            if len(order_values) < 2:
+                means[_order_name(order)] = order_values[0]
+            else:
+                means[_order_name(order)] = np.nanmean(order_values)
 
         # set attributes
-        setattr(doc._, "first_order_coherence_values", first_order_coherence)
-        setattr(doc._, "second_order_coherence_values", second_order_coherence)
-        setattr(
-            doc._,
-            "coherence",
-            {
-                "first_order_coherence": first_order_coherence_mean,
-                "second_order_coherence": second_order_coherence_mean,
-            },
-        )
+        setattr(doc._, "first_order_coherence_values", values.get(1))
+        setattr(doc._, "second_order_coherence_values", values.get(2))
+        setattr(doc._, "coherence_values", values)
+        setattr(doc._, "coherence", means)
 
     def __call__(self, doc: Doc):
         """Run the pipeline component."""
-        self.coherence(doc)
+        validate_memo(doc)
+        self.coherence(doc, embeddings=self._embed([doc])[0])
         return doc
 
+    def pipe(self, stream: Iterable[Doc], batch_size: int = 128) -> Iterator[Doc]:
+        """Run the pipeline component on a stream of documents, embedding the
+        sentences of `batch_size` documents at once.
+
+        Args:
+            stream (Iterable[Doc]): The documents.
+            batch_size (int): Number of documents to embed at once. Defaults to
+                128.
+
+        Yields:
+            Doc: The processed documents.
+        """
+        for docs in minibatch(stream, size=batch_size):
+            for doc in docs:
+                validate_memo(doc)
+            for doc, embeddings in zip(docs, self._embed(docs)):
+                self.coherence(doc, embeddings=embeddings)
+                yield doc
+
 
 @Language.factory(
     "textdescriptives/coherence",
     assigns=[
         "doc._.first_order_coherence_values",
         "doc._.second_order_coherence_values",
+        "doc._.coherence_values",
         "doc._.coherence",
     ],
+    default_config={"max_order": 2},
 )
-def create_coherence_component(nlp: Language, name: str) -> Callable[[Doc], Doc]:
+def create_coherence_component(
+    nlp: Language,
+    name: str,
+    max_order: int,
+) -> Callable[[Doc], Doc]:
     """Allows Coherence to be added to a spaCy pipe using
     nlp.add_pipe("textdescriptives/coherence").
 
     Adding this component to a pipeline sets the following attributes:
         - doc._.first_order_coherence_values
         - doc._.second_order_coherence_values
+        - doc._.coherence_values
         - doc._.coherence
 
+    Sentence embeddings from another model can be used instead of the vectors of
+    the spaCy pipeline, either by passing a `SentenceEmbedder` to
+    `set_sentence_embedder` or by setting `doc._.sentence_embeddings` to an array
+    with a row for each sentence before the component is run.
+
     Args:
         nlp (Language): spaCy language object, does not need to be specified in the
             nlp.add_pipe call.
         name (str): name of the component. Can be optionally specified in the
             nlp.add_pipe call, using the name argument.
+        max_order (int): The highest order of coherence to calculate. Coherence
+            of all orders from 1 up to `max_order` is calculated from a single
+            matrix of sentence vectors. Defaults to 2.
 
     Returns:
         Callable[[Doc], Doc]: The Coherence component to be added to the pipe.
@@ -146,4 +377,4 @@ def create_coherence_component(nlp: Language, name: str) -> Callable[[Doc], Doc]
         >>> # get coherence values
         >>> doc._.coherence
     """
-    return Coherence(nlp)
+    return Coherence(nlp, max_order=max_order)
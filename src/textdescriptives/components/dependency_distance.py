@@ -1,11 +1,49 @@
 """Calculation of statistics related to dependency distance."""
 
 from typing import Callable
+from weakref import WeakKeyDictionary
 
 import numpy as np
 from spacy.language import Language
 from spacy.tokens import Doc, Span, Token
 
+from .utils import (
+    TokenFeatures,
+    memoized_getter,
+    store_extension_values,
+    token_features,
+    validate_memo,
+)
+
+# the token features the distances were computed from and the distances
+_CachedDistances = tuple[TokenFeatures, np.ndarray]
+_DEPENDENCY_DISTANCES: "WeakKeyDictionary[Doc, _CachedDistances]" = WeakKeyDictionary()
+
+
+def dependency_distances(doc: Doc) -> np.ndarray:
+    """Get the dependency distance of each token in a `Doc`, i.e. the distance
+    from the token to its head token, or 0 for the root of a sentence.
+
+    The distances are computed once from the token features of the `Doc` and
+    cached as long as the token features are, such that the distances of its
+    tokens and spans are looked up rather than recomputed. See `validate_memo`
+    for when the cache is invalidated.
+
+    Args:
+        doc (Doc): A spaCy Doc
+
+    Returns:
+        np.ndarray: The dependency distance of each token
+    """
+    features = token_features(doc)
+    cached = _DEPENDENCY_DISTANCES.get(doc)
+    if cached is not None and cached[0] is features:
+        return cached[1]
+    is_root = features.dep == doc.vocab.strings["ROOT"]
+    distances = np.where(is_root, 0, np.abs(features.head))
+    _DEPENDENCY_DISTANCES[doc] = (features, distances)
+    return distances
+
 
 class DependencyDistance:
     """spaCy v.3.0 component that adds attributes to `Doc`, `Span`, and `Token`
@@ -16,14 +54,18 @@ class DependencyDistance:
     dependency distance is calculated on the sentence level.
     """
 
-    def __init__(self, nlp: Language):
+    def __init__(self, nlp: Language, eager: bool = False):
         """Initialise components."""
+        self.eager = eager
         if not Token.has_extension("dependency_distance"):
             Token.set_extension("dependency_distance", getter=self.token_dependency)
         if not Span.has_extension("dependency_distance"):
             Span.set_extension("dependency_distance", getter=self.span_dependency)
         if not Doc.has_extension("dependency_distance"):
-            Doc.set_extension("dependency_distance", getter=self.doc_dependency)
+            Doc.set_extension(
+                "dependency_distance",
+                getter=memoized_getter("dependency_distance", self.doc_dependency),
+            )
 
     def token_dependency(self, token: Token) -> dict:
         """Calculate token level dependency distance, i.e. the distance from a
@@ -36,13 +78,8 @@ class DependencyDistance:
                 - adjacent_dependency: Boolean indicating whether the dependency
                   relation is adjacent to the token
         """
-        dep_dist = 0
-        ajd_dep = False
-        if token.dep_ != "ROOT":
-            dep_dist = abs(token.head.i - token.i)
-            if dep_dist == 1:
-                ajd_dep = True
-        return {"dependency_distance": dep_dist, "adjacent_dependency": ajd_dep}
+        dep_dist = int(dependency_distances(token.doc)[token.i])
+        return {"dependency_distance": dep_dist, "adjacent_dependency": dep_dist == 1}
 
     def span_dependency(self, span: Span) -> dict:
         """Aggregates token level dependency distance on the span level by
@@ -54,12 +91,15 @@ class DependencyDistance:
                 Mean dependency distance and prop_adjacent_dependency_relation:
                 Proportion of adjacent dependency relations
         """
-        dep_dists, adj_deps = zip(
-            *[token._.dependency_distance.values() for token in span],
-        )
+        if len(span) == 0:
+            return {
+                "dependency_distance_mean": np.nan,
+                "prop_adjacent_dependency_relation": np.nan,
+            }
+        dep_dists = dependency_distances(span.doc)[span.start : span.end]
         return {
             "dependency_distance_mean": np.mean(dep_dists),
-            "prop_adjacent_dependency_relation": np.mean(adj_deps),
+            "prop_adjacent_dependency_relation": np.mean(dep_dists == 1),
         }
 
     def doc_dependency(self, doc: Doc) -> dict:
@@ -85,9 +125,16 @@ class DependencyDistance:
                 "prop_adjacent_dependency_relation_mean": np.nan,
                 "prop_adjacent_dependency_relation_std": np.nan,
             }
-        dep_dists, adj_deps = zip(
-            *[sent._.dependency_distance.values() for sent in doc.sents],
-        )
+        sent_starts = token_features(doc).sent_starts
+        if sent_starts is None:
+            # raises an informative error if sentence boundaries are not set
+            sent_starts = np.array([sent.start for sent in doc.sents])
+        # the mean of each sentence, reduced over the segments of the sentences
+        distances = dependency_distances(doc)
+        sent_lengths = np.diff(np.append(sent_starts, len(doc)))
+        dep_dists = np.add.reduceat(distances, sent_starts) / sent_lengths
+        is_adjacent = (distances == 1).astype(np.int64)
+        adj_deps = np.add.reduceat(is_adjacent, sent_starts) / sent_lengths
         return {
             "dependency_distance_mean": np.mean(dep_dists),
             "dependency_distance_std": np.std(dep_dists),
@@ -97,6 +144,9 @@ class DependencyDistance:
 
     def __call__(self, doc: Doc):
         """Run the pipeline component."""
+        validate_memo(doc)
+        if self.eager:
+            store_extension_values(doc, ["dependency_distance"])
         return doc
 
 
@@ -107,10 +157,12 @@ class DependencyDistance:
         "span._.dependency_distance",
         "doc._.dependency_distance",
     ],
+    default_config={"eager": False},
 )
 def create_dependency_distance_component(
     nlp: Language,
     name: str,
+    eager: bool,
 ) -> Callable[[Doc], Doc]:
     """Create spaCy language factory that allows DependencyDistance attributes
     to be added to a pipe using
@@ -126,6 +178,10 @@ def create_dependency_distance_component(
             nlp.add_pipe call.
         name (str): name of the component. Can be optionally specified in the
             nlp.add_pipe call, using the name argument.
+        eager (bool): If True, `doc._.dependency_distance` is computed when the
+            component is run and stored on the `Doc`, instead of when it is
+            accessed. This allows the metrics to be computed in parallel with
+            `nlp.pipe(..., n_process=n)`. Defaults to False.
 
     Returns:
         Callable[[Doc], Doc]: The DependencyDistance component
@@ -140,4 +196,4 @@ def create_dependency_distance_component(
         >>> # access the dependency distance attributes
         >>> doc._.dependency_distance
     """
-    return DependencyDistance(nlp)
+    return DependencyDistance(nlp, eager=eager)
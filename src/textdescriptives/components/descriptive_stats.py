@@ -3,17 +3,25 @@
 from typing import Callable, Dict, Union
 
 import numpy as np
-from pyphen import Pyphen
 from spacy.language import Language
 from spacy.tokens import Doc, Span
 from wasabi import msg
 
-from .utils import filter_tokens, n_sentences, n_syllables, n_tokens
+from .utils import (
+    get_pyphen,
+    memoized_getter,
+    n_sentences,
+    n_syllables,
+    n_tokens,
+    store_extension_values,
+    token_features,
+    validate_memo,
+)
 
 
 def language_exists_in_pyphen(lang: str) -> bool:
     try:
-        _ = Pyphen(lang=lang)
+        get_pyphen(lang)
         return True
     except KeyError:
         return False
@@ -27,8 +35,18 @@ class DescriptiveStatistics:
     counts of tokens and sentences.
     """
 
-    def __init__(self, nlp: Language, verbose: bool):
+    eager_extensions = [
+        "_n_sentences",
+        "_n_tokens",
+        "token_length",
+        "sentence_length",
+        "syllables",
+        "counts",
+    ]
+
+    def __init__(self, nlp: Language, verbose: bool, eager: bool = False):
         """Initialise components."""
+        self.eager = eager
         self.can_calculate_syllables = language_exists_in_pyphen(lang=nlp.lang)
         if not self.can_calculate_syllables and verbose:
             msg.warn(
@@ -57,7 +75,10 @@ class DescriptiveStatistics:
             ] and not Span.has_extension(extension_name):
                 Span.set_extension(extension_name, getter=getter_fun)
             if not Doc.has_extension(extension_name):
-                Doc.set_extension(extension_name, getter=getter_fun)
+                Doc.set_extension(
+                    extension_name,
+                    getter=memoized_getter(extension_name, getter_fun),
+                )
 
     def token_length(self, doc: Union[Doc, Span]) -> dict:
         """Calculate mean, median and std of token length for a `Doc` or `Span`.
@@ -65,8 +86,9 @@ class DescriptiveStatistics:
         Returns:
             dict: token_length_mean, token_length_median, token_length_std
         """
-        token_lengths = [len(token) for token in filter_tokens(doc)]
-        if not token_lengths:
+        features = token_features(doc)
+        token_lengths = features.length[features.is_filtered]
+        if not len(token_lengths):
             return {
                 "token_length_mean": np.nan,
                 "token_length_median": np.nan,
@@ -84,17 +106,17 @@ class DescriptiveStatistics:
         Returns:
             dict: sentence_length_mean, sentence_length_median, sentence_length_std
         """
-        # get length of filtered tokens per sentence
-        tokenized_sentences = [
-            [
-                token.text
-                for token in sent
-                if not token.is_punct and "'" not in token.text
-            ]
-            for sent in doc.sents
-        ]
-        len_sentences = [len(sentence) for sentence in tokenized_sentences]
-        if not len_sentences:
+        features = token_features(doc)
+        if features.sent_starts is None:
+            # raises an informative error if sentence boundaries are not set
+            list(doc.sents)
+        # get number of filtered tokens per sentence
+        len_sentences = (
+            np.add.reduceat(features.is_filtered.astype(np.int64), features.sent_starts)
+            if len(features.sent_starts)
+            else []
+        )
+        if not len(len_sentences):
             return {
                 "sentence_length_mean": np.nan,
                 "sentence_length_median": np.nan,
@@ -143,7 +165,8 @@ class DescriptiveStatistics:
                 (n_sentences)
         """
         n_tokens = doc._._n_tokens
-        n_types = len({tok.lower_ for tok in filter_tokens(doc)})
+        features = token_features(doc)
+        n_types = len(np.unique(features.lower[features.is_filtered]))
         if ignore_whitespace:
             n_chars = len(doc.text.replace(" ", ""))
         else:
@@ -169,6 +192,9 @@ class DescriptiveStatistics:
 
     def __call__(self, doc):
         """Run the pipeline component."""
+        validate_memo(doc)
+        if self.eager:
+            store_extension_values(doc, self.eager_extensions)
         return doc
 
 
@@ -189,12 +215,13 @@ class DescriptiveStatistics:
         "span._.counts",
         "span._.descriptive_stats",
     ],
-    default_config={"verbose": True},
+    default_config={"verbose": True, "eager": False},
 )
 def create_descriptive_stats_component(
     nlp: Language,
     name: str,
     verbose: bool,
+    eager: bool,
 ) -> Callable[[Doc], Doc]:
     """Allows DescriptiveStatistics to be added to a spaCy pipe using
     nlp.add_pipe("textdescriptives/descriptive_stats").
@@ -218,6 +245,12 @@ def create_descriptive_stats_component(
             nlp.add_pipe call.
         name (str): name of the component. Can be optionally specified in the
             nlp.add_pipe call, using the name argument.
+        verbose (bool): Toggle to show a warning if syllables cannot be counted for
+            the language. Defaults to True.
+        eager (bool): If True, the `Doc` level attributes are computed when the
+            component is run and stored on the `Doc`, instead of when they are
+            accessed. This allows the metrics to be computed in parallel with
+            `nlp.pipe(..., n_process=n)`. Defaults to False.
 
     Returns:
         Callable[[Doc], Doc]: DescriptiveStatistics component
@@ -237,4 +270,4 @@ def create_descriptive_stats_component(
     sentencizers = {"sentencizer", "parser"}
     if not sentencizers.intersection(set(nlp.pipe_names)):
         nlp.add_pipe("sentencizer")  # add a sentencizer if not one in pipe
-    return DescriptiveStatistics(nlp, verbose=verbose)
+    return DescriptiveStatistics(nlp, verbose=verbose, eager=eager)
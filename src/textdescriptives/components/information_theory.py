@@ -1,17 +1,210 @@
 """Calculate the entropy and perplexity of a corpus."""
 
-from typing import Callable, Dict, Union
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from typing import Callable, Optional, Union
 
 import numpy as np
 from spacy.language import Language
-from spacy.lookups import load_lookups
+from spacy.lookups import Table, load_lookups
+from spacy.strings import get_string_id
 from spacy.tokens import Doc, Span
 from spacy.vocab import Vocab
 from wasabi import msg
 
+from .ngram_lm import NgramLanguageModel
+from .utils import get_memoized, memoized_getter, token_features, validate_memo
+
+LogProbProvider = Callable[[Union[Doc, Span]], np.ndarray]
+
+
+class LexemeProbArray:
+    """Log probabilities of word types as arrays sorted by orth ID, such that the
+    log probabilities of all tokens in a `Doc` are gathered at once instead of
+    looking up `Token.prob` token by token."""
+
+    def __init__(self, log_probs: Mapping[int, float]):
+        """Convert log probabilities to arrays.
+
+        Args:
+            log_probs (Mapping[int, float]): The log probability of each orth ID,
+                e.g. a `lexeme_prob` table.
+        """
+        self.size = len(log_probs)
+        orths = np.fromiter(log_probs.keys(), dtype=np.uint64, count=self.size)
+        values = np.fromiter(log_probs.values(), dtype=np.float64, count=self.size)
+        order = np.argsort(orths)
+        self.orths = orths[order]
+        self.log_probs = values[order]
+
+    def lookup(self, orths: np.ndarray, default: float) -> np.ndarray:
+        """Get the log probability of each orth ID.
+
+        Args:
+            orths (np.ndarray): The orth IDs.
+            default (float): The log probability of orth IDs which are not in the
+                arrays.
+
+        Returns:
+            np.ndarray: The log probability of each orth ID.
+        """
+        orths = np.asarray(orths, dtype=np.uint64)
+        if self.size == 0:
+            return np.full(len(orths), default, dtype=np.float64)
+        # searching for the sorted word types touches fewer parts of the arrays
+        types, inverse = np.unique(orths, return_inverse=True)
+        rows = np.minimum(np.searchsorted(self.orths, types), self.size - 1)
+        log_probs = np.where(self.orths[rows] == types, self.log_probs[rows], default)
+        return log_probs[inverse]
+
+
+# the tables as loaded from spacy-lookups-data and their arrays, by language
+_LEXEME_PROB_TABLES: dict[str, Table] = {}
+_LEXEME_PROB_ARRAYS: dict[str, LexemeProbArray] = {}
+
+
+def language_lexeme_prob_table(lang: str) -> Table:
+    """Get the lexeme probability table of a language from spacy-lookups-data,
+    which is loaded once per process.
+
+    Args:
+        lang (str): The language code, e.g. "en".
+
+    Raises:
+        ValueError: If there is no lexeme probability table for the language.
+
+    Returns:
+        Table: The table. Must not be changed, as it is shared by all pipelines
+            of the language.
+    """
+    if lang not in _LEXEME_PROB_TABLES:
+        lookups = load_lookups(lang, ["lexeme_prob"])
+        _LEXEME_PROB_TABLES[lang] = lookups.get_table("lexeme_prob")
+    return _LEXEME_PROB_TABLES[lang]
+
+
+def language_lexeme_prob_array(lang: str) -> LexemeProbArray:
+    """Get the lexeme probability table of a language as arrays, which are built
+    once per process.
+
+    Args:
+        lang (str): The language code, e.g. "en".
+
+    Raises:
+        ValueError: If there is no lexeme probability table for the language.
+
+    Returns:
+        LexemeProbArray: The log probabilities.
+    """
+    if lang not in _LEXEME_PROB_ARRAYS:
+        _LEXEME_PROB_ARRAYS[lang] = LexemeProbArray(language_lexeme_prob_table(lang))
+    return _LEXEME_PROB_ARRAYS[lang]
+
+
+class LexemeProbTable(Table):
+    """The lexeme probability table added to a pipeline by
+    `set_lexeme_prob_table`.
+
+    Probabilities are read from the table of the language, which is shared by
+    all pipelines of the language rather than copied, while probabilities set on
+    this table, e.g. with `Lexeme.prob`, are stored in this table only and thus
+    only apply to its pipeline. Iterating over or serializing the table gives the
+    probabilities of both.
+    """
+
+    def __init__(self, lang: str):
+        """Initialise the table.
+
+        Args:
+            lang (str): The language code, e.g. "en".
+
+        Raises:
+            ValueError: If there is no lexeme probability table for the language.
+        """
+        super().__init__(name="lexeme_prob", data={})
+        self.lang = lang
+        self.base = language_lexeme_prob_table(lang)
+        self._overrides: Optional[LexemeProbArray] = None
+
+    def __reduce__(self):
+        # the table of the language is loaded again rather than pickled
+        return (type(self), (self.lang,), None, None, iter(self.overrides().items()))
+
+    def overrides(self) -> dict[int, float]:
+        """The probabilities set on this table."""
+        return dict(OrderedDict.items(self))
+
+    def __setitem__(self, key: Union[str, int], value: float) -> None:
+        super().__setitem__(key, value)
+        self._overrides = None
+
+    def __delitem__(self, key: Union[str, int]) -> None:
+        OrderedDict.__delitem__(self, get_string_id(key))
+        self._overrides = None
+
+    def __getitem__(self, key: Union[str, int]) -> float:
+        key = get_string_id(key)
+        if OrderedDict.__contains__(self, key):
+            return OrderedDict.__getitem__(self, key)
+        return self.base[key]
+
+    def get(self, key: Union[str, int], default: Optional[float] = None) -> float:
+        key = get_string_id(key)
+        if OrderedDict.__contains__(self, key):
+            return OrderedDict.__getitem__(self, key)
+        return self.base.get(key, default)
+
+    def __contains__(self, key: Union[str, int]) -> bool:  # type: ignore[override]
+        key = get_string_id(key)
+        return OrderedDict.__contains__(self, key) or key in self.base
+
+    def __len__(self) -> int:
+        return len(self.base) + sum(
+            1 for key in OrderedDict.keys(self) if key not in self.base
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        return (key for key, _ in self.items())
+
+    def keys(self) -> Iterator[int]:  # type: ignore[override]
+        return iter(self)
+
+    def values(self) -> Iterator[float]:  # type: ignore[override]
+        return (value for _, value in self.items())
+
+    def items(self) -> Iterator[tuple[int, float]]:  # type: ignore[override]
+        overrides = self.overrides()
+        for key, value in self.base.items():
+            yield key, overrides.pop(key, value)
+        yield from overrides.items()
+
+    def to_bytes(self) -> bytes:
+        return Table(name=self.name, data=dict(self.items())).to_bytes()
+
+    def lookup(self, orths: np.ndarray, default: float) -> np.ndarray:
+        """Get the log probability of each orth ID.
+
+        Args:
+            orths (np.ndarray): The orth IDs.
+            default (float): The log probability of orth IDs which are not in the
+                table.
+
+        Returns:
+            np.ndarray: The log probability of each orth ID.
+        """
+        log_probs = language_lexeme_prob_array(self.lang).lookup(orths, default)
+        if OrderedDict.__len__(self):
+            if self._overrides is None:
+                self._overrides = LexemeProbArray(self.overrides())
+            overrides = self._overrides.lookup(orths, np.nan)
+            log_probs = np.where(np.isnan(overrides), log_probs, overrides)
+        return log_probs
+
 
 def set_lexeme_prob_table(vocab: Vocab, verbose: bool = False):
-    """Ensure that the pipeline has a lexeme probability table."""
+    """Ensure that the pipeline has a lexeme probability table. Adds a
+    `LexemeProbTable`, which reads from the table of the language such that it is
+    only loaded once per process, if the pipeline does not have a table."""
     if not vocab.lookups.has_table("lexeme_prob"):
         if verbose:
             msg.info(
@@ -19,8 +212,56 @@ def set_lexeme_prob_table(vocab: Vocab, verbose: bool = False):
                 + "Will attempt to add it. This will fail if specified language does "
                 + "not have a registered lexeme probability table.",
             )
-        lookups = load_lookups(vocab.lang, ["lexeme_prob"])
-        vocab.lookups.add_table("lexeme_prob", lookups.get_table("lexeme_prob"))
+        vocab.lookups.set_table("lexeme_prob", LexemeProbTable(vocab.lang))
+
+
+def lexeme_log_probs(doc: Union[Doc, Span]) -> np.ndarray:
+    """Get the log probability of each token in a document, i.e. `Token.prob`.
+
+    The probabilities of a `LexemeProbTable` are gathered from arrays, while
+    other tables, e.g. of a custom language, are looked up once per word type.
+
+    Args:
+        doc (Union[Doc, Span]): The document.
+
+    Returns:
+        np.ndarray: The log probability of each token.
+    """
+    settings = doc.vocab.lookups.get_table("lexeme_settings", {})
+    default = settings.get("oov_prob", -20.0)
+    orths = token_features(doc).orth
+    table = doc.vocab.lookups.get_table("lexeme_prob", {})
+    if isinstance(table, LexemeProbTable):
+        return table.lookup(orths, default)
+    types, inverse = np.unique(orths, return_inverse=True)
+    log_probs = np.array(
+        [table.get(orth, default) for orth in types.tolist()],
+        dtype=np.float64,
+    )
+    return log_probs[inverse]
+
+
+def token_log_probs(doc: Union[Doc, Span]) -> np.ndarray:
+    """Get the log probability of each token in a document. These are the log
+    probabilities stored by the log probability provider of the information
+    theory component if it has processed the `Doc`, and otherwise the log
+    probabilities of the lexeme probability table.
+
+    Args:
+        doc (Union[Doc, Span]): The document.
+
+    Returns:
+        np.ndarray: The log probability of each token.
+    """
+    if isinstance(doc, Span):
+        stored = get_memoized(doc.doc, "token_log_probs")
+        if stored is not None:
+            return np.asarray(stored)[doc.start : doc.end]
+    else:
+        stored = get_memoized(doc, "token_log_probs")
+        if stored is not None:
+            return np.asarray(stored)
+    return lexeme_log_probs(doc)
 
 
 def entropy(log_probs=np.ndarray) -> float:
@@ -39,7 +280,10 @@ def perplexity(entropy: float) -> float:
 
 def entropy_getter(doc: Union[Doc, Span], log_prob_attr: str = "prob") -> float:
     """Calculate the shannon entropy of a document."""
-    log_probs = np.array([getattr(token, log_prob_attr) for token in doc])
+    if log_prob_attr == "prob":
+        log_probs = token_log_probs(doc)
+    else:
+        log_probs = np.array([getattr(token, log_prob_attr) for token in doc])
     return entropy(log_probs)
 
 
@@ -100,9 +344,20 @@ class InformationTheory:
     """SpaCy component for adding information theoretic metrics such as entropy
     and perplexity."""
 
-    def __init__(self, nlp: Language, name: str, force: bool) -> None:
+    def __init__(
+        self,
+        nlp: Language,
+        name: str,
+        force: bool,
+        ngram_model: Optional[str] = None,
+    ) -> None:
         self.name = name
         self.set_extensions(force=force)
+        self.set_log_prob_provider(None)
+        self.has_lexeme_prob_table = False
+        if ngram_model is not None:
+            self.set_log_prob_provider(NgramLanguageModel(ngram_model))
+            return
         try:
             set_lexeme_prob_table(nlp.vocab, verbose=False)
             self.has_lexeme_prob_table = True
@@ -113,8 +368,24 @@ class InformationTheory:
             )
             self.has_lexeme_prob_table = False
 
+    def set_log_prob_provider(self, provider: Optional[LogProbProvider]) -> None:
+        """Sets the model which gives the log probability of each token, instead
+        of the lexeme probability table of the pipeline.
+
+        The log probabilities of the tokens of a `Doc` are computed once and
+        stored in `doc.user_data`, from which the metrics of its spans are
+        calculated.
+
+        Args:
+            provider (Optional[LogProbProvider]): A callable which takes a `Doc`
+                and returns an array with the (natural) log probability of each
+                token, e.g. a `NgramLanguageModel`. If None, the lexeme
+                probability table is used.
+        """
+        self.log_prob_provider = provider
+
     @staticmethod
-    def dict_getter(doc: Union[Doc, Span]) -> Dict[str, float]:
+    def dict_getter(doc: Union[Doc, Span]) -> dict[str, float]:
         return {
             "entropy": doc._.entropy,
             "perplexity": doc._.perplexity,
@@ -138,7 +409,12 @@ class InformationTheory:
             )
 
     def __call__(self, doc: Doc) -> Doc:
-        if self.has_lexeme_prob_table:
+        validate_memo(doc)
+        if self.log_prob_provider is not None:
+            # stores the log probabilities in doc.user_data
+            memoized_getter("token_log_probs", self.log_prob_provider)(doc)
+            set_entropy_and_perplexity(doc)
+        elif self.has_lexeme_prob_table:
             set_entropy_and_perplexity(doc)
         else:
             set_entropy_and_perplexity_to_nan(doc)
@@ -156,8 +432,13 @@ class InformationTheory:
         "span._.perplexity",
         "span._.per_word_perplexity",
     ],
+    default_config={"ngram_model": None},
 )
-def create_information_theory_component(nlp: Language, name: str) -> InformationTheory:
+def create_information_theory_component(
+    nlp: Language,
+    name: str,
+    ngram_model: Optional[str],
+) -> InformationTheory:
     """
     Allows the InformationTheory component to be added to the spaCy pipeline using the
     command: `nlp.add_pipe('textdescriptives/information_theory')`
@@ -170,9 +451,17 @@ def create_information_theory_component(nlp: Language, name: str) -> Information
     - {Doc/Span}._.information_theory: A dictionary with the
         keys: entropy, perplexity, and per_word_perplexity.
 
+    By default, the probabilities of the tokens are taken from the unigram
+    lexeme probability table of spaCy, which is only available for some
+    languages. Alternatively, a n-gram language model trained with
+    `NgramLanguageModel.train` can be used by setting `ngram_model`, or any
+    model by passing it to `set_log_prob_provider`.
+
     Args:
         - nlp: The spaCy Language object.
         - name: The name of the component.
+        - ngram_model: Path to a `NgramLanguageModel` to calculate the
+            probabilities of the tokens with. Defaults to None.
 
     Example:
         >>> import spacy
@@ -183,4 +472,4 @@ def create_information_theory_component(nlp: Language, name: str) -> Information
         >>> doc._.information_theory
         {'entropy': ...
     """
-    return InformationTheory(nlp, name, force=False)
+    return InformationTheory(nlp, name, force=False, ngram_model=ngram_model)
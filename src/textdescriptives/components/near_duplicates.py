@@ -0,0 +1,283 @@
+"""MinHash signatures and locality-sensitive hashing for finding near-duplicate
+documents across a corpus."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Hashable
+from pathlib import Path
+
+import numpy as np
+
+
+def _collision_probability(
+    similarity: np.ndarray,
+    bands: int,
+    rows: int,
+) -> np.ndarray:
+    """Probability that two documents with the given Jaccard similarity share at
+    least one band."""
+    return 1 - (1 - similarity**rows) ** bands
+
+
+def _trapezoid(y: np.ndarray, x: np.ndarray) -> float:
+    """Integrate y over x with the trapezoidal rule. `np.trapz` is deprecated in
+    NumPy 2 and `np.trapezoid` is not available before it, so neither works with
+    all supported versions."""
+    return float(np.sum((y[1:] + y[:-1]) * np.diff(x)) / 2)
+
+
+def _optimal_bands(threshold: float, num_perm: int) -> tuple[int, int]:
+    """Get the number of bands and rows per band, which minimize the sum of the
+    probability of false positives (below the threshold) and false negatives
+    (above the threshold)."""
+    below = np.linspace(0, threshold, 200)
+    above = np.linspace(threshold, 1, 200)
+    best, best_error = (1, num_perm), np.inf
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positives = _trapezoid(
+                _collision_probability(below, bands, rows),
+                below,
+            )
+            false_negatives = _trapezoid(
+                1 - _collision_probability(above, bands, rows),
+                above,
+            )
+            if false_positives + false_negatives < best_error:
+                best, best_error = (bands, rows), false_positives + false_negatives
+    return best
+
+
+class MinHashLSH:
+    """An index of MinHash signatures of documents, which finds near-duplicates of
+    a document in time independent of the number of indexed documents.
+
+    Documents are represented by the set of hashes of their token n-grams
+    (shingles). The MinHash signature of a document estimates the Jaccard
+    similarity between such sets, and locality-sensitive hashing (LSH) splits the
+    signature into bands, such that documents which are more similar than
+    `threshold` are likely to share a band [1].
+
+    The index is kept in memory, or in a SQLite database if `path` is given, in
+    which case it can exceed the available memory and be reused across runs.
+
+    References:
+    - [1] Leskovec, J., Rajaraman, A., & Ullman, J. D. (2014). Mining of massive
+    datasets, chapter 3. Cambridge University Press.
+
+    Example:
+        >>> import spacy
+        >>> import textdescriptives as td
+        >>> nlp = spacy.blank("en")
+        >>> quality = nlp.add_pipe("textdescriptives/quality")
+        >>> quality.set_near_duplicate_index(td.MinHashLSH(threshold=0.8))
+        >>> docs = nlp.pipe(texts)
+        >>> [doc._.quality.near_duplicate_jaccard.value for doc in docs]
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        ngram_size: int = 5,
+        bands: int | None = None,
+        seed: int = 1,
+        path: str | Path | None = None,
+    ):
+        """Create an empty index, or open the index stored at `path`.
+
+        Args:
+            threshold (float, optional): The Jaccard similarity above which
+                documents are considered near-duplicates. Used to choose the number
+                of bands. Defaults to 0.8.
+            num_perm (int, optional): Number of hash functions in the MinHash
+                signatures. More hash functions give more accurate estimates of the
+                similarity, but take longer to compute. Defaults to 128.
+            ngram_size (int, optional): Number of tokens in the shingles. Documents
+                with fewer tokens are represented by a single shingle. Defaults to
+                5.
+            bands (int, optional): Number of LSH bands. If None, chosen from the
+                threshold. Defaults to None.
+            seed (int, optional): Seed of the hash functions. Signatures are only
+                comparable if they were computed with the same seed and
+                `num_perm`. Defaults to 1.
+            path (str | Path, optional): Path of a SQLite database to store
+                the index in. If None, the index is kept in memory. Defaults to
+                None.
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.ngram_size = ngram_size
+        if bands is None:
+            self.bands, self.rows = _optimal_bands(threshold, num_perm)
+        else:
+            self.bands, self.rows = bands, num_perm // bands
+        rng = np.random.default_rng(seed)
+        # multiply-shift hash functions, with odd multipliers
+        self._multipliers = rng.integers(0, 2**64, num_perm, dtype=np.uint64) | 1
+        self._increments = rng.integers(0, 2**64, num_perm, dtype=np.uint64)
+        self._band_multipliers = rng.integers(0, 2**64, self.rows, dtype=np.uint64)
+
+        self._n_documents = 0
+        self._in_memory = path is None
+        if path is None:
+            self._buckets: list[dict[int, list[Hashable]]] = [
+                {} for _ in range(self.bands)
+            ]
+            self._signatures: dict[Hashable, np.ndarray] = {}
+        else:
+            self._connection = sqlite3.connect(str(path))
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS signatures (key PRIMARY KEY, signature BLOB);
+                CREATE TABLE IF NOT EXISTS buckets (band INTEGER, bucket INTEGER, key);
+                CREATE INDEX IF NOT EXISTS buckets_index ON buckets (band, bucket);
+                """,
+            )
+            (self._n_documents,) = self._connection.execute(
+                "SELECT COUNT(*) FROM signatures",
+            ).fetchone()
+
+    def __len__(self) -> int:
+        """Number of indexed documents."""
+        return self._n_documents
+
+    def signature(self, shingles: np.ndarray) -> np.ndarray:
+        """Compute the MinHash signature of a document.
+
+        Args:
+            shingles (np.ndarray): The (uint64) hashes of the shingles of the
+                document, e.g. the n-gram hashes of `ngram_hashes`.
+
+        Returns:
+            np.ndarray: The signature, an array of `num_perm` uint32 values.
+        """
+        shingles = np.unique(np.asarray(shingles, dtype=np.uint64))
+        signature = np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint64)
+        # limit the size of the (num_perm, chunk_size) matrix of hash values
+        chunk_size = max(1, 2**20 // self.num_perm)
+        for start in range(0, len(shingles), chunk_size):
+            chunk = shingles[start : start + chunk_size]
+            hashes = (
+                self._multipliers[:, None] * chunk[None, :] + self._increments[:, None]
+            ) >> np.uint64(32)
+            signature = np.minimum(signature, hashes.min(axis=1))
+        return signature.astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> list[int]:
+        """Hash each band of a signature into a (signed 64-bit) bucket key."""
+        bands = signature[: self.bands * self.rows].reshape(self.bands, self.rows)
+        keys = (bands.astype(np.uint64) * self._band_multipliers).sum(axis=1)
+        return keys.view(np.int64).tolist()
+
+    def query(self, signature: np.ndarray) -> list[Hashable]:
+        """Get the keys of the documents which share a band with a signature,
+        i.e. which are likely to be near-duplicates.
+
+        Args:
+            signature (np.ndarray): The MinHash signature of a document.
+
+        Returns:
+            list[Hashable]: The keys of the candidate near-duplicates.
+        """
+        band_keys = self._band_keys(signature)
+        if self._in_memory:
+            candidates = {
+                key
+                for buckets, band_key in zip(self._buckets, band_keys)
+                for key in buckets.get(band_key, [])
+            }
+        else:
+            candidates = {
+                key
+                for band, band_key in enumerate(band_keys)
+                for (key,) in self._connection.execute(
+                    "SELECT key FROM buckets WHERE band = ? AND bucket = ?",
+                    (band, band_key),
+                )
+            }
+        return list(candidates)
+
+    def _get_signature(self, key: Hashable) -> np.ndarray:
+        if self._in_memory:
+            return self._signatures[key]
+        (blob,) = self._connection.execute(
+            "SELECT signature FROM signatures WHERE key = ?",
+            (key,),
+        ).fetchone()
+        return np.frombuffer(blob, dtype=np.uint32)
+
+    def jaccard(self, signature: np.ndarray) -> float:
+        """Estimate the largest Jaccard similarity between a document and the
+        candidate near-duplicates in the index.
+
+        Args:
+            signature (np.ndarray): The MinHash signature of a document.
+
+        Returns:
+            float: The largest estimated Jaccard similarity, or 0 if no indexed
+                document shares a band with the document.
+        """
+        return max(
+            (
+                float(np.mean(self._get_signature(key) == signature))
+                for key in self.query(signature)
+            ),
+            default=0.0,
+        )
+
+    def insert(
+        self,
+        signature: np.ndarray,
+        key: Hashable | None = None,
+    ) -> Hashable:
+        """Add the signature of a document to the index.
+
+        Args:
+            signature (np.ndarray): The MinHash signature of the document.
+            key (Hashable, optional): The key of the document, which is returned by
+                `query`. Must be an int or a str if the index is stored in a
+                database. If None, the number of documents inserted before it is
+                used. Defaults to None.
+
+        Returns:
+            Hashable: The key of the document.
+        """
+        if key is None:
+            key = self._n_documents
+        band_keys = self._band_keys(signature)
+        if self._in_memory:
+            self._signatures[key] = signature
+            for buckets, band_key in zip(self._buckets, band_keys):
+                buckets.setdefault(band_key, []).append(key)
+        else:
+            self._connection.execute(
+                "INSERT INTO signatures VALUES (?, ?)",
+                (key, signature.astype(np.uint32).tobytes()),
+            )
+            self._connection.executemany(
+                "INSERT INTO buckets VALUES (?, ?, ?)",
+                [(band, band_key, key) for band, band_key in enumerate(band_keys)],
+            )
+        self._n_documents += 1
+        return key
+
+    def commit(self) -> None:
+        """Write the inserted documents to the database. Does nothing for an index
+        kept in memory."""
+        if not self._in_memory:
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Write the inserted documents to the database and close it. Does nothing
+        for an index kept in memory."""
+        if not self._in_memory:
+            self._connection.commit()
+            self._connection.close()
+
+    def __enter__(self) -> MinHashLSH:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
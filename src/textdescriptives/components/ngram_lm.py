@@ -0,0 +1,311 @@
+"""A compact n-gram language model, stored in memory-mapped arrays, for
+calculating the log probability of each token in a document."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+from spacy.attrs import LOWER
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+from spacy.util import minibatch
+
+from .utils import token_features
+
+# odd multiplier of the rolling n-gram hash, which is computed modulo 2**64 by
+# relying on the wrap-around of unsigned integer arithmetic
+_HASH_BASE = np.uint64(0x100000001B3)
+# the arrays of each order of a saved model
+_MODEL_FILE_PATTERN = re.compile(r"\d+_(keys|log_probs|log_backoffs)\.npy")
+
+
+def _ngram_hashes(token_ids: np.ndarray, order: int) -> list[np.ndarray]:
+    """Get the hashes of the n-grams of a sequence of tokens for n from 1 to
+    `order`. The n-th array has the hash of the n-gram ending at each token from
+    the n-th token on, and the hash of its context, i.e. the n-gram without its
+    last token, is found at the same position in the (n-1)-th array."""
+    hashes = [token_ids.astype(np.uint64)]
+    for n in range(2, order + 1):
+        hashes.append(hashes[-1][:-1] * _HASH_BASE + hashes[0][n - 1 :])
+    return hashes
+
+
+class _NgramCounts:
+    """Counts of the distinct n-grams of one order, which are updated in batches.
+    Batches are merged once they make up as many n-grams as the counts, which
+    keeps the cost of merging linear in the size of the corpus."""
+
+    def __init__(self, merge_size: int = 1_000_000):
+        """Create empty counts.
+
+        Args:
+            merge_size (int, optional): Minimum number of n-grams in the pending
+                batches before they are merged. Defaults to 1_000_000.
+        """
+        self.merge_size = merge_size
+        self.keys = np.zeros(0, dtype=np.uint64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.contexts = np.zeros(0, dtype=np.uint64)
+        self._pending: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._n_pending = 0
+
+    def add(self, keys: np.ndarray, contexts: np.ndarray) -> None:
+        self._pending.append((keys, np.ones(len(keys), dtype=np.int64), contexts))
+        self._n_pending += len(keys)
+        if self._n_pending > max(len(self.keys), self.merge_size):
+            self.merge()
+
+    def merge(self) -> None:
+        if not self._pending:
+            return
+        pending_keys, pending_counts, pending_contexts = zip(*self._pending)
+        keys = np.concatenate([self.keys, *pending_keys])
+        counts = np.concatenate([self.counts, *pending_counts])
+        contexts = np.concatenate([self.contexts, *pending_contexts])
+        self.keys, first, inverse = np.unique(
+            keys,
+            return_index=True,
+            return_inverse=True,
+        )
+        self.counts = np.bincount(inverse, weights=counts).astype(np.int64)
+        # all occurrences of an n-gram have the same context
+        self.contexts = contexts[first]
+        self._pending = []
+        self._n_pending = 0
+
+
+class NgramLanguageModel:
+    """An n-gram language model of lower-cased tokens, which gives the log
+    probability of each token in a document given the preceding tokens.
+
+    The model is trained with `NgramLanguageModel.train`, which counts the
+    n-grams of a corpus in a streaming fashion. The probabilities are smoothed
+    by interpolated absolute discounting [1], i.e. a fixed `discount` is
+    subtracted from the count of each n-gram and the freed probability mass is
+    distributed according to the model of the next lower order. Tokens which are
+    not in the training corpus get the probability of the unknown word.
+
+    The model is stored in a directory as sorted arrays of n-gram hashes with
+    float16 log probabilities, which are memory-mapped when the model is loaded.
+    Large models thus load instantly and are shared between processes, e.g. the
+    workers of `nlp.pipe(..., n_process=n)`, without copies.
+
+    References:
+    - [1] Chen, S. F., & Goodman, J. (1999). An empirical study of smoothing
+    techniques for language modeling. Computer Speech & Language, 13(4),
+    359-394.
+
+    Example:
+        >>> import spacy
+        >>> import textdescriptives as td
+        >>> nlp = spacy.blank("da")
+        >>> td.NgramLanguageModel.train(texts, "da_bigram", nlp, order=2)
+        >>> nlp.add_pipe(
+        ...     "textdescriptives/information_theory",
+        ...     config={"ngram_model": "da_bigram"},
+        ... )
+        >>> nlp("Dette er en sætning.")._.perplexity
+    """
+
+    def __init__(self, path: str | Path):
+        """Load a model saved by `train`.
+
+        Args:
+            path (str | Path): The directory of the model.
+        """
+        self.path = Path(path)
+        with (self.path / "meta.json").open(encoding="utf-8") as f:
+            meta = json.load(f)
+        self.order: int = meta["order"]
+        self.discount: float = meta["discount"]
+        self.n_tokens: int = meta["n_tokens"]
+        self.unknown_log_prob: float = meta["unknown_log_prob"]
+        self._keys: list[np.ndarray] = []
+        self._log_probs: list[np.ndarray] = []
+        self._log_backoffs: list[np.ndarray] = []
+        for n in range(1, self.order + 1):
+            self._keys.append(self._load(f"{n}_keys.npy"))
+            self._log_probs.append(self._load(f"{n}_log_probs.npy"))
+            if n < self.order:
+                self._log_backoffs.append(self._load(f"{n}_log_backoffs.npy"))
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(self.path / name, mmap_mode="r")
+
+    def __getstate__(self) -> dict[str, str]:
+        # the memory-mapped arrays are reopened rather than copied
+        return {"path": str(self.path)}
+
+    def __setstate__(self, state: dict[str, str]) -> None:
+        self.__init__(state["path"])  # type: ignore
+
+    @staticmethod
+    def _find(
+        keys: np.ndarray,
+        values: np.ndarray,
+        queries: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Get whether each query is in the sorted keys, and its value."""
+        if len(keys) == 0:
+            return np.zeros(len(queries), dtype=bool), np.zeros(len(queries))
+        rows = np.minimum(np.searchsorted(keys, queries), len(keys) - 1)
+        found = keys[rows] == queries
+        return found, np.where(found, values[rows].astype(np.float64), 0.0)
+
+    def token_log_probs(self, token_ids: np.ndarray) -> np.ndarray:
+        """Calculate the log probability of each token given the preceding
+        tokens.
+
+        Args:
+            token_ids (np.ndarray): The hashes of the lower-cased tokens, i.e. the
+                `LOWER` attribute.
+
+        Returns:
+            np.ndarray: The (natural) log probability of each token.
+        """
+        hashes = _ngram_hashes(np.asarray(token_ids), self.order)
+        found, log_probs = self._find(self._keys[0], self._log_probs[0], hashes[0])
+        probs = np.where(found, np.exp(log_probs), np.exp(self.unknown_log_prob))
+        for n in range(2, self.order + 1):
+            if len(hashes[n - 1]) == 0:
+                break
+            # the probability of the n-gram is interpolated with the probability
+            # of the (n-1)-gram, which is weighted by the backoff of the context
+            found_context, log_backoffs = self._find(
+                self._keys[n - 2],
+                self._log_backoffs[n - 2],
+                hashes[n - 2][:-1],
+            )
+            found, log_probs = self._find(
+                self._keys[n - 1],
+                self._log_probs[n - 1],
+                hashes[n - 1],
+            )
+            # contexts which are not in the training corpus back off entirely
+            backoffs = np.where(found_context, np.exp(log_backoffs), 1.0)
+            ngram_probs = np.where(found, np.exp(log_probs), 0.0)
+            probs[n - 1 :] = ngram_probs + backoffs * probs[n - 1 :]
+        return np.log(probs)
+
+    def __call__(self, doc: Doc | Span) -> np.ndarray:
+        """Calculate the log probability of each token in a document.
+
+        Args:
+            doc (Doc | Span): The document.
+
+        Returns:
+            np.ndarray: The (natural) log probability of each token.
+        """
+        return self.token_log_probs(token_features(doc).lower)
+
+    @classmethod
+    def train(
+        cls,
+        texts: Iterable[str],
+        path: str | Path,
+        nlp: Language,
+        order: int = 2,
+        discount: float = 0.75,
+        batch_size: int = 1000,
+        merge_size: int = 1_000_000,
+    ) -> NgramLanguageModel:
+        """Train a model on a corpus and save it. A model previously saved in
+        the directory is replaced.
+
+        Args:
+            texts (Iterable[str]): The texts of the corpus, e.g. a generator.
+            path (str | Path): The directory to save the model in.
+            nlp (Language): The pipeline whose tokenizer is used to split the
+                texts into tokens. Should be the pipeline the model is used with.
+            order (int, optional): The length of the longest n-grams. Defaults to
+                2.
+            discount (float, optional): The discount subtracted from the count of
+                each n-gram, between 0 and 1. Defaults to 0.75.
+            batch_size (int, optional): Number of texts to tokenize at once.
+                Defaults to 1000.
+            merge_size (int, optional): Minimum number of n-grams of each order
+                which are buffered before they are merged into the counts.
+                Defaults to 1_000_000.
+
+        Returns:
+            NgramLanguageModel: The trained model.
+        """
+        if order < 1:
+            raise ValueError(f"order must be at least 1, got {order}.")
+        if not 0 < discount < 1:
+            raise ValueError(f"discount must be between 0 and 1, got {discount}.")
+        counts = [_NgramCounts(merge_size) for _ in range(order)]
+        docs = nlp.tokenizer.pipe(texts, batch_size=batch_size)
+        for batch in minibatch(docs, size=batch_size):
+            hashes = [_ngram_hashes(doc.to_array(LOWER), order) for doc in batch]
+            for n in range(1, order + 1):
+                keys = np.concatenate([doc_hashes[n - 1] for doc_hashes in hashes])
+                if n == 1:
+                    contexts = np.zeros(len(keys), dtype=np.uint64)
+                else:
+                    contexts = np.concatenate(
+                        [doc_hashes[n - 2][:-1] for doc_hashes in hashes],
+                    )
+                counts[n - 1].add(keys, contexts)
+        for order_counts in counts:
+            order_counts.merge()
+
+        n_tokens = int(counts[0].counts.sum())
+        if n_tokens == 0:
+            raise ValueError(
+                "Cannot train a language model on a corpus without tokens."
+            )
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        # remove the files of a previous model, which may be of a higher order
+        for file in path.glob("*.npy"):
+            if _MODEL_FILE_PATTERN.fullmatch(file.name):
+                file.unlink()
+
+        # unigrams are interpolated with a uniform distribution over the
+        # vocabulary and the unknown word
+        unigrams = counts[0]
+        n_types = len(unigrams.keys)
+        uniform = discount * n_types / n_tokens / (n_types + 1)
+        log_probs = [
+            np.log(np.maximum(unigrams.counts - discount, 0) / n_tokens + uniform),
+        ]
+        log_backoffs = []
+        for n in range(2, order + 1):
+            ngrams = counts[n - 1]
+            contexts, inverse = np.unique(ngrams.contexts, return_inverse=True)
+            context_counts = np.bincount(inverse, weights=ngrams.counts)
+            log_probs.append(
+                np.log((ngrams.counts - discount) / context_counts[inverse]),
+            )
+            # the probability mass freed by discounting the n-grams of a context
+            backoffs = discount * np.bincount(inverse) / context_counts
+            # contexts which are never followed by a token are not discounted
+            lower_keys = counts[n - 2].keys
+            lower_log_backoffs = np.zeros(len(lower_keys))
+            lower_log_backoffs[np.searchsorted(lower_keys, contexts)] = np.log(
+                backoffs,
+            )
+            log_backoffs.append(lower_log_backoffs)
+
+        for n in range(1, order + 1):
+            np.save(path / f"{n}_keys.npy", counts[n - 1].keys)
+            np.save(path / f"{n}_log_probs.npy", log_probs[n - 1].astype(np.float16))
+            if n < order:
+                np.save(
+                    path / f"{n}_log_backoffs.npy",
+                    log_backoffs[n - 1].astype(np.float16),
+                )
+        meta = {
+            "order": order,
+            "discount": discount,
+            "n_tokens": n_tokens,
+            "unknown_log_prob": float(np.log(uniform)),
+        }
+        with (path / "meta.json").open("w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return cls(path)
@@ -1,19 +1,31 @@
 """Calculation of statistics that require a pos-tagger in the pipeline."""
 
-from typing import Callable, Counter, List, Union
+from typing import Callable, Union
 
 import numpy as np
 from spacy.language import Language
 from spacy.tokens import Doc, Span
 
-from textdescriptives.components.utils import all_upos_tags
+from textdescriptives.components.utils import (
+    all_upos_tags,
+    memoized_getter,
+    store_extension_values,
+    token_features,
+    validate_memo,
+)
 
 
 class POSProportions:
     """spaCy v.3.0 component that adds attributes for POS statistics to `Doc`
     and `Span` objects."""
 
-    def __init__(self, nlp: Language, use_pos: bool, add_all_tags: bool):
+    def __init__(
+        self,
+        nlp: Language,
+        use_pos: bool,
+        add_all_tags: bool,
+        eager: bool = False,
+    ):
         """Initialise components.
 
         Args:
@@ -22,15 +34,21 @@ class POSProportions:
             add_all_tags: If True, returns proportions of all possible POS tags.
                 If False, only returns proportions for the POS tags present in the
                 text.
+            eager: If True, computes the proportions for the `Doc` when the
+                component is run and stores them on the `Doc`.
         """
+        self.eager = eager
         self.use_pos: bool = use_pos
         self.add_all_tags: bool = add_all_tags
-        self.model_tags: List[str] = (
+        self.model_tags: list[str] = (
             all_upos_tags if use_pos else nlp.meta["labels"]["tagger"]
         )
 
         if not Doc.has_extension("pos_proportions"):
-            Doc.set_extension("pos_proportions", getter=self.pos_proportions)
+            Doc.set_extension(
+                "pos_proportions",
+                getter=memoized_getter("pos_proportions", self.pos_proportions),
+            )
 
         if not Span.has_extension("pos_proportions"):
             Span.set_extension("pos_proportions", getter=self.pos_proportions)
@@ -43,25 +61,27 @@ class POSProportions:
             Dict containing {pos_prop_POSTAG: proportion of all tokens tagged with
                 POSTAG.
         """
-        pos_counts: Counter = Counter()
-        if self.add_all_tags:
-            # add all tags to the counter so they are included in the output
-            pos_counts.update(self.model_tags)
-            # reset all counts to 0
-            pos_counts.subtract(self.model_tags)
-
-        if self.use_pos:
-            pos_counts.update([token.pos_ for token in text])
-        else:
-            pos_counts.update([token.tag_ for token in text])
+        features = token_features(text)
+        tag_ids = features.pos if self.use_pos else features.tag
+        # count the tags in order of their first occurrence
+        unique_ids, first_index, counts = np.unique(
+            tag_ids,
+            return_index=True,
+            return_counts=True,
+        )
+        order = np.argsort(first_index, kind="stable")
+        strings = text.doc.vocab.strings
+        text_counts = {strings[int(unique_ids[i])]: int(counts[i]) for i in order}
 
+        pos_counts: dict[str, int]
         if self.add_all_tags:
-            # filter out tags that are not in self.model_tags
-            pos_counts = {  # type: ignore
-                tag: count
-                for tag, count in pos_counts.items()
-                if tag in self.model_tags
-            }
+            # include all tags and filter out tags that are not in self.model_tags
+            pos_counts = {tag: 0 for tag in self.model_tags}
+            for tag, count in text_counts.items():
+                if tag in pos_counts:
+                    pos_counts[tag] = count
+        else:
+            pos_counts = text_counts
 
         len_text = len(text)
         return {
@@ -71,19 +91,23 @@ class POSProportions:
 
     def __call__(self, doc):
         """Run the pipeline component."""
+        validate_memo(doc)
+        if self.eager:
+            store_extension_values(doc, ["pos_proportions"])
         return doc
 
 
 @Language.factory(
     "textdescriptives/pos_proportions",
     assigns=["doc._.pos_proportions", "span._.pos_proportions"],
-    default_config={"use_pos": True, "add_all_tags": True},
+    default_config={"use_pos": True, "add_all_tags": True, "eager": False},
 )
 def create_pos_proportions_component(
     nlp: Language,
     name: str,
     use_pos: bool,
     add_all_tags: bool,
+    eager: bool,
 ) -> Callable[[Doc], Doc]:
     """Allows PosPropotions to be added to a spaCy pipe using
     nlp.add_pipe("textdescriptives/pos_proportions")
@@ -99,6 +123,13 @@ def create_pos_proportions_component(
             nlp.add_pipe call, using the name argument.
         use_pos: If True, uses the simple token.pos attribute. If False, uses the
             detailed token.tag attribute.
+        add_all_tags: If True, returns proportions of all possible POS tags.
+            If False, only returns proportions for the POS tags present in the
+            text.
+        eager: If True, `doc._.pos_proportions` is computed when the component is
+            run and stored on the `Doc`, instead of when it is accessed. This
+            allows the metrics to be computed in parallel with
+            `nlp.pipe(..., n_process=n)`. Defaults to False.
 
     Returns:
         Callable[[Doc], Doc]: The POSProportions component to be added to the pipe.
@@ -120,4 +151,9 @@ def create_pos_proportions_component(
             + "a spaCy model which includes a 'tagger' or an 'attribute ruler' "
             + "component.",
         )
-    return POSProportions(nlp, use_pos=use_pos, add_all_tags=add_all_tags)
+    return POSProportions(
+        nlp,
+        use_pos=use_pos,
+        add_all_tags=add_all_tags,
+        eager=eager,
+    )
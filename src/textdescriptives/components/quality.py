@@ -1,13 +1,32 @@
 """Component for calculating quality metrics."""
 
 from collections import Counter, defaultdict
-from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+from collections.abc import Iterable, Iterator, Mapping
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Union,
+)
+from weakref import WeakKeyDictionary
 
 import numpy as np
+import pandas as pd
 from spacy.language import Language
 from spacy.tokens import Doc, Span
 
-from .quality_data_classes import QualityOutput, QualityThresholds, ThresholdsOutput
+from .near_duplicates import MinHashLSH
+from .quality_data_classes import (
+    Interval,
+    MetricThreshold,
+    MetricValue,
+    QualityOutput,
+    QualityResult,
+    QualityThresholds,
+    _metric_passed,
+    quality_check_names,
+)
+from .utils import _LEXEME_FEATURES, TokenFeatures, token_features, validate_memo
 
 
 def n_stop_words(span: Union[Doc, Span]) -> int:
@@ -19,7 +38,7 @@ def n_stop_words(span: Union[Doc, Span]) -> int:
     Returns:
         int: number of stop words
     """
-    return sum(t.is_stop for t in span)
+    return int(token_features(span).is_stop.sum())
 
 
 def mean_word_length(span: Union[Doc, Span]) -> float:
@@ -31,8 +50,8 @@ def mean_word_length(span: Union[Doc, Span]) -> float:
     Returns:
         float: mean word length
     """
-    tokens_lengths = [len(t) for t in span]
-    if tokens_lengths:
+    tokens_lengths = token_features(span).length
+    if len(tokens_lengths):
         return float(np.mean(tokens_lengths))
     return 0.0
 
@@ -47,15 +66,8 @@ def alpha_ratio(span: Union[Doc, Span]) -> float:
     Returns:
         float: alpha ratio
     """
-
-    def contains_alpha(token):
-        for char in token.text:
-            if char.isalpha():
-                return True
-        return False
-
-    token_contains_alpha = [contains_alpha(token) for token in span]
-    if token_contains_alpha:
+    token_contains_alpha = token_features(span).contains_alpha
+    if len(token_contains_alpha):
         return float(np.mean(token_contains_alpha))
     return 0.0
 
@@ -76,14 +88,18 @@ def proportion_bullet_points(  # pylint: disable=dangerous-default-value
     """
     # check if has extension _lines
     if not hasattr(span._, "lines"):
-        lines = span.text.split("\n")
+        lines = token_features(span).text.split("\n")
     else:
         lines = span._.lines
-    line_starts_with_bullet = [
-        line.strip().startswith(tuple(bullet_point)) for line in lines
+    return _proportion_lines_starting_with(lines, bullet_point)
+
+
+def _proportion_lines_starting_with(lines: list[str], prefixes: set) -> float:
+    line_starts_with_prefix = [
+        line.strip().startswith(tuple(prefixes)) for line in lines
     ]
-    if line_starts_with_bullet:
-        return float(np.mean(line_starts_with_bullet))
+    if line_starts_with_prefix:
+        return float(np.mean(line_starts_with_prefix))
     return 0.0
 
 
@@ -101,17 +117,20 @@ def proportion_ellipsis(  # pylint: disable=dangerous-default-value
         float: proportion of ellipsis
     """
     if not hasattr(span._, "lines"):
-        lines = span.text.split("\n")
+        lines = token_features(span).text.split("\n")
     else:
         lines = span._.lines
+    return _proportion_lines_ending_with(lines, ellipsis)
 
-    line_ends_with_ellipsis = [line.strip().endswith(tuple(ellipsis)) for line in lines]
-    if line_ends_with_ellipsis:
-        return float(np.mean(line_ends_with_ellipsis))
+
+def _proportion_lines_ending_with(lines: list[str], suffixes: set) -> float:
+    line_ends_with_suffix = [line.strip().endswith(tuple(suffixes)) for line in lines]
+    if line_ends_with_suffix:
+        return float(np.mean(line_ends_with_suffix))
     return 0.0
 
 
-def get_ranges(arr: np.ndarray) -> List[Tuple[int, int]]:
+def get_ranges(arr: np.ndarray) -> list[tuple[int, int]]:
     """Get ranges that evaluate to true a from boolean array, i.e.
 
     Example:
@@ -140,18 +159,22 @@ def duplicate_paragraph_chr_fraction(span: Union[Doc, Span]) -> float:
     Returns:
         float: The fraction of duplicate characters.
     """
-    chr_len = len(span.text)
-    if chr_len == 0:
-        return 0.0
-
+    text = token_features(span).text
     if not hasattr(span._, "paragraphs"):
-        paragraphs = span.text.split("\n\n")
+        paragraphs = text.split("\n\n")
     else:
         paragraphs = span._.paragraphs
-    paragraph_counter = Counter(paragraphs)
+    return _duplicate_chr_fraction(paragraphs, len(text))
+
+
+def _duplicate_chr_fraction(segments: list[str], chr_len: int) -> float:
+    """Calculate the fraction of `chr_len` characters in duplicated segments."""
+    if chr_len == 0:
+        return 0.0
+    segment_counter = Counter(segments)
 
     duplicate_chr = 0
-    for t, c in paragraph_counter.items():
+    for t, c in segment_counter.items():
         if c > 1:
             duplicate_chr += len(t) * (c - 1)
     frac = duplicate_chr / chr_len
@@ -167,22 +190,12 @@ def duplicate_line_chr_fraction(span: Union[Doc, Span]) -> float:
     Returns:
         float: The fraction of duplicate characters.
     """
-    chr_len = len(span.text)
-    if chr_len == 0:
-        return 0.0
-
+    text = token_features(span).text
     if not hasattr(span._, "lines"):
-        lines = span.text.split("\n")
+        lines = text.split("\n")
     else:
         lines = span._.lines
-    line_counter = Counter(lines)
-
-    duplicate_chr = 0
-    for t, c in line_counter.items():
-        if c > 1:
-            duplicate_chr += len(t) * (c - 1)
-    frac = duplicate_chr / chr_len
-    return frac
+    return _duplicate_chr_fraction(lines, len(text))
 
 
 def symbol_to_word_ratio(span: Union[Span, Doc], symbol: str) -> float:
@@ -196,8 +209,9 @@ def symbol_to_word_ratio(span: Union[Span, Doc], symbol: str) -> float:
     Returns:
         float: ratio of symbols to words
     """
-    n_symbol = span.text.count(symbol)
-    n_words = sum(not (t.is_space or t.is_punct) for t in span)
+    n_symbol = token_features(span).text.count(symbol)
+    features = token_features(span)
+    n_words = int((~(features.is_space | features.is_punct)).sum())
     if n_words:
         return n_symbol / n_words
     return 0.0
@@ -205,16 +219,16 @@ def symbol_to_word_ratio(span: Union[Span, Doc], symbol: str) -> float:
 
 def span_ngrams(
     span: Union[Span, Doc],
-    ngram_range: Tuple[int, int],
-) -> Dict[int, Dict[str, Union[int, List[Span]]]]:
+    ngram_range: tuple[int, int],
+) -> dict[int, dict[str, Union[int, list[Span]]]]:
     """Calculates the counts of n-grams in the specified range.
 
     Args:
         span (Union[Span, Doc]): A spaCy Span or Doc object.
-        ngram_range (Tuple[int, int]): The n-gram range.
+        ngram_range (tuple[int, int]): The n-gram range.
 
     Returns:
-        Dict[int, Dict[str, Union[int, List[Span]]]]: A dictionary that for each n in
+        dict[int, dict[str, Union[int, list[Span]]]]: A dictionary that for each n in
             the ngram range contains the counts of the n-grams as well as the spans of
             the n-grams.
     """
@@ -237,83 +251,221 @@ def span_ngrams(
     return shingles_count  # type: ignore
 
 
+# odd multiplier and mixing constant of the rolling n-gram hash, which is computed
+# modulo 2**64 by relying on the wrap-around of unsigned integer arithmetic
+_NGRAM_HASH_BASE = np.uint64(0x100000001B3)
+_NGRAM_SPACE_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+class NgramIndex:
+    """Hashes of the n-grams in a `Doc`, shared between the n-gram quality
+    metrics and the `Span` objects of the `Doc`.
+
+    The hashes are 64-bit rolling hashes over the orth IDs of the tokens and
+    whether they are followed by a space. N-grams with the same text always have
+    the same hash, but n-grams are compared by hash only, so the comparison is
+    probabilistic: two different n-grams share a hash with a probability of
+    about 2**-64, i.e. at most about m**2 / 2**65 for a `Doc` with m distinct
+    n-grams (below 1e-9 for m up to 10**5). Hashes are computed once for each n
+    and the n-grams within a `Span` are slices of the hashes of its `Doc`. Use
+    `ngram_index` to get the (cached) index of a `Doc`.
+    """
+
+    def __init__(self, features: TokenFeatures):
+        """Initialise the index.
+
+        Args:
+            features (TokenFeatures): The token features of the `Doc`.
+        """
+        self._orth = features.orth
+        # the trailing space of the last token is not part of the n-gram text
+        self._orth_with_space = features.orth ^ (features.has_space * _NGRAM_SPACE_MIX)
+        self._hashes: list[np.ndarray] = []
+        self._prefix_hashes = np.zeros(len(self._orth), dtype=np.uint64)
+        self._counts: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def hashes(self, n: int) -> np.ndarray:
+        """Get the hash of the n-gram starting at each token (which has a length
+        of `len(doc) - n + 1`)."""
+        while len(self._hashes) < n:
+            i = len(self._hashes)
+            n_ngrams = max(len(self._orth) - i, 0)
+            prefix_hashes = self._prefix_hashes[:n_ngrams] * _NGRAM_HASH_BASE
+            self._hashes.append(prefix_hashes + self._orth[i:])
+            self._prefix_hashes = prefix_hashes + self._orth_with_space[i:]
+        return self._hashes[n - 1]
+
+    def counts(self, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the index of the first occurrence of each distinct n-gram, the
+        distinct n-gram of each n-gram and the number of occurrences of each
+        distinct n-gram, see `np.unique`."""
+        if n not in self._counts:
+            self._counts[n] = _unique_ngrams(self.hashes(n))
+        return self._counts[n]
+
+
+def _unique_ngrams(hashes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    _, first_index, inverse, counts = np.unique(
+        hashes,
+        return_index=True,
+        return_inverse=True,
+        return_counts=True,
+    )
+    return first_index, inverse, counts
+
+
+_NGRAM_INDEXES: "WeakKeyDictionary[TokenFeatures, NgramIndex]" = WeakKeyDictionary()
+
+
+def ngram_index(doc: Doc) -> NgramIndex:
+    """Get the n-gram index of a `Doc`.
+
+    The index is cached along with the token features of the `Doc`, and thus
+    rebuilt if the `Doc` changes.
+
+    Args:
+        doc (Doc): A spaCy Doc
+
+    Returns:
+        NgramIndex: The n-gram index
+    """
+    features = token_features(doc)
+    index = _NGRAM_INDEXES.get(features)
+    if index is None:
+        index = NgramIndex(features)
+        _NGRAM_INDEXES[features] = index
+    return index
+
+
+def ngram_hashes(
+    span: Union[Span, Doc],
+    ngram_range: tuple[int, int],
+) -> dict[int, np.ndarray]:
+    """Calculates a hash of each n-gram in a span for each n in the specified
+    range, such that two n-grams have the same hash if they have the same text.
+
+    Args:
+        span (Union[Span, Doc]): A spaCy Span or Doc object.
+        ngram_range (tuple[int, int]): The n-gram range.
+
+    Returns:
+        dict[int, np.ndarray]: For each n in the n-gram range, the hash of the
+            n-gram starting at each token (which has a length of
+            `len(span) - n + 1`).
+    """
+    index = ngram_index(span.doc if isinstance(span, Span) else span)
+    start, end = (span.start, span.end) if isinstance(span, Span) else (0, len(span))
+    lower, upper = ngram_range
+    return {
+        n: index.hashes(n)[start : max(end - n + 1, start)]
+        for n in range(lower, upper + 1)
+    }
+
+
+def ngram_counts(
+    span: Union[Span, Doc],
+    ngram_range: tuple[int, int],
+) -> dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Count the n-grams in a span for each n in the specified range. The counts
+    of a `Doc` are cached in its n-gram index.
+
+    Args:
+        span (Union[Span, Doc]): A spaCy Span or Doc object.
+        ngram_range (tuple[int, int]): The n-gram range.
+
+    Returns:
+        dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]]: For each n in the
+            n-gram range, the index of the first occurrence of each distinct
+            n-gram, the distinct n-gram of each n-gram and the number of
+            occurrences of each distinct n-gram.
+    """
+    if isinstance(span, Doc) or (span.start == 0 and span.end == len(span.doc)):
+        index = ngram_index(span.doc if isinstance(span, Span) else span)
+        lower, upper = ngram_range
+        return {n: index.counts(n) for n in range(lower, upper + 1)}
+    return {
+        n: _unique_ngrams(hashes)
+        for n, hashes in ngram_hashes(span, ngram_range).items()
+    }
+
+
 def duplicate_ngram_fraction(
     span: Union[Span, Doc],
-    ngram_range: Tuple[int, int],
-) -> Dict[int, float]:
+    ngram_range: tuple[int, int],
+) -> dict[int, float]:
     """Calculates the character fraction of duplicate n-gram over the overall
     text, taking care not to count overlapping n-grams twice. This does not
     include spaces between the n-grams.
 
     Args:
         span (Union[Span, Doc]): A spaCy Span or Doc object.
-        ngram_range (Tuple[int, int], optional): The n-gram range.
+        ngram_range (tuple[int, int], optional): The n-gram range.
 
     Returns:
-        Dict[int, float]: the fraction of duplicate characters for each
+        dict[int, float]: the fraction of duplicate characters for each
             n-gram size
     """
-    max_len = len(span)
-    chr_len = len(span.text)
+    chr_len = len(token_features(span).text)
     if chr_len == 0:
         return {n: 0.0 for n in range(ngram_range[0], ngram_range[1] + 1)}
-    shingles_count = span_ngrams(span, ngram_range)
+    features = token_features(span)
+    token_end_char = features.idx + features.length
     duplicate_chr_fraction = {}
-    for ngram_size, ngrams in shingles_count.items():
-        # create a boolean array of the same length as the text
-        # where True indicates that the token is a duplicate
-        is_duplicate = np.zeros(max_len, dtype=bool)
-        # set duplicate tokens to True
-        for ngram, count in ngrams.items():
-            if count["count"] > 1:  # type: ignore
-                for ngram_span in count["span"]:  # type: ignore
-                    is_duplicate[ngram_span.start : ngram_span.end] = True
-
-        duplicate_chars = 0
-        # get duplicate ranges from boolean array
-        for start, end in get_ranges(is_duplicate):
-            _span = span[start:end]
-            duplicate_chars += _span.end_char - _span.start_char
+    for ngram_size, (_, inverse, counts) in ngram_counts(span, ngram_range).items():
+        # mark the tokens which are part of an n-gram occurring more than once
+        is_duplicate_start = (counts[inverse] > 1).astype(np.int64)
+        n_ngrams = len(is_duplicate_start)
+        coverage = np.zeros(len(span) + 1, dtype=np.int64)
+        coverage[:n_ngrams] += is_duplicate_start
+        coverage[ngram_size : ngram_size + n_ngrams] -= is_duplicate_start
+        is_duplicate = np.cumsum(coverage[:-1]) > 0
+
+        # count the characters of each range of duplicate tokens
+        edges = np.diff(is_duplicate.astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        duplicate_chars = int(
+            (token_end_char[ends - 1] - features.idx[starts]).sum(),
+        )
         duplicate_chr_fraction[ngram_size] = duplicate_chars / chr_len
     return duplicate_chr_fraction
 
 
 def top_ngram_chr_fraction(
     span: Union[Doc, Span],
-    ngram_range: Tuple[int, int],
+    ngram_range: tuple[int, int],
     min_count: int = 0,
-) -> Dict[int, float]:
+) -> dict[int, float]:
     """Calculates the character fraction of the top ngrams.
 
     Args:
         span (Union[Span, Doc]): A spaCy Span or Doc object.
-        ngram_range (Tuple[int, int], optional): Range of n grams to examine.
+        ngram_range (tuple[int, int], optional): Range of n grams to examine.
         min_count (int): Minimum count of n-grams to before an n-gram is considered
             a top n-gram. Defaults to 0.
 
     Returns:
-        Dict[int, float]: the fraction of duplicate characters for each
+        dict[int, float]: the fraction of duplicate characters for each
             n-gram size
     """
     # check if span has enough tokens within the range
 
-    chr_len = len(span.text)
+    chr_len = len(token_features(span).text)
     if chr_len == 0:
         return {n: 0.0 for n in range(ngram_range[0], ngram_range[1] + 1)}
 
-    ngram_counter = span_ngrams(span, ngram_range=ngram_range)
+    features = token_features(span)
+    token_end_char = features.idx + features.length
     top_ngram_chr_frac = {}
-    for n in ngram_counter:
-        # find the top n-gram
-        if ngram_counter[n]:
-            ngram, count_span = max(
-                ngram_counter[n].items(),
-                key=lambda x: x[1]["count"],  # type: ignore
-            )
-            count = count_span["count"]  # type: ignore
+    for n, (first_index, _, counts) in ngram_counts(span, ngram_range).items():
+        # find the top n-gram, preferring the first occurring in case of ties
+        if len(counts):
+            count = int(counts.max())
             if count >= min_count:
+                start = int(first_index[counts == count].min())
+                ngram_len = int(token_end_char[start + n - 1] - features.idx[start])
                 # calculate the fraction of the top n-gram
-                top_ngram_chr_frac[n] = (len(ngram) * count) / chr_len
+                top_ngram_chr_frac[n] = (ngram_len * count) / chr_len
             else:
                 top_ngram_chr_frac[n] = 0.0
         else:
@@ -332,7 +484,7 @@ def contains_string(span: Union[Span, Doc], string: str) -> bool:
     Returns:
         bool: True if span contains string
     """
-    return string in span.text
+    return string in token_features(span).text
 
 
 def oov_ratio(span: Union[Span, Doc], vocab: Optional[Mapping] = None) -> float:
@@ -350,9 +502,365 @@ def oov_ratio(span: Union[Span, Doc], vocab: Optional[Mapping] = None) -> float:
     len_span = len(span)
     if len_span == 0:
         return 0.0
+    # check each word type once and count the tokens of the oov types
+    types, type_counts = np.unique(token_features(span).orth, return_counts=True)
     if vocab is None:
-        return len([token for token in span if token.is_oov]) / len_span
-    return len([token for token in span if token.text not in vocab]) / len_span
+        vectors = span.vocab.vectors
+        if vectors.mode == "floret":
+            # floret vectors are defined for all words
+            return 0.0
+        is_oov = vectors.find(keys=types) < 0
+    else:
+        is_oov = ~_LEXEME_FEATURES.in_vocabulary(types, span.vocab.strings, vocab)
+    return int(type_counts[is_oov].sum()) / len_span
+
+
+def near_duplicate_jaccard(
+    span: Union[Span, Doc],
+    index: MinHashLSH,
+    insert: bool = False,
+) -> Optional[float]:
+    """Estimates the largest Jaccard similarity between the n-grams of a span and
+    those of the near-duplicate candidates in an index.
+
+    Args:
+        span (Union[Span, Doc]): A spaCy Span or Doc object.
+        index (MinHashLSH): The index of previously seen documents.
+        insert (bool, optional): Whether to add the span to the index afterwards.
+            Defaults to False.
+
+    Returns:
+        Optional[float]: The estimated Jaccard similarity, which is 0 if no
+            document in the index is a candidate. None if the span is empty.
+    """
+    if len(span) == 0:
+        return None
+    n = min(index.ngram_size, len(span))
+    signature = index.signature(ngram_hashes(span, ngram_range=(n, n))[n])
+    similarity = index.jaccard(signature)
+    if insert:
+        index.insert(signature)
+    return similarity
+
+
+def _in_interval(value: float, interval: Interval) -> bool:
+    lower, upper = interval
+    return (lower is None or lower <= value) and (upper is None or value <= upper)
+
+
+def passes_quality_prefilter(
+    text: str,
+    thresholds: Optional[QualityThresholds] = None,
+) -> bool:
+    """Check whether a text can pass the quality thresholds, using only the
+    metrics which can be computed from the raw string.
+
+    The duplicate line and paragraph fractions, the proportions of bullet points
+    and ellipsis and the `contains` checks are computed exactly. The document
+    length and the symbol-to-word ratios depend on the tokenization and are
+    bounded instead: the document contains at least one token per
+    whitespace-separated chunk and at most one token per character, and at most
+    one word per non-whitespace character. A text is thus only rejected if it is
+    certain to fail the quality check of the `quality` component with the same
+    thresholds.
+
+    Args:
+        text (str): The text to check.
+        thresholds (QualityThresholds, optional): The quality thresholds. If None,
+            uses the default thresholds. Defaults to None.
+
+    Returns:
+        bool: False if the text fails the quality thresholds, True if it might
+            pass them.
+    """
+    if thresholds is None:
+        thresholds = QualityThresholds()
+    for string, expected in thresholds.contains.items():
+        if (string in text) != expected:
+            return False
+
+    lower, upper = thresholds.doc_length
+    if lower is not None and len(text) < lower:
+        return False
+    # the number of whitespace-separated chunks is cheaper to compute than the
+    # number of tokens and is a lower bound
+    if upper is not None and len(text) > upper and len(text.split()) > upper:
+        return False
+
+    # the ratio is 0 if the text does not contain any words (tokens which are not
+    # whitespace or punctuation), which is certainly not the case if it contains
+    # a letter. Otherwise, each word contains at least one non-whitespace character.
+    n_words_upper_bound = None
+    for symbol, (lower, upper) in thresholds.symbol_to_word_ratio.items():
+        n_symbol = text.count(symbol)
+        if n_symbol == 0:
+            if not _in_interval(0.0, (lower, upper)):
+                return False
+            continue
+        if upper is None:
+            continue
+        if n_words_upper_bound is None:
+            if not any(char.isalpha() for char in text):
+                n_words_upper_bound = 0
+            else:
+                n_words_upper_bound = len(text) - sum(
+                    text.count(whitespace) for whitespace in " \t\n\r\f\v"
+                )
+        if n_words_upper_bound and n_symbol / n_words_upper_bound > upper:
+            return False
+
+    lines = text.split("\n")
+    exact_checks: list[tuple[Interval, Callable[[], float]]] = [
+        (
+            thresholds.proportion_bullet_points,
+            lambda: _proportion_lines_starting_with(lines, {"-", "*"}),
+        ),
+        (
+            thresholds.proportion_ellipsis,
+            lambda: _proportion_lines_ending_with(lines, {"…", "..."}),
+        ),
+        (
+            thresholds.duplicate_line_chr_fraction,
+            lambda: _duplicate_chr_fraction(lines, len(text)),
+        ),
+        (
+            thresholds.duplicate_paragraph_chr_fraction,
+            lambda: _duplicate_chr_fraction(text.split("\n\n"), len(text)),
+        ),
+    ]
+    return all(
+        interval == (None, None) or _in_interval(metric(), interval)
+        for interval, metric in exact_checks
+    )
+
+
+def quality_prefilter(
+    texts: Iterable[Union[str, tuple[str, Any]]],
+    thresholds: Optional[QualityThresholds] = None,
+    as_tuples: bool = False,
+) -> Iterator[Union[str, tuple[str, Any]]]:
+    """Drop texts which are certain to fail the quality thresholds before they
+    are processed by a spaCy pipeline.
+
+    Uses the quality metrics which can be computed from the raw string, see
+    `passes_quality_prefilter`. Texts which pass the prefilter must still be
+    processed by the `quality` component to check the remaining thresholds.
+    Note that the prefilter splits lines and paragraphs on newlines, and thus
+    does not take custom `lines` or `paragraphs` extensions into account.
+
+    Args:
+        texts (Iterable[Union[str, tuple[str, Any]]]): The texts to filter. If
+            `as_tuples` is True, an iterable of (text, context) tuples.
+        thresholds (QualityThresholds, optional): The quality thresholds. If None,
+            uses the default thresholds. Defaults to None.
+        as_tuples (bool, optional): If True, `texts` are (text, context) tuples
+            and the tuples which pass are returned, as in `nlp.pipe`. Defaults to
+            False.
+
+    Yields:
+        Union[str, tuple[str, Any]]: The texts (or tuples) which might pass the
+            quality thresholds.
+
+    Example:
+        >>> import spacy
+        >>> import textdescriptives as td
+        >>> nlp = spacy.load("en_core_web_sm")
+        >>> nlp.add_pipe("textdescriptives/quality")
+        >>> texts = ["lorem ipsum dolor sit amet", "This is a text about cats."]
+        >>> docs = nlp.pipe(td.quality_prefilter(texts))
+    """
+    if thresholds is None:
+        thresholds = QualityThresholds()
+    for item in texts:
+        text = item[0] if as_tuples else item
+        if passes_quality_prefilter(text, thresholds):  # type: ignore
+            yield item
+
+
+class CompiledQualityThresholds:
+    """Quality thresholds compiled into vectors of lower and upper bounds, which
+    re-evaluate already extracted quality metrics without any spaCy processing.
+
+    The values are the columns produced by `QualityOutput.to_flat_value_dict`,
+    e.g. the quality columns of `td.extract_df` or of a Parquet file written by
+    `extract_to_parquet`. Missing values (None or NaN) are metrics which were not
+    computed, e.g. the `oov_ratio` without a vocabulary, and pass their
+    thresholds.
+
+    Example:
+        >>> import textdescriptives as td
+        >>> df = td.extract_df(texts, metrics="quality")
+        >>> thresholds = td.QualityThresholds(n_stop_words=(5, None))
+        >>> checks = td.CompiledQualityThresholds(thresholds)(df)
+        >>> df[checks["passed_quality_check"]]
+    """
+
+    def __init__(self, thresholds: Optional[QualityThresholds] = None):
+        """Compile the quality thresholds.
+
+        Args:
+            thresholds (QualityThresholds, optional): The quality thresholds. If
+                None, uses the default thresholds. Defaults to None.
+        """
+        if thresholds is None:
+            thresholds = QualityThresholds()
+        # the columns are the checks of the failure mask, in the order of its bits
+        self.columns: list[str] = quality_check_names(thresholds)
+        lower: list[float] = []
+        upper: list[float] = []
+        for name in QualityOutput.model_fields:
+            metric_thresholds = getattr(thresholds, name)
+            if not isinstance(metric_thresholds, dict):
+                metric_thresholds = {name: metric_thresholds}
+            for threshold in metric_thresholds.values():
+                if isinstance(threshold, bool):
+                    low, high = float(threshold), float(threshold)
+                elif threshold is None:
+                    low, high = -np.inf, np.inf
+                else:
+                    low = -np.inf if threshold[0] is None else threshold[0]
+                    high = np.inf if threshold[1] is None else threshold[1]
+                lower.append(low)
+                upper.append(high)
+        self.lower = np.array(lower, dtype=np.float64)
+        self.upper = np.array(upper, dtype=np.float64)
+
+    def _value_columns(
+        self,
+        values: Any,
+        columns: Optional[list[str]],
+    ) -> list[np.ndarray]:
+        """Get the values of each compiled column as a float array."""
+        if isinstance(values, np.ndarray):
+            names = self.columns if columns is None else list(columns)
+        elif isinstance(values, pd.DataFrame):
+            names = list(values.columns)
+        elif hasattr(values, "column_names"):  # a pyarrow Table
+            names = list(values.column_names)
+        else:
+            raise TypeError(
+                "Expected a pandas DataFrame, a pyarrow Table or a numpy array, "
+                + f"got {type(values).__name__}.",
+            )
+        # columns without limits can be missing, e.g. metrics added in later
+        # versions, and are then treated as not computed
+        unbounded = np.isneginf(self.lower) & np.isposinf(self.upper)
+        missing = [
+            name
+            for name, is_unbounded in zip(self.columns, unbounded)
+            if name not in names and not is_unbounded
+        ]
+        if missing:
+            raise ValueError(
+                f"The values do not contain the columns {missing}, which are "
+                + "required by the quality thresholds.",
+            )
+        arrays = []
+        for name in self.columns:
+            if name not in names:
+                arrays.append(np.full(len(values), np.nan))
+            elif isinstance(values, np.ndarray):
+                arrays.append(values[:, names.index(name)])
+            elif isinstance(values, pd.DataFrame):
+                arrays.append(values[name].to_numpy())
+            else:
+                arrays.append(values.column(name).to_numpy(zero_copy_only=False))
+        return [np.asarray(array, dtype=np.float64) for array in arrays]
+
+    def __call__(
+        self,
+        values: Any,
+        columns: Optional[list[str]] = None,
+    ) -> pd.DataFrame:
+        """Evaluate the thresholds on quality metrics.
+
+        Args:
+            values (Any): The quality metrics as a pandas DataFrame, a pyarrow
+                Table or a 2D numpy array with a row per document.
+            columns (list[str], optional): The names of the columns of a numpy
+                array. If None, the columns must be in the order of `columns`.
+                Ignored for DataFrames and Tables. Defaults to None.
+
+        Returns:
+            pd.DataFrame: A boolean column with whether each check passed, the
+                column `passed_quality_check` with whether all checks passed and
+                the column `quality_failure_mask`, where bit i is set if check
+                `columns[i]` failed. Has the same index as `values` if it is a
+                DataFrame.
+        """
+        n_rows = len(values)
+        checks: dict[str, np.ndarray] = {}
+        passed = np.ones(n_rows, dtype=bool)
+        mask = np.zeros(n_rows, dtype=np.int64)
+        for bit, (name, low, high, column) in enumerate(
+            zip(
+                self.columns,
+                self.lower,
+                self.upper,
+                self._value_columns(values, columns),
+            ),
+        ):
+            with np.errstate(invalid="ignore"):
+                check = ((column >= low) & (column <= high)) | np.isnan(column)
+            checks[name] = check
+            passed &= check
+            mask[~check] += 1 << bit
+        index = values.index if isinstance(values, pd.DataFrame) else None
+        return pd.DataFrame(
+            {
+                "passed_quality_check": passed,
+                "quality_failure_mask": mask,
+                **checks,
+            },
+            index=index,
+        )
+
+
+def apply_quality_thresholds(
+    values: Any,
+    thresholds: Optional[QualityThresholds] = None,
+    columns: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    """Check already extracted quality metrics against quality thresholds,
+    without processing the texts again.
+
+    See `CompiledQualityThresholds`, which can be reused to evaluate the same
+    thresholds on multiple batches of values.
+
+    Args:
+        values (Any): The quality metrics, as produced by `to_flat_value_dict`,
+            as a pandas DataFrame, a pyarrow Table or a 2D numpy array.
+        thresholds (QualityThresholds, optional): The quality thresholds. If None,
+            uses the default thresholds. Defaults to None.
+        columns (list[str], optional): The names of the columns of a numpy array.
+            Defaults to None.
+
+    Returns:
+        pd.DataFrame: Whether each check passed and the column
+            `passed_quality_check` with whether all checks passed.
+
+    Example:
+        >>> import textdescriptives as td
+        >>> df = td.extract_df(texts, metrics="quality")
+        >>> thresholds = td.QualityThresholds(alpha_ratio=(0.8, None))
+        >>> df["passed"] = td.apply_quality_thresholds(df, thresholds)[
+        ...     "passed_quality_check"
+        ... ]
+    """
+    return CompiledQualityThresholds(thresholds)(values, columns=columns)
+
+
+_MULTI_THRESHOLD_METRICS = {
+    "contains",
+    "symbol_to_word_ratio",
+    "top_ngram_chr_fraction",
+    "duplicate_ngram_chr_fraction",
+}
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Convert the value of a metric to a float, like `ThresholdsOutput` does."""
+    return None if value is None else float(value)
 
 
 class Quality:
@@ -367,16 +875,18 @@ class Quality:
         self,
         nlp: Language,
         name: str,
-        top_ngram_range: Tuple[int, int],
+        top_ngram_range: tuple[int, int],
         top_ngram_min_count: int,
-        duplicate_n_gram_fraction_range: Tuple[int, int],
+        duplicate_n_gram_fraction_range: tuple[int, int],
         vocab: Optional[Mapping],
         quality_thresholds: Optional[QualityThresholds] = None,
         force: bool = False,
+        filter_mode: bool = False,
     ):  # noqa: D107
         """Initialise components."""
         self.name = name
         self.force = force
+        self.filter_mode = filter_mode
         self.top_ngram_range = top_ngram_range
         self.top_ngram_min_count = top_ngram_min_count
         self.duplicate_n_gram_fraction_range = duplicate_n_gram_fraction_range
@@ -386,109 +896,192 @@ class Quality:
         self.set_quality_thresholds(quality_thresholds)
 
         self.vocab = vocab
+        self.near_duplicate_index: Optional[MinHashLSH] = None
 
         self.set_extensions()
 
-    def quality_setter(
+    def metric_values(
         self,
         span: Union[Span, Doc],
-    ) -> QualityOutput:
-        """Apply quality functions to doc.
+        update_index: bool = False,
+    ) -> dict[str, Callable[[], MetricValue]]:
+        """Get functions which compute the value of each quality metric, ordered by
+        their estimated cost. Metrics with multiple thresholds have a dict of
+        values.
 
         Args:
             span (Union[Span, Doc]): spaCy span or doc object
+            update_index (bool): Whether to add the span to the near-duplicate
+                index when computing `near_duplicate_jaccard`. Defaults to False.
 
         Returns:
-            QualityOutput: The quality metrics
+            dict[str, Callable[[], MetricValue]]: The functions computing the
+                values of each metric. `near_duplicate_jaccard` is only included if
+                a near-duplicate index is set.
         """
-        threshold = self.quality_thresholds
-
-        thresholds_outputs: Dict[
-            str,
-            Union[Dict[str, ThresholdsOutput], ThresholdsOutput],
-        ] = {}
-        # filter with only one threshold
-        getters = {
-            # heuristic quality filters
-            "n_stop_words": n_stop_words,
-            "alpha_ratio": alpha_ratio,
-            "mean_word_length": mean_word_length,
-            "doc_length": len,
-            "proportion_ellipsis": proportion_ellipsis,
-            "proportion_bullet_points": proportion_bullet_points,
-            # text repetition
-            "duplicate_line_chr_fraction": duplicate_line_chr_fraction,
-            "duplicate_paragraph_chr_fraction": duplicate_paragraph_chr_fraction,
+        metrics: dict[str, Callable[[], MetricValue]] = {
+            # computed from the text
+            "doc_length": lambda: len(span),
+            "contains": lambda: {
+                string: contains_string(span, string) for string in self.contains
+            },
+            "proportion_bullet_points": lambda: proportion_bullet_points(span),
+            "proportion_ellipsis": lambda: proportion_ellipsis(span),
+            "duplicate_line_chr_fraction": lambda: duplicate_line_chr_fraction(span),
+            "duplicate_paragraph_chr_fraction": lambda: (
+                duplicate_paragraph_chr_fraction(span)
+            ),
+            # computed from the token features
+            "n_stop_words": lambda: n_stop_words(span),
+            "alpha_ratio": lambda: alpha_ratio(span),
+            "mean_word_length": lambda: mean_word_length(span),
+            "symbol_to_word_ratio": lambda: {
+                symbol: symbol_to_word_ratio(span, symbol) for symbol in self.symbols
+            },
+            "oov_ratio": lambda: (
+                oov_ratio(span, self.vocab) if self._has_vocab(span) else None
+            ),
+            # computed from the n-grams
+            "top_ngram_chr_fraction": lambda: {
+                str(n_gram): frac
+                for n_gram, frac in top_ngram_chr_fraction(
+                    span,
+                    ngram_range=self.top_ngram_range,
+                    min_count=self.top_ngram_min_count,
+                ).items()
+            },
+            "duplicate_ngram_chr_fraction": lambda: {
+                str(n_gram): frac
+                for n_gram, frac in duplicate_ngram_fraction(
+                    span,
+                    ngram_range=self.duplicate_n_gram_fraction_range,
+                ).items()
+            },
         }
-
-        for name, getter in getters.items():
-            thresholds_outputs[name] = ThresholdsOutput(
-                value=getter(span),  # type: ignore
-                threshold=getattr(threshold, name),
+        # computed across documents, only if an index is set
+        if self.near_duplicate_index is not None:
+            index = self.near_duplicate_index
+            metrics["near_duplicate_jaccard"] = lambda: near_duplicate_jaccard(
+                span,
+                index,
+                insert=update_index,
             )
+        return metrics
 
-        thresholds_outputs["contains"] = {
-            string: ThresholdsOutput(
-                value=contains_string(span, string),
-                threshold=threshold.contains.get(string, None),
-            )
-            for string in self.contains
-        }
-        thresholds_outputs["symbol_to_word_ratio"] = {
-            symbol: ThresholdsOutput(
-                value=symbol_to_word_ratio(span, symbol),
-                threshold=threshold.symbol_to_word_ratio.get(symbol, None),
-            )
-            for symbol in self.symbols
-        }
+    def _has_vocab(self, span: Union[Span, Doc]) -> bool:
+        # add oov_ratio if spacy model is not small or has a vocab
+        # vector length is 0 for small models
+        return bool(span.vocab.vectors_length > 0 or self.vocab)
+
+    def _metric_keys(self, name: str) -> list[str]:
+        """Get the keys of a metric with multiple thresholds."""
+        if name == "contains":
+            return self.contains
+        if name == "symbol_to_word_ratio":
+            return self.symbols
+        if name == "top_ngram_chr_fraction":
+            lower, upper = self.top_ngram_range
+        else:
+            lower, upper = self.duplicate_n_gram_fraction_range
+        return [str(n) for n in range(lower, upper + 1)]
+
+    def _metric_thresholds(self) -> dict[str, MetricThreshold]:
+        """Get the threshold of each metric. Metrics with multiple thresholds have
+        a dict of thresholds."""
+        thresholds: dict[str, MetricThreshold] = {}
+        for name in QualityOutput.model_fields:
+            threshold = getattr(self.quality_thresholds, name)
+            if name in _MULTI_THRESHOLD_METRICS:
+                default = (None, None) if "ngram" in name else None
+                threshold = {
+                    key: threshold.get(key, default) for key in self._metric_keys(name)
+                }
+            thresholds[name] = threshold
+        return thresholds
+
+    def quality_result(
+        self,
+        span: Union[Span, Doc],
+        short_circuit: bool = False,
+        update_index: bool = False,
+    ) -> QualityResult:
+        """Compute the quality metrics of a span without creating a
+        `QualityOutput`.
 
-        chr_frac = top_ngram_chr_fraction(
-            span,
-            ngram_range=self.top_ngram_range,
-            min_count=self.top_ngram_min_count,
-        )
+        Args:
+            span (Union[Span, Doc]): spaCy span or doc object
+            short_circuit (bool): If True, the metrics are computed in order of
+                their estimated cost and no further metrics are computed once a
+                threshold is failed. The value of the metrics which are not
+                computed is None. Defaults to False.
+            update_index (bool): Whether to add the span to the near-duplicate
+                index. Defaults to False.
 
-        thresholds_outputs["top_ngram_chr_fraction"] = {
-            str(n_gram): ThresholdsOutput(
-                value=frac,
-                threshold=threshold.top_ngram_chr_fraction.get(
-                    str(n_gram),
-                    (None, None),
-                ),
-            )
-            for n_gram, frac in chr_frac.items()
-        }
+        Returns:
+            QualityResult: The values and thresholds of the quality metrics
+        """
+        # the thresholds are shared by all results, and only differ in whether the
+        # oov_ratio is checked
+        thresholds = self._thresholds[self._has_vocab(span)]
+        values: dict[str, MetricValue] = {}
+        failed = False
+        for name, compute_value in self.metric_values(span, update_index).items():
+            if failed:
+                value: MetricValue = (
+                    dict.fromkeys(self._metric_keys(name))
+                    if name in _MULTI_THRESHOLD_METRICS
+                    else None
+                )
+            else:
+                value = compute_value()
+                if isinstance(value, dict):
+                    value = {key: _as_float(v) for key, v in value.items()}
+                else:
+                    value = _as_float(value)
+            values[name] = value
+            if short_circuit and not _metric_passed(value, thresholds[name]):
+                failed = True
+        return QualityResult(values, thresholds, self.check_names)
 
-        duplicate_ngram_chr_fraction = duplicate_ngram_fraction(
-            span,
-            ngram_range=self.duplicate_n_gram_fraction_range,
-        )
-        thresholds_outputs["duplicate_ngram_chr_fraction"] = {
-            str(n_gram): ThresholdsOutput(
-                value=frac,
-                threshold=threshold.duplicate_ngram_chr_fraction.get(
-                    str(n_gram),
-                    (None, None),
-                ),
-            )
-            for n_gram, frac in duplicate_ngram_chr_fraction.items()
-        }
+    def quality_setter(
+        self,
+        span: Union[Span, Doc],
+        short_circuit: bool = False,
+    ) -> QualityOutput:
+        """Apply quality functions to doc.
 
-        # add oov_ratio if spacy model is not small or has a vocab
-        # vector length is 0 for small models
-        if span.vocab.vectors_length > 0 or self.vocab:
-            value_oov = oov_ratio(span, self.vocab)
-            thresholds_oov = threshold.oov_ratio
-        else:
-            value_oov = None
-            thresholds_oov = (None, None)
+        Args:
+            span (Union[Span, Doc]): spaCy span or doc object
+            short_circuit (bool): If True, the metrics are computed in order of
+                their estimated cost and no further metrics are computed once a
+                threshold is failed. The value of the metrics which are not
+                computed is None. Defaults to False.
 
-        thresholds_outputs["oov_ratio"] = ThresholdsOutput(
-            value=value_oov,
-            threshold=thresholds_oov,
-        )
+        Returns:
+            QualityOutput: The quality metrics
+        """
+        return self.quality_result(span, short_circuit=short_circuit).to_output()
 
-        return QualityOutput(**thresholds_outputs)
+    def result_getter(self, span: Union[Span, Doc]) -> QualityResult:
+        """Get the quality result of a doc, computing it if it has not been set.
+
+        Args:
+            span (Union[Span, Doc]): spaCy span or doc object
+
+        Returns:
+            QualityResult: The values and thresholds of the quality metrics
+        """
+        stored = span._._quality
+        if stored is None:
+            return self.quality_result(span)
+        if "values" not in stored:
+            # stored as a dumped QualityOutput by earlier versions
+            return QualityResult.from_output(QualityOutput(**stored))
+        return QualityResult(
+            stored["values"],
+            stored["thresholds"],
+            self.check_names,
+        )
 
     def quality_getter(self, span: Union[Span, Doc]) -> QualityOutput:
         """Get quality metrics from doc.
@@ -499,9 +1092,7 @@ class Quality:
         Returns:
             QualityOutput: The quality metrics
         """
-        if not hasattr(span._, "_quality"):
-            return self.quality_setter(span)
-        return QualityOutput(**span._._quality)
+        return self.result_getter(span).to_output()
 
     def set_quality(self, doc: Doc) -> None:
         """Set the quality attribute on a doc.
@@ -509,11 +1100,14 @@ class Quality:
         Args:
             doc (Doc): spaCy doc object
         """
-        # to allow the variable to json serializable we convert it to json
-        # it is then converted back into a quality output object in the getter
-
-        doc._._quality = self.quality_setter(doc).model_dump()
-        doc._.passed_quality_check = self.passed_quality_thresholds(doc)
+        # the values and thresholds are stored as plain dicts, such that they are
+        # serializable. The QualityOutput is only created in the getter
+        result = self.quality_result(
+            doc,
+            short_circuit=self.filter_mode,
+            update_index=True,
+        )
+        doc._._quality = {"values": result.values, "thresholds": result.thresholds}
 
     def passed_quality_thresholds(self, span: Union[Span, Doc]) -> bool:
         """Check if a span passes the quality thresholds.
@@ -524,8 +1118,19 @@ class Quality:
         Returns:
             bool: True if span passes quality thresholds
         """
-        quality_output = self.quality_getter(span)
-        return quality_output.passed
+        return self.result_getter(span).passed
+
+    def failure_mask_getter(self, span: Union[Span, Doc]) -> int:
+        """Get an integer recording which quality checks a span failed. Bit i is
+        set if the check `check_names[i]` failed.
+
+        Args:
+            span (Union[Span, Doc]): spaCy span or doc object
+
+        Returns:
+            int: The failure mask
+        """
+        return self.result_getter(span).failure_mask
 
     def set_extensions(self):
         """Set required extensions."""
@@ -551,6 +1156,18 @@ class Quality:
             Span.set_extension(ext_name, getter=self.quality_getter, force=True)
             Span.set_extension("_" + ext_name, default=None, force=True)
 
+        ext_name = "quality_result"
+        if not Doc.has_extension(ext_name) or self.force is True:
+            Doc.set_extension(ext_name, getter=self.result_getter, force=True)
+        if not Span.has_extension(ext_name) or self.force is True:
+            Span.set_extension(ext_name, getter=self.result_getter, force=True)
+
+        ext_name = "quality_failure_mask"
+        if not Doc.has_extension(ext_name) or self.force is True:
+            Doc.set_extension(ext_name, getter=self.failure_mask_getter, force=True)
+        if not Span.has_extension(ext_name) or self.force is True:
+            Span.set_extension(ext_name, getter=self.failure_mask_getter, force=True)
+
     def set_quality_thresholds(self, thresholds: QualityThresholds) -> None:
         """Sets the quality thresholds.
 
@@ -560,9 +1177,36 @@ class Quality:
         self.quality_thresholds = thresholds
         self.contains = list(self.quality_thresholds.contains.keys())
         self.symbols = list(self.quality_thresholds.symbol_to_word_ratio.keys())
+        thresholds_with_oov = self._metric_thresholds()
+        # the checks of the failure mask only depend on the thresholds, and not on
+        # the n-gram ranges, so the bits match those of CompiledQualityThresholds
+        self.check_names = quality_check_names(thresholds)
+        # without a vocabulary the oov_ratio is not checked
+        self._thresholds = {
+            True: thresholds_with_oov,
+            False: {**thresholds_with_oov, "oov_ratio": (None, None)},
+        }
+
+    def set_near_duplicate_index(self, index: Optional[MinHashLSH]) -> None:
+        """Sets the index used to find near-duplicates of the processed documents.
+
+        Each processed `Doc` is compared to the documents in the index, which
+        gives its `near_duplicate_jaccard`, and then added to the index. Thus,
+        the first of a group of near-duplicates has a low similarity and the later
+        ones a high similarity. Set an upper threshold for
+        `near_duplicate_jaccard` to fail the later ones. Note that the index is
+        not shared between processes when using `nlp.pipe(..., n_process=n)`.
+
+        Args:
+            index (Optional[MinHashLSH]): The index. If None,
+                `near_duplicate_jaccard` is neither computed nor included in the
+                outputs.
+        """
+        self.near_duplicate_index = index
 
     def __call__(self, doc: Doc):
         """Run the pipeline component."""
+        validate_memo(doc)
         self.set_quality(doc)
         return doc
 
@@ -572,8 +1216,12 @@ class Quality:
     assigns=[
         "doc._.quality",
         "doc._.passed_quality_check",
+        "doc._.quality_result",
+        "doc._.quality_failure_mask",
         "span._.quality",
         "span._.passed_quality_check",
+        "span._.quality_result",
+        "span._.quality_failure_mask",
     ],
     default_config={
         "top_ngram_range": [2, 4],
@@ -581,16 +1229,18 @@ class Quality:
         "duplicate_n_gram_fraction_range": [5, 10],
         "vocab": None,
         "force": True,
+        "filter_mode": False,
     },
 )
 def create_quality_component(
     nlp: Language,
     name: str,
-    top_ngram_range: Tuple[int, int],
+    top_ngram_range: tuple[int, int],
     top_ngram_min_count: int,
-    duplicate_n_gram_fraction_range: Tuple[int, int],
+    duplicate_n_gram_fraction_range: tuple[int, int],
     vocab: Optional[Mapping],
     force: bool = True,
+    filter_mode: bool = False,
 ) -> Callable[[Doc], Doc]:
     """Allows Quality to be added to a spaCy pipe using
     nlp.add_pipe("textdescriptives/quality").
@@ -599,6 +1249,10 @@ def create_quality_component(
 
     - {Span/Doc}._.quality
     - {Span/Doc}._.passed_quality_check
+    - {Span/Doc}._.quality_result, a lightweight version of `quality` which
+      does not create a pydantic model. Use it when evaluating many documents.
+    - {Span/Doc}._.quality_failure_mask, an integer where bit i is set if the
+      check `check_names[i]` of the component failed.
 
     It also sets:
 
@@ -624,11 +1278,11 @@ def create_quality_component(
             nlp.add_pipe call.
         name (str): name of the component. Can be optionally specified in the
             nlp.add_pipe call, using the name argument.
-        top_ngram_range (Tuple[int]): range of n-grams to calculate the
+        top_ngram_range (tuple[int]): range of n-grams to calculate the
             proportion of the top n-gram. Defaults to [2, 4].
         top_ngram_min_count (int): minimum number of times a n-gram must occur to
             be considered a top n-gram. Defaults to 3.
-        duplicate_n_gram_fraction_range (Tuple[int]): range of n-grams to
+        duplicate_n_gram_fraction_range (tuple[int]): range of n-grams to
             calculate the proportion of duplicate n-grams. Defaults to [5, 10].
         vocab (Optional[Mapping]): vocabulary to use for calculating the
             out-of-vocabulary ratio (`oov_ratio`). If None, will use the vocabulary
@@ -636,6 +1290,11 @@ def create_quality_component(
             vocabulary. The attribute will only be set if the vocabulary is not
             None or the spaCy model is medium or large.
         force (bool): whether to overwrite existing extensions. Defaults to True.
+        filter_mode (bool): If True, the metrics are computed in order of their
+            estimated cost and evaluation stops at the first failed threshold,
+            which is sufficient to decide `passed_quality_check`. Metrics which are
+            not computed have the value None in `doc._.quality`. Use this when
+            filtering a corpus. Defaults to False.
 
 
     Returns:
@@ -661,4 +1320,5 @@ def create_quality_component(
         quality_thresholds=None,
         vocab=vocab,
         force=force,
+        filter_mode=filter_mode,
     )
@@ -1,10 +1,49 @@
 """Data classes used for the quality component."""
 
-from typing import Any, Dict, Optional, Tuple, Union
+from collections.abc import Iterable
+from typing import Any, Optional, Union
 
-from pydantic import ConfigDict, BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
-Interval = Tuple[Optional[float], Optional[float]]
+Interval = tuple[Optional[float], Optional[float]]
+Threshold = Union[Interval, bool, None]
+MetricValue = Union[Optional[float], dict[str, Optional[float]]]
+MetricThreshold = Union[Threshold, dict[str, Threshold]]
+
+
+def _threshold_passed(value: Optional[float], threshold: Threshold) -> Optional[bool]:
+    """Whether a value is within its thresholds. None if the value is None."""
+    if value is None:
+        return None
+    if threshold is None:
+        return True
+    if isinstance(threshold, bool):
+        return threshold == value
+    lower, upper = threshold
+    return (lower is None or lower <= value) and (upper is None or value <= upper)
+
+
+def _failure_mask(
+    checks: Iterable[tuple[str, Optional[bool]]],
+    check_names: list[str],
+) -> int:
+    """Combine the results of the checks into an integer, where bit i is set if
+    check `check_names[i]` failed. Checks which were not evaluated (None) did not
+    fail, and checks which are not in `check_names` have no bit."""
+    bits = {name: bit for bit, name in enumerate(check_names)}
+    mask = 0
+    for name, passed in checks:
+        if passed is False and name in bits:
+            mask |= 1 << bits[name]
+    return mask
+
+
+def _metric_passed(value: MetricValue, threshold: MetricThreshold) -> bool:
+    """Whether a metric passed its thresholds, following `QualityOutput.passed`."""
+    if isinstance(value, dict):
+        return all(_threshold_passed(v, threshold[k]) for k, v in value.items())  # type: ignore
+    passed = _threshold_passed(value, threshold)  # type: ignore
+    return passed is None or passed
 
 
 class ThresholdsOutput(BaseModel):
@@ -23,22 +62,13 @@ class ThresholdsOutput(BaseModel):
 
     model_config = ConfigDict(extra="forbid")
 
-    threshold: Union[Interval, bool, None]
+    threshold: Threshold
     value: Union[float, None]
 
     @property
     def passed(self) -> Optional[bool]:
         """Return True if the value is within the thresholds."""
-        if self.value is None:
-            return None
-        if self.threshold is None:
-            return True
-        if isinstance(self.threshold, bool):
-            return self.threshold == self.value
-        lower, upper = self.threshold
-        return (lower is None or lower <= self.value) and (
-            upper is None or self.value <= upper
-        )
+        return _threshold_passed(self.value, self.threshold)
 
     def __repr_str__(self, join_str: str) -> str:
         value = round(self.value, 2) if isinstance(self.value, float) else self.value
@@ -85,7 +115,7 @@ class QualityThresholds(BaseModel):
         description="A Range for the document length. Default: (10, 100_000), i.e."
         + " between 10 and 100_000 words (spacy tokens).",
     )
-    symbol_to_word_ratio: Dict[str, Interval] = Field(
+    symbol_to_word_ratio: dict[str, Interval] = Field(
         {"#": (None, 0.1)},
         description="A dict of symbols and the allowed range for the "
         + r"symbol-to-word-ratio. The symbol-to-word-ratio is the ratio between symbol"
@@ -106,7 +136,7 @@ class QualityThresholds(BaseModel):
         + r"points. Default: (None, 0.8), i.e. no lower limit, but at most 80% of lines"
         + " start with a bullet point.",
     )
-    contains: Dict[str, bool] = Field(
+    contains: dict[str, bool] = Field(
         {"lorem ipsum": False},
         description="A dictionary of strings and whether they should be contained in "
         + "the document. Default: {'lorem ipsum': False}, i.e. the document should not"
@@ -124,7 +154,7 @@ class QualityThresholds(BaseModel):
         + r" (None, 0.2), i.e. no lower limit, but at most 20% of characters are "
         + "duplicates.",
     )
-    duplicate_ngram_chr_fraction: Dict[str, Interval] = Field(
+    duplicate_ngram_chr_fraction: dict[str, Interval] = Field(
         {
             "5": (None, 0.15),
             "6": (None, 0.14),
@@ -140,7 +170,7 @@ class QualityThresholds(BaseModel):
         + r"5-grams, 14% for 6-grams, 13% for 7-grams, 12% for 8-grams, 11% for 9-grams"
         + r" and 10% for 10-grams.",
     )
-    top_ngram_chr_fraction: Dict[str, Interval] = Field(
+    top_ngram_chr_fraction: dict[str, Interval] = Field(
         {
             "2": (None, 0.2),
             "3": (None, 0.18),
@@ -157,6 +187,13 @@ class QualityThresholds(BaseModel):
         description="A range for the out-of-vocabulary ratio. Default: (None, 0.2)"
         + r" i.e. no lower limit, but at most 20% of words are out-of-vocabulary.",
     )
+    near_duplicate_jaccard: Interval = Field(
+        (None, None),
+        description="A range for the estimated Jaccard similarity to the most "
+        + "similar previously processed document. Only computed if a near-duplicate "
+        + "index is set. Default: (None, None), i.e. no limits. Set e.g. "
+        + "(None, 0.8) to fail near-duplicates.",
+    )
 
 
 class QualityOutput(BaseModel):
@@ -180,7 +217,7 @@ class QualityOutput(BaseModel):
         ...,
         description="The thresholds output for the document length.",
     )
-    symbol_to_word_ratio: Dict[str, ThresholdsOutput] = Field(
+    symbol_to_word_ratio: dict[str, ThresholdsOutput] = Field(
         ...,
         description="The thresholds output for the symbol-to-word-ratio.",
     )
@@ -194,7 +231,7 @@ class QualityOutput(BaseModel):
         description="The thresholds output for the proportion of lines starting with "
         + "bullet points.",
     )
-    contains: Dict[str, ThresholdsOutput] = Field(
+    contains: dict[str, ThresholdsOutput] = Field(
         ...,
         description="The thresholds output for the presence of strings.",
     )
@@ -207,12 +244,12 @@ class QualityOutput(BaseModel):
         description="The thresholds output for the duplicate paragraph character "
         + "fraction.",
     )
-    duplicate_ngram_chr_fraction: Dict[str, ThresholdsOutput] = Field(
+    duplicate_ngram_chr_fraction: dict[str, ThresholdsOutput] = Field(
         ...,
         description="The thresholds output for the duplicate n-gram character "
         + "fraction.",
     )
-    top_ngram_chr_fraction: Dict[str, ThresholdsOutput] = Field(
+    top_ngram_chr_fraction: dict[str, ThresholdsOutput] = Field(
         ...,
         description="The thresholds output for the top n-gram character fraction.",
     )
@@ -220,6 +257,14 @@ class QualityOutput(BaseModel):
         ...,
         description="The thresholds output for the out-of-vocabulary ratio.",
     )
+    near_duplicate_jaccard: Optional[ThresholdsOutput] = Field(
+        None,
+        description="The thresholds output for the estimated Jaccard similarity to "
+        + "the most similar previously processed document. None if no "
+        + "near-duplicate index is set.",
+    )
+    # the checks which define the bits of the failure mask, see `quality_check_names`
+    _check_names: Optional[list[str]] = PrivateAttr(default=None)
 
     @property
     def passed(self) -> bool:
@@ -241,6 +286,11 @@ class QualityOutput(BaseModel):
             all(v.passed for v in self.duplicate_ngram_chr_fraction.values()),
             all(v.passed for v in self.top_ngram_chr_fraction.values()),
             self.oov_ratio.passed,
+            (
+                self.near_duplicate_jaccard.passed
+                if self.near_duplicate_jaccard is not None
+                else None
+            ),
         ]
 
         return all(i is None or i for i in passed_or_none)
@@ -254,16 +304,219 @@ class QualityOutput(BaseModel):
             + list(self.__repr_args__())
         )
 
-    def to_flat_value_dict(self) -> Dict[str, Any]:
+    @property
+    def failure_mask(self) -> int:
+        """
+        Returns:
+            int: An integer where bit i is set if check i failed. The checks are
+                those of the quality component which created the output (see
+                `quality_check_names`), or else all checks of the output in the
+                order of `to_flat_value_dict`.
+        """
+        checks: list[tuple[str, Optional[bool]]] = []
+        for name, metric in self.__dict__.items():
+            if isinstance(metric, dict):
+                checks.extend((f"{name}_{k}", v.passed) for k, v in metric.items())
+            elif metric is not None:
+                checks.append((name, metric.passed))
+        check_names = self._check_names
+        if check_names is None:
+            check_names = [name for name, _ in checks]
+        return _failure_mask(checks, check_names)
+
+    def to_flat_value_dict(self) -> dict[str, Any]:
         """Creates a flat dictionary representation of the object to allow for
         easy easy conversion to a pandas DataFrame."""
-        flat_dict = {"passed_quality_check": self.passed}
+        flat_dict = {
+            "passed_quality_check": self.passed,
+            "quality_failure_mask": self.failure_mask,
+        }
 
         for k, v in self.__dict__.items():
             if isinstance(v, dict):
                 for k2, v2 in v.items():
                     flat_dict[f"{k}_{k2}"] = v2.value
-            else:
+            elif v is not None:
                 flat_dict[k] = v.value
 
         return flat_dict
+
+
+# the failure mask is stored as an int64, e.g. in the columns of a DataFrame
+_MAX_CHECKS = 63
+
+
+def _threshold_check_names(thresholds: dict[str, MetricThreshold]) -> list[str]:
+    """Get the names of the checks of the thresholds of each metric."""
+    names: list[str] = []
+    for name in QualityOutput.model_fields:
+        if name not in thresholds:
+            continue
+        threshold = thresholds[name]
+        if isinstance(threshold, dict):
+            names.extend(f"{name}_{key}" for key in threshold)
+        else:
+            names.append(name)
+    return names
+
+
+def quality_check_names(thresholds: QualityThresholds) -> list[str]:
+    """Get the names of the quality checks of a set of thresholds, which define
+    the bits of the failure mask: bit i is set if check i failed.
+
+    The checks are the metrics in the order of the fields of `QualityThresholds`,
+    where metrics with a dict of thresholds, e.g. `top_ngram_chr_fraction`, have
+    a check named `{metric}_{key}` for each key of the dict in its order. The
+    table only depends on the thresholds, such that the quality component and
+    `CompiledQualityThresholds` use the same bits. Values of a metric without a
+    threshold, e.g. n-gram sizes which are computed but not in the dict, cannot
+    fail and have no bit.
+
+    Args:
+        thresholds (QualityThresholds): The quality thresholds.
+
+    Returns:
+        list[str]: The name of the check of each bit.
+
+    Raises:
+        ValueError: If the thresholds have more than 63 checks, as the failure
+            mask is stored as an int64.
+    """
+    names = _threshold_check_names(
+        {name: getattr(thresholds, name) for name in QualityOutput.model_fields},
+    )
+    if len(names) > _MAX_CHECKS:
+        raise ValueError(
+            f"The quality thresholds have {len(names)} checks, but the failure "
+            + f"mask holds at most {_MAX_CHECKS}. Remove some of the thresholds of "
+            + "`contains`, `symbol_to_word_ratio` or the n-gram metrics.",
+        )
+    return names
+
+
+class QualityResult:
+    """The values of the quality metrics together with their thresholds.
+
+    A lightweight counterpart of `QualityOutput` used by the quality component,
+    which avoids validating a pydantic model for each document. The
+    `QualityOutput` is only created when requested using `to_output`.
+
+    Attributes:
+        values (dict[str, MetricValue]): The value of each metric. Metrics with
+            multiple thresholds have a dict of values. `near_duplicate_jaccard` is
+            only included if a near-duplicate index is set.
+        thresholds (dict[str, MetricThreshold]): The threshold of each metric.
+            Metrics with multiple thresholds have a dict of thresholds.
+        check_names (list[str]): The checks which define the bits of
+            `failure_mask`, see `quality_check_names`.
+    """
+
+    __slots__ = ("values", "thresholds", "check_names")
+
+    def __init__(
+        self,
+        values: dict[str, MetricValue],
+        thresholds: dict[str, MetricThreshold],
+        check_names: Optional[list[str]] = None,
+    ):
+        """Create a result from the values and thresholds of the metrics.
+
+        Args:
+            values (dict[str, MetricValue]): The value of each metric.
+            thresholds (dict[str, MetricThreshold]): The threshold of each metric.
+            check_names (list[str], optional): The checks which define the bits
+                of `failure_mask`. If None, all checks of `thresholds` in order.
+                Defaults to None.
+        """
+        self.values = values
+        self.thresholds = thresholds
+        if check_names is None:
+            check_names = _threshold_check_names(thresholds)
+        self.check_names = check_names
+
+    @classmethod
+    def from_output(cls, output: QualityOutput) -> "QualityResult":
+        """Create a result from a `QualityOutput`."""
+        values: dict[str, MetricValue] = {}
+        thresholds: dict[str, MetricThreshold] = {}
+        for name, metric in output:
+            if metric is None:
+                continue
+            if isinstance(metric, dict):
+                values[name] = {k: v.value for k, v in metric.items()}
+                thresholds[name] = {k: v.threshold for k, v in metric.items()}
+            else:
+                values[name] = metric.value
+                thresholds[name] = metric.threshold
+        return cls(values, thresholds, output._check_names)
+
+    @property
+    def passed(self) -> bool:
+        """
+        Returns:
+            bool: Whether all thresholds have been passed.
+        """
+        return all(
+            _metric_passed(value, self.thresholds[name])
+            for name, value in self.values.items()
+        )
+
+    @property
+    def failure_mask(self) -> int:
+        """
+        Returns:
+            int: An integer where bit i is set if the check `check_names[i]`
+                failed.
+        """
+        checks: list[tuple[str, Optional[bool]]] = []
+        for name in QualityOutput.model_fields:
+            if name not in self.values:
+                continue
+            value, threshold = self.values[name], self.thresholds[name]
+            if isinstance(value, dict):
+                checks.extend(
+                    (f"{name}_{key}", _threshold_passed(v, threshold[key]))  # type: ignore
+                    for key, v in value.items()
+                )
+            else:
+                checks.append((name, _threshold_passed(value, threshold)))  # type: ignore
+        return _failure_mask(checks, self.check_names)
+
+    def failed_checks(self) -> list[str]:
+        """Get the names of the checks which failed."""
+        mask = self.failure_mask
+        return [name for bit, name in enumerate(self.check_names) if mask >> bit & 1]
+
+    def to_flat_value_dict(self) -> dict[str, Any]:
+        """Creates a flat dictionary representation of the values, identical to
+        `QualityOutput.to_flat_value_dict`."""
+        flat_dict = {
+            "passed_quality_check": self.passed,
+            "quality_failure_mask": self.failure_mask,
+        }
+        for name in QualityOutput.model_fields:
+            if name not in self.values:
+                continue
+            value = self.values[name]
+            if isinstance(value, dict):
+                for key, v in value.items():
+                    flat_dict[f"{name}_{key}"] = v
+            else:
+                flat_dict[name] = value
+        return flat_dict
+
+    def to_output(self) -> QualityOutput:
+        """Create the `QualityOutput` of the result."""
+        outputs: dict[str, Any] = {}
+        for name, value in self.values.items():
+            threshold = self.thresholds[name]
+            if isinstance(value, dict):
+                outputs[name] = {
+                    key: ThresholdsOutput(value=v, threshold=threshold[key])  # type: ignore
+                    for key, v in value.items()
+                }
+            else:
+                outputs[name] = ThresholdsOutput(value=value, threshold=threshold)
+        output = QualityOutput(**outputs)
+        output._check_names = self.check_names
+        return output
@@ -11,7 +11,12 @@ from .descriptive_stats import (  # noqa
     create_descriptive_stats_component,
     language_exists_in_pyphen,
 )
-from .utils import filter_tokens
+from .utils import (
+    memoized_getter,
+    store_extension_values,
+    token_features,
+    validate_memo,
+)
 
 
 class Readability:
@@ -21,12 +26,16 @@ class Readability:
     attribute.
     """
 
-    def __init__(self, nlp: Language):
+    def __init__(self, nlp: Language, eager: bool = False):
         """Initialise components."""
+        self.eager = eager
         self.can_calculate_syllables = language_exists_in_pyphen(lang=nlp.lang)
 
         if not Doc.has_extension("readability"):
-            Doc.set_extension("readability", getter=self.readability)
+            Doc.set_extension(
+                "readability",
+                getter=memoized_getter("readability", self.readability),
+            )
 
     def _flesch_reading_ease(self, doc: Doc):
         """Calculate the Flesch Reading Ease score for a document. The equation
@@ -161,7 +170,8 @@ class Readability:
             if self.can_calculate_syllables
             else 0
         )
-        long_words = len([t for t in filter_tokens(doc) if len(t) > 6])
+        features = token_features(doc)
+        long_words = int((features.length[features.is_filtered] > 6).sum())
 
         return {
             "flesch_reading_ease": self._flesch_reading_ease(doc),
@@ -176,18 +186,22 @@ class Readability:
 
     def __call__(self, doc: Doc):
         """Run the pipeline component."""
+        validate_memo(doc)
+        if self.eager:
+            store_extension_values(doc, ["readability"])
         return doc
 
 
 @Language.factory(
     "textdescriptives/readability",
     assigns=["doc._.readability"],
-    default_config={"verbose": False},
+    default_config={"verbose": False, "eager": False},
 )
 def create_readability_component(
     nlp: Language,
     name: str,
     verbose: bool,
+    eager: bool,
 ) -> Callable[[Doc], Doc]:
     """Allows Readability to be added to a spaCy pipe using
     nlp.add_pipe("textdescriptives/readability").
@@ -206,6 +220,10 @@ def create_readability_component(
         verbose (bool): Toggle to show a message if the
             "textdescriptives/descriptive_stats" component is added to the pipeline.
             Defaults to True.
+        eager (bool): If True, the readability metrics are computed when the
+            component is run and stored on the `Doc`, instead of when they are
+            accessed. This allows the metrics to be computed in parallel with
+            `nlp.pipe(..., n_process=n)`. Defaults to False.
 
     Returns:
         Callable[[Doc], Doc]: The Readability component
@@ -225,5 +243,5 @@ def create_readability_component(
                 "'textdescriptives/descriptive_stats' component is required for"
                 + " 'textdescriptives.readability'. Adding to pipe.",
             )
-        nlp.add_pipe("textdescriptives/descriptive_stats")
-    return Readability(nlp)
+        nlp.add_pipe("textdescriptives/descriptive_stats", config={"eager": eager})
+    return Readability(nlp, eager=eager)
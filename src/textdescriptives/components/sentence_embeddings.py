@@ -0,0 +1,217 @@
+"""Embed sentences in batches with any embedding model, caching the embeddings
+in memory and optionally on disk."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+
+def _sentence_key(sentence: str) -> bytes:
+    """Get the content address of a sentence, a hash of its text which is stable
+    across processes."""
+    return hashlib.blake2b(sentence.encode(), digest_size=16).digest()
+
+
+class SentenceEmbedder:
+    """Embeds sentences with an embedding model, which can be any callable that
+    takes a list of sentences and returns an array with an embedding for each
+    sentence, e.g. a sentence-transformers, ONNX or NumPy model.
+
+    Sentences are embedded in batches of `batch_size`, and the embeddings are
+    cached by a hash of the text of the sentence, such that sentences which occur
+    many times in a corpus, e.g. boilerplate, are only embedded once. The most
+    recently used embeddings are kept in memory, and all embeddings are stored
+    in a SQLite database if `path` is given, so they can be reused across runs.
+    Embeddings computed elsewhere can be added to the cache with `add`.
+
+    Example:
+        >>> import spacy
+        >>> import textdescriptives as td
+        >>> from sentence_transformers import SentenceTransformer
+        >>> model = SentenceTransformer("all-MiniLM-L6-v2")
+        >>> embedder = td.SentenceEmbedder(model.encode, path="embeddings.db")
+        >>> nlp = spacy.blank("en")
+        >>> nlp.add_pipe("sentencizer")
+        >>> coherence = nlp.add_pipe("textdescriptives/coherence")
+        >>> coherence.set_sentence_embedder(embedder)
+        >>> docs = nlp.pipe(texts)
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[list[str]], np.ndarray],
+        batch_size: int = 256,
+        cache_size: int = 10_000,
+        path: str | Path | None = None,
+    ):
+        """Create an embedder with an empty cache, or open the cache stored at
+        `path`.
+
+        Args:
+            embed (Callable[[list[str]], np.ndarray]): The embedding model. Called
+                with a list of sentences and returns a (n_sentences, width)
+                array.
+            batch_size (int, optional): Maximum number of sentences passed to
+                `embed` at once. Defaults to 256.
+            cache_size (int, optional): Maximum number of embeddings to keep in
+                memory. Set to 0 to disable the cache in memory. Defaults to
+                10_000.
+            path (str | Path, optional): Path of a SQLite database to store
+                the embeddings in. If None, embeddings are only cached in memory.
+                Defaults to None.
+        """
+        self.embed_fn = embed
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._connection: sqlite3.Connection | None = None
+        if path is not None:
+            self._connection = sqlite3.connect(str(path))
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                + "(key BLOB PRIMARY KEY, embedding BLOB)",
+            )
+
+    def __len__(self) -> int:
+        """Number of embeddings cached in memory."""
+        return len(self._cache)
+
+    def _remember(self, key: bytes, embedding: np.ndarray) -> None:
+        """Add an embedding to the cache in memory, evicting the least recently
+        used embeddings if it is full."""
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _load(self, keys: list[bytes]) -> dict[bytes, np.ndarray]:
+        """Get the embeddings stored in the database for some keys."""
+        embeddings: dict[bytes, np.ndarray] = {}
+        if self._connection is None:
+            return embeddings
+        # stay below the maximum number of parameters of a SQLite query
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            rows = self._connection.execute(
+                "SELECT key, embedding FROM embeddings WHERE key IN "
+                + f"({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for key, blob in rows:
+                embeddings[key] = np.frombuffer(blob, dtype=np.float32)
+        return embeddings
+
+    def _store(self, embeddings: dict[bytes, np.ndarray]) -> None:
+        """Cache embeddings in memory and in the database."""
+        for key, embedding in embeddings.items():
+            self._remember(key, embedding)
+        if self._connection is not None:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                [(key, embedding.tobytes()) for key, embedding in embeddings.items()],
+            )
+
+    def _embed_batch(self, sentences: list[str]) -> np.ndarray:
+        embeddings = np.asarray(self.embed_fn(sentences), dtype=np.float32)
+        if embeddings.ndim != 2 or len(embeddings) != len(sentences):
+            raise ValueError(
+                f"The embedding model returned an array of shape {embeddings.shape}"
+                + f" for {len(sentences)} sentences, expected an array with one "
+                + "row for each sentence.",
+            )
+        return embeddings
+
+    def add(self, sentences: Sequence[str], embeddings: np.ndarray) -> None:
+        """Add precomputed embeddings of sentences to the cache.
+
+        Args:
+            sentences (Sequence[str]): The sentences.
+            embeddings (np.ndarray): A (n_sentences, width) array with the
+                embedding of each sentence.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(embeddings) != len(sentences):
+            raise ValueError(
+                f"Got {len(embeddings)} embeddings for {len(sentences)} sentences.",
+            )
+        self._store(
+            {
+                _sentence_key(sentence): embedding
+                for sentence, embedding in zip(sentences, embeddings)
+            },
+        )
+
+    def embed(self, sentences: Sequence[str]) -> np.ndarray:
+        """Get the embeddings of sentences. Only sentences which are not in the
+        cache are passed to the embedding model, and each of them only once.
+
+        Args:
+            sentences (Sequence[str]): The sentences.
+
+        Returns:
+            np.ndarray: A (n_sentences, width) float32 array with the embedding of
+                each sentence.
+        """
+        keys = [_sentence_key(sentence) for sentence in sentences]
+        found: dict[bytes, np.ndarray] = {}
+        missing: dict[bytes, str] = {}
+        for key, sentence in zip(keys, sentences):
+            if key in found or key in missing:
+                continue
+            embedding = self._cache.get(key)
+            if embedding is None:
+                missing[key] = sentence
+            else:
+                self._cache.move_to_end(key)
+                found[key] = embedding
+
+        stored = self._load(list(missing))
+        for key, embedding in stored.items():
+            self._remember(key, embedding)
+            del missing[key]
+        found.update(stored)
+
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), self.batch_size):
+            batch = missing_keys[start : start + self.batch_size]
+            embeddings = self._embed_batch([missing[key] for key in batch])
+            computed = dict(zip(batch, embeddings))
+            self._store(computed)
+            found.update(computed)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def clear(self) -> None:
+        """Remove all embeddings from the cache in memory."""
+        self._cache.clear()
+
+    def commit(self) -> None:
+        """Write the computed embeddings to the database. Does nothing if the
+        embeddings are only cached in memory."""
+        if self._connection is not None:
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Write the computed embeddings to the database and close it. Does nothing
+        if the embeddings are only cached in memory."""
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> SentenceEmbedder:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
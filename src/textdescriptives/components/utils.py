@@ -1,41 +1,696 @@
 """Utility functions for calculating various text descriptives."""
 
-from typing import Union
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Union,
+)
+from weakref import WeakKeyDictionary, WeakSet
 
+import numpy as np
 from pyphen import Pyphen
+from spacy.attrs import (
+    DEP,
+    HEAD,
+    IDX,
+    IS_PUNCT,
+    IS_SPACE,
+    IS_STOP,
+    LENGTH,
+    LOWER,
+    ORTH,
+    POS,
+    SENT_START,
+    SPACY,
+    TAG,
+)
+from spacy.strings import StringStore
 from spacy.tokens import Doc, Span, Token
 
+_MEMO_NAMESPACE = "textdescriptives"
+_FINGERPRINT_KEY = (_MEMO_NAMESPACE, "_fingerprint")
+_FINGERPRINT_ATTRS = [ORTH, HEAD, DEP, POS, TAG, SENT_START]
 
-def filter_tokens(doc: Union[Doc, Span]):
+
+def _user_data_key(extension: str) -> tuple[str, str]:
+    """Key under which the value of an extension is stored in `doc.user_data`."""
+    return (_MEMO_NAMESPACE, extension)
+
+
+def _doc_fingerprint(doc: Doc) -> tuple[int, int]:
+    """A cheap fingerprint of the state of a Doc, which changes if the Doc is
+    retokenized or its sentence boundaries, dependencies or tags change. Consists
+    of the length of the Doc and a checksum of its token attributes, which is
+    stable across processes."""
+    return (len(doc), zlib.crc32(doc.to_array(_FINGERPRINT_ATTRS)))
+
+
+def _clear_memoized_values(doc: Doc) -> None:
+    """Remove the values memoized by `memoized_getter` from a Doc."""
+    for key in [
+        key
+        for key in doc.user_data
+        if isinstance(key, tuple) and key[0] == _MEMO_NAMESPACE
+    ]:
+        del doc.user_data[key]
+
+
+# Docs whose memoized values have been checked against their fingerprint in this
+# process, see `validate_memo`
+_VALIDATED_DOCS: "WeakSet[Doc]" = WeakSet()
+
+
+def validate_memo(doc: Doc) -> None:
+    """Remove the memoized extension values and cached token features of a Doc if
+    it has changed since they were computed, i.e. if it has been retokenized or
+    its sentence boundaries, heads, dependency labels or tags have been edited.
+
+    The check takes time linear in the length of the Doc, so it is not done on
+    every access of a memoized value. Instead, it is done when a TextDescriptives
+    component processes the Doc and the first time a memoized value of the Doc is
+    accessed in the process (e.g. after it is deserialized).
+
+    Args:
+        doc (Doc): The Doc.
+    """
+    fingerprint = _doc_fingerprint(doc)
+    stored_fingerprint = doc.user_data.get(_FINGERPRINT_KEY)
+    if stored_fingerprint is None or tuple(stored_fingerprint) != fingerprint:
+        _clear_memoized_values(doc)
+        _TOKEN_FEATURES.pop(doc, None)
+        doc.user_data[_FINGERPRINT_KEY] = fingerprint
+    _VALIDATED_DOCS.add(doc)
+
+
+def clear_memo(doc: Doc) -> None:
+    """Remove all memoized extension values and cached token features from a
+    Doc, e.g. after changing it outside of the pipeline or changing attributes
+    which are not covered by `validate_memo`.
+
+    Args:
+        doc (Doc): The Doc.
+    """
+    _clear_memoized_values(doc)
+    _TOKEN_FEATURES.pop(doc, None)
+    _VALIDATED_DOCS.discard(doc)
+
+
+def memoized_getter(
+    extension: str,
+    getter: Callable[[Doc], Any],
+) -> Callable[[Doc], Any]:
+    """Wrap a getter such that its value is computed once per Doc and memoized
+    in `doc.user_data`.
+
+    Memoized values are invalidated by `validate_memo` when a TextDescriptives
+    component processes a Doc which has changed since the values were computed.
+    Changes made to a Doc after it has been processed, e.g. editing the heads of
+    its tokens, are not detected when the values are accessed; call `clear_memo`
+    (or `validate_memo`) after such changes. The memoized values must be
+    serializable, as they are serialized with the Doc.
+
+    Args:
+        extension (str): Name of the extension.
+        getter (Callable[[Doc], Any]): The getter computing the value.
+
+    Returns:
+        Callable[[Doc], Any]: The wrapped getter
+    """
+    key = _user_data_key(extension)
+
+    def _getter(doc: Doc) -> Any:
+        if doc not in _VALIDATED_DOCS:
+            validate_memo(doc)
+        user_data = doc.user_data
+        if key in user_data:
+            return user_data[key]
+        value = getter(doc)
+        user_data[key] = value
+        return value
+
+    return _getter
+
+
+def get_memoized(doc: Doc, extension: str) -> Any:
+    """Get the value memoized by `memoized_getter` for an extension without
+    computing it.
+
+    Args:
+        doc (Doc): The Doc.
+        extension (str): Name of the extension.
+
+    Returns:
+        Any: The memoized value, or None if the value is not memoized.
+    """
+    if doc not in _VALIDATED_DOCS:
+        validate_memo(doc)
+    return doc.user_data.get(_user_data_key(extension))
+
+
+def store_extension_values(doc: Doc, extensions: Iterable[str]) -> None:
+    """Compute the values of memoized getter extensions, such that they are
+    stored in `doc.user_data`.
+
+    Unlike getter extensions, values in `doc.user_data` are serialized with the
+    Doc. Storing them thus allows metrics to be computed in the worker processes
+    when using `nlp.pipe(..., n_process=n)` instead of in the main process when
+    the extensions are accessed.
+
+    Args:
+        doc (Doc): The Doc to store the values on.
+        extensions (Iterable[str]): Names of extensions registered with
+            `memoized_getter`.
+    """
+    for extension in extensions:
+        getattr(doc._, extension)
+
+
+_PYPHEN_DICTIONARIES: dict[str, Optional[Pyphen]] = {}
+
+
+def get_pyphen(lang: str) -> Pyphen:
+    """Get the hyphenation dictionary for a language. Dictionaries are loaded
+    once per language and process.
+
+    Args:
+        lang (str): The language code, e.g. "en".
+
+    Raises:
+        KeyError: If Pyphen has no dictionary for the language.
+
+    Returns:
+        Pyphen: The hyphenation dictionary
+    """
+    if lang not in _PYPHEN_DICTIONARIES:
+        try:
+            _PYPHEN_DICTIONARIES[lang] = Pyphen(lang=lang)
+        except KeyError:
+            _PYPHEN_DICTIONARIES[lang] = None
+    dic = _PYPHEN_DICTIONARIES[lang]
+    if dic is None:
+        raise KeyError(f"Pyphen has no hyphenation dictionary for language {lang}.")
+    return dic
+
+
+class SyllableCache:
+    """Process-wide, LRU-bounded cache of the number of syllables in lower-cased
+    words.
+
+    Natural text is dominated by a small set of frequent words, so caching the
+    syllable counts across Docs avoids hyphenating the same words over and over.
+    The cache can be saved to and loaded from disk to reuse it between runs.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        """Initialise the cache.
+
+        Args:
+            max_size (int): Maximum number of words to keep in the cache. Set to
+                0 to disable caching. Defaults to 100_000.
+        """
+        self.max_size = max_size
+        self._counts: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def count(self, words: Iterable[str], lang: str) -> list[int]:
+        """Get the number of syllables in each word, hyphenating the words which
+        are not in the cache.
+
+        Args:
+            words (Iterable[str]): Lower-cased words.
+            lang (str): The language of the words.
+
+        Raises:
+            KeyError: If Pyphen has no dictionary for the language.
+
+        Returns:
+            list[int]: The number of syllables in each word.
+        """
+        counts = []
+        with self._lock:
+            for word in words:
+                key = (lang, word)
+                n_syllables = self._counts.get(key)
+                if n_syllables is None:
+                    word_hyphenated = get_pyphen(lang).inserted(word)
+                    n_syllables = max(1, word_hyphenated.count("-") + 1)
+                    if self.max_size > 0:
+                        self._counts[key] = n_syllables
+                else:
+                    self._counts.move_to_end(key)
+                counts.append(n_syllables)
+            self._evict()
+        return counts
+
+    def _evict(self) -> None:
+        while len(self._counts) > max(self.max_size, 0):
+            self._counts.popitem(last=False)
+
+    def resize(self, max_size: int) -> None:
+        """Change the maximum number of words kept in the cache, evicting the
+        least recently used words if necessary."""
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove all words from the cache."""
+        with self._lock:
+            self._counts.clear()
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save the cache to a JSON file.
+
+        Args:
+            path (Union[str, Path]): Path of the file to write.
+        """
+        with self._lock:
+            entries = [[lang, word, n] for (lang, word), n in self._counts.items()]
+        with Path(path).open("w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+
+    def load(self, path: Union[str, Path]) -> None:
+        """Add the words from a file written by `save` to the cache. Loaded words
+        count as more recently used than the words already in the cache.
+
+        Args:
+            path (Union[str, Path]): Path of the file to read.
+        """
+        with Path(path).open(encoding="utf-8") as f:
+            entries = json.load(f)
+        with self._lock:
+            if self.max_size <= 0:
+                return
+            for lang, word, n_syllables in entries:
+                self._counts[(lang, word)] = n_syllables
+                self._counts.move_to_end((lang, word))
+            self._evict()
+
+
+_SYLLABLE_CACHE = SyllableCache()
+
+
+class LexemeFeatures:
+    """Process-wide, LRU-bounded table of features which only depend on the text
+    of a word type, e.g. whether it contains an alphabetic character.
+
+    Rows are indexed by the orth ID of the text, i.e. its hash, which is the
+    same in every `Vocab`. The table is filled lazily as new strings are
+    encountered, such that the features of each word type are computed once and
+    the features of the tokens in a `Doc` are gathered with array indexing.
+    Features which depend on the language, e.g. `Token.is_stop` and the number
+    of syllables, are not part of the table.
+    """
+
+    def __init__(self, max_size: int = 100_000, capacity: int = 1024):
+        """Initialise the table.
+
+        Args:
+            max_size (int): Maximum number of word types to keep in the table.
+                The least recently used types are evicted when it is full.
+                Defaults to 100_000.
+            capacity (int): Number of rows to allocate initially. Defaults to
+                1024.
+        """
+        self.max_size = max_size
+        self._index: OrderedDict[int, int] = OrderedDict()
+        self.contains_alpha = np.empty(capacity, dtype=bool)
+        self.has_apostrophe = np.empty(capacity, dtype=bool)
+        # whether each type is in the vocabularies passed to `in_vocabulary`, as
+        # 1 or 0, or -1 if it has not been checked yet, by id of the vocabulary
+        self._in_vocabulary: OrderedDict[int, tuple[Mapping, np.ndarray]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def rows(self, orths: np.ndarray, strings: StringStore) -> np.ndarray:
+        """Get the rows of the word types with the given orth IDs, adding rows
+        for types which are not in the table yet.
+
+        Args:
+            orths (np.ndarray): Orth IDs of the word types.
+            strings (StringStore): The string store used to look up the text of
+                types which are not in the table.
+
+        Returns:
+            np.ndarray: The row of each word type.
+        """
+        orth_ids = orths.tolist()
+        rows = np.empty(len(orth_ids), dtype=np.int64)
+        with self._lock:
+            index = self._index
+            missing = []
+            for i, orth_id in enumerate(orth_ids):
+                row = index.get(orth_id)
+                if row is None:
+                    missing.append(i)
+                else:
+                    index.move_to_end(orth_id)
+                    rows[i] = row
+            # the types of this call are the most recently used, so they are
+            # only evicted if there are more of them than fit in the table
+            max_size = max(self.max_size, len(orth_ids))
+            for i in missing:
+                rows[i] = self._add(orth_ids[i], strings[orth_ids[i]], max_size)
+        return rows
+
+    def _add(self, orth_id: int, text: str, max_size: int) -> int:
+        row = self._index.get(orth_id)
+        if row is not None:
+            return row
+        if len(self._index) >= max_size:
+            # reuse the row of the least recently used type
+            _, row = self._index.popitem(last=False)
+            for _, in_vocabulary in self._in_vocabulary.values():
+                in_vocabulary[row] = -1
+        else:
+            row = len(self._index)
+            if row == len(self.contains_alpha):
+                self._grow(max(2 * row, 1))
+        self.contains_alpha[row] = any(char.isalpha() for char in text)
+        self.has_apostrophe[row] = "'" in text
+        self._index[orth_id] = row
+        return row
+
+    def _grow(self, capacity: int) -> None:
+        self.contains_alpha = np.resize(self.contains_alpha, capacity)
+        self.has_apostrophe = np.resize(self.has_apostrophe, capacity)
+        for key, (vocabulary, in_vocabulary) in self._in_vocabulary.items():
+            grown = np.full(capacity, -1, dtype=np.int8)
+            grown[: len(in_vocabulary)] = in_vocabulary
+            self._in_vocabulary[key] = (vocabulary, grown)
+
+    def in_vocabulary(
+        self,
+        orths: np.ndarray,
+        strings: StringStore,
+        vocabulary: Mapping,
+    ) -> np.ndarray:
+        """Check whether the texts of word types are in a vocabulary. Each type
+        is checked once per vocabulary, so the vocabulary must not be changed
+        after it is first used. The results for the 8 most recently used
+        vocabularies are kept.
+
+        Args:
+            orths (np.ndarray): Orth IDs of the word types.
+            strings (StringStore): The string store used to look up the text of
+                the types.
+            vocabulary (Mapping): The vocabulary, e.g. a dict or set of words.
+
+        Returns:
+            np.ndarray: Whether each word type is in the vocabulary.
+        """
+        rows = self.rows(orths, strings)
+        with self._lock:
+            entry = self._in_vocabulary.get(id(vocabulary))
+            if entry is None or entry[0] is not vocabulary:
+                # keeps a reference to the vocabulary, so its id is not reused
+                entry = (
+                    vocabulary,
+                    np.full(len(self.contains_alpha), -1, dtype=np.int8),
+                )
+                self._in_vocabulary[id(vocabulary)] = entry
+                while len(self._in_vocabulary) > 8:
+                    self._in_vocabulary.popitem(last=False)
+            self._in_vocabulary.move_to_end(id(vocabulary))
+            in_vocabulary = entry[1]
+            for i in np.flatnonzero(in_vocabulary[rows] < 0).tolist():
+                in_vocabulary[rows[i]] = strings[int(orths[i])] in vocabulary
+            return in_vocabulary[rows] == 1
+
+
+_LEXEME_FEATURES = LexemeFeatures()
+
+
+_TOKEN_ATTRS = [
+    ORTH,
+    LOWER,
+    LENGTH,
+    IS_PUNCT,
+    IS_SPACE,
+    IS_STOP,
+    POS,
+    TAG,
+    DEP,
+    HEAD,
+    SENT_START,
+    IDX,
+    SPACY,
+]
+
+
+class TokenFeatures:
+    """Per-token features of a `Doc` extracted in a single `Doc.to_array` call.
+
+    The table is shared by the components, such that they do not each iterate
+    over the tokens. Use `token_features` to get the (cached) table of a `Doc`
+    or `Span`.
+
+    Attributes:
+        length (np.ndarray): Number of characters in each token.
+        is_punct (np.ndarray): Whether each token is punctuation.
+        is_space (np.ndarray): Whether each token is whitespace.
+        is_stop (np.ndarray): Whether each token is a stop word.
+        contains_alpha (np.ndarray): Whether each token contains at least one
+            alphabetic character.
+        is_filtered (np.ndarray): Whether each token is a word, i.e. neither
+            punctuation nor containing an apostrophe. See `filter_tokens`.
+        orth (np.ndarray): Hash of the text of each token.
+        lower (np.ndarray): Hash of the lower-cased text of each token.
+        pos (np.ndarray): Coarse-grained part-of-speech tag ID of each token.
+        tag (np.ndarray): Fine-grained part-of-speech tag hash of each token.
+        dep (np.ndarray): Dependency label hash of each token.
+        head (np.ndarray): Position of the head of each token relative to the
+            token, i.e. 0 for tokens which are their own head.
+        idx (np.ndarray): Character offset of each token in the `Doc`.
+        has_space (np.ndarray): Whether each token is followed by a space.
+        sent_starts (Optional[np.ndarray]): Index of the first token of each
+            sentence, or None if sentence boundaries are not set or the table
+            belongs to a `Span`.
+        syllables (np.ndarray): Number of syllables in each word (0 for tokens
+            which are not words). Computed on first access.
+        text (str): The text of the `Doc` or `Span`. Computed on first access.
+    """
+
+    length: np.ndarray
+    is_punct: np.ndarray
+    is_space: np.ndarray
+    is_stop: np.ndarray
+    contains_alpha: np.ndarray
+    is_filtered: np.ndarray
+    orth: np.ndarray
+    lower: np.ndarray
+    pos: np.ndarray
+    tag: np.ndarray
+    dep: np.ndarray
+    head: np.ndarray
+    idx: np.ndarray
+    has_space: np.ndarray
+    sent_starts: Optional[np.ndarray]
+
+    def __init__(self, doc: Doc):
+        """Compute the features of the tokens in a `Doc`."""
+        array = doc.to_array(_TOKEN_ATTRS)
+        (
+            self.orth,
+            self.lower,
+            self.length,
+            is_punct,
+            is_space,
+            is_stop,
+            self.pos,
+            self.tag,
+            self.dep,
+            head,
+            sent_start,
+            idx,
+            spacy,
+        ) = array.T
+        self.length = self.length.astype(np.int64)
+        self.is_punct = is_punct.astype(bool)
+        self.is_space = is_space.astype(bool)
+        self.is_stop = is_stop.astype(bool)
+        # relative position of the head, stored as unsigned integers by spaCy
+        self.head = head.astype(np.int64)
+        self.idx = idx.astype(np.int64)
+        self.has_space = spacy.astype(bool)
+
+        # features which only depend on the text are gathered from the lexeme
+        # table, which is looked up once per unique word type
+        types, inverse = np.unique(self.orth, return_inverse=True)
+        rows = _LEXEME_FEATURES.rows(types, doc.vocab.strings)[inverse]
+        self.contains_alpha = _LEXEME_FEATURES.contains_alpha[rows]
+        has_apostrophe = _LEXEME_FEATURES.has_apostrophe[rows]
+        self.is_filtered = ~self.is_punct & ~has_apostrophe
+
+        self.sent_starts = None
+        if doc.has_annotation("SENT_START"):
+            if "sents" in doc.user_hooks:
+                self.sent_starts = np.array(
+                    [sent.start for sent in doc.sents],
+                    dtype=np.int64,
+                )
+            else:
+                # mirrors Doc.sents, where the first token always starts a sentence
+                is_sent_start = sent_start.astype(np.int64) == 1
+                is_sent_start[:1] = True
+                self.sent_starts = np.flatnonzero(is_sent_start)
+        self._lang = doc.lang_
+        self._strings = doc.vocab.strings
+        self._syllables: Optional[np.ndarray] = None
+        self._text: Optional[str] = None
+        self._parent: Optional[tuple[TokenFeatures, int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.length)
+
+    @property
+    def syllables(self) -> np.ndarray:
+        """Number of syllables in each word (0 for tokens which are not words)."""
+        if self._syllables is None:
+            if self._parent is not None:
+                parent, start, end = self._parent
+                self._syllables = parent.syllables[start:end]
+            else:
+                self._syllables = self._count_syllables()
+        return self._syllables
+
+    @property
+    def text(self) -> str:
+        """The text of the `Doc` or `Span`."""
+        if self._text is None:
+            if self._parent is not None:
+                parent, start, end = self._parent
+                if end > start:
+                    # like Span.text, excludes the whitespace after the last token
+                    offset = parent.idx[0] if parent._parent is not None else 0
+                    self._text = parent.text[
+                        self.idx[0] - offset : self.idx[-1] + self.length[-1] - offset
+                    ]
+                else:
+                    self._text = ""
+            else:
+                # like Doc.text, but without creating a Token for each token
+                self._text = "".join(
+                    [
+                        self._strings[orth] + " " if has_space else self._strings[orth]
+                        for orth, has_space in zip(
+                            self.orth.tolist(),
+                            self.has_space.tolist(),
+                        )
+                    ],
+                )
+        return self._text
+
+    def _count_syllables(self) -> np.ndarray:
+        syllables = np.zeros(len(self), dtype=np.int64)
+        # count each word once and look the counts up in the shared cache
+        words, inverse = np.unique(self.lower[self.is_filtered], return_inverse=True)
+        counts = _SYLLABLE_CACHE.count(
+            [self._strings[int(word)] for word in words],
+            lang=self._lang,
+        )
+        syllables[self.is_filtered] = np.array(counts, dtype=np.int64)[inverse]
+        return syllables
+
+    def slice(self, start: int, end: int) -> "TokenFeatures":
+        """Get the features of the tokens from `start` to `end` (views of the
+        arrays of this table)."""
+        sliced = object.__new__(TokenFeatures)
+        for attr in [
+            "length",
+            "is_punct",
+            "is_space",
+            "is_stop",
+            "contains_alpha",
+            "is_filtered",
+            "orth",
+            "lower",
+            "pos",
+            "tag",
+            "dep",
+            "head",
+            "idx",
+            "has_space",
+        ]:
+            setattr(sliced, attr, getattr(self, attr)[start:end])
+        sliced.sent_starts = None
+        sliced._lang = self._lang
+        sliced._strings = self._strings
+        sliced._syllables = None
+        sliced._text = None
+        sliced._parent = (self, start, end)
+        return sliced
+
+
+_TOKEN_FEATURES: "WeakKeyDictionary[Doc, TokenFeatures]" = WeakKeyDictionary()
+
+
+def token_features(doc: Union[Doc, Span]) -> TokenFeatures:
+    """Get the token feature table of a `Doc` or `Span`.
+
+    The table is computed once per `Doc` and cached until the `Doc` is garbage
+    collected or the cache is invalidated by `validate_memo` or `clear_memo`
+    (see `memoized_getter`). The table of a `Span` is a view of the table of
+    its `Doc`.
+
+    Args:
+        doc (Union[Doc, Span]): A spaCy Doc or Span
+
+    Returns:
+        TokenFeatures: The token features
+    """
+    if isinstance(doc, Span):
+        return token_features(doc.doc).slice(doc.start, doc.end)
+    if doc not in _VALIDATED_DOCS:
+        validate_memo(doc)
+    features = _TOKEN_FEATURES.get(doc)
+    if features is None:
+        features = TokenFeatures(doc)
+        _TOKEN_FEATURES[doc] = features
+    return features
+
+
+def filter_tokens(doc: Union[Doc, Span]) -> list[Token]:
     """Return words in document or span.
 
     Filters punctuation and words that start with an apostrophe (contractions)
     """
-    filtered_tokens = [
-        word for word in doc if not word.is_punct and "'" not in word.text
-    ]
-    return filtered_tokens
+    is_filtered = token_features(doc).is_filtered
+    return [token for token, keep in zip(doc, is_filtered) if keep]
 
 
 def n_sentences(doc: Doc):
     """Return number of sentences in the document."""
-    return len(list(doc.sents))
+    sent_starts = token_features(doc).sent_starts
+    if sent_starts is None:
+        # raises an informative error if sentence boundaries are not set
+        return len(list(doc.sents))
+    return len(sent_starts)
 
 
 def n_tokens(doc: Union[Doc, Span]):
     """Return number of words in the document."""
-    return len(filter_tokens(doc))
+    return int(token_features(doc).is_filtered.sum())
 
 
-def n_syllables(doc: Doc):
+def n_syllables(doc: Union[Doc, Span]) -> list[int]:
     """Return number of syllables per token."""
-    dic = Pyphen(lang=doc.lang_)
-
-    def count_syl(token: Token):
-        word_hyphenated = dic.inserted(token.lower_)
-        return max(1, word_hyphenated.count("-") + 1)
-
-    return [count_syl(token) for token in filter_tokens(doc)]
+    features = token_features(doc)
+    return features.syllables[features.is_filtered].tolist()
 
 
 all_upos_tags = [
@@ -0,0 +1,222 @@
+"""Find lines and paragraphs which are duplicated across the documents of a
+corpus, using a count-min sketch of fixed size."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+
+def _segments(text: str) -> dict[str, list[str]]:
+    """Split a text into lines and paragraphs, like the quality component.
+    Segments which only contain whitespace are ignored."""
+    return {
+        "line": [line for line in text.split("\n") if line.strip()],
+        "paragraph": [
+            paragraph for paragraph in text.split("\n\n") if paragraph.strip()
+        ],
+    }
+
+
+def _hash_segments(segments: Iterable[str]) -> np.ndarray:
+    """Get a (uint64) hash of each segment, which is stable across processes."""
+    digests = b"".join(
+        hashlib.blake2b(segment.encode(), digest_size=8).digest()
+        for segment in segments
+    )
+    return np.frombuffer(digests, dtype=np.uint64)
+
+
+class CorpusDuplicateCounter:
+    """Counts the number of documents in a corpus in which each line and
+    paragraph occurs, to find boilerplate such as navigation lines, cookie
+    banners and footers which is repeated across documents.
+
+    The counts are kept in a count-min sketch [1] with conservative updates,
+    which uses `4 * width * depth` bytes regardless of the size of the corpus,
+    i.e. 16 MiB by default. The counts are never underestimated, but may be
+    overestimated: a segment which occurs in a single document is counted as a
+    duplicate with a probability of at most about `(1 - exp(-n / width)) **
+    depth`, where `n` is the number of distinct segments in the corpus. Choose a
+    `width` of at least `4 * n` to keep this below 0.3%, e.g. `2**25` (512 MiB)
+    for 8 million distinct segments; the default suits corpora with up to about
+    250,000.
+
+    The corpus is processed in two passes. First, all documents are added with
+    `update`. Then `duplicate_chr_fractions` gives the fraction of the characters
+    of a document in lines and paragraphs which occur in at least `min_count`
+    documents.
+
+    References:
+    - [1] Cormode, G., & Muthukrishnan, S. (2005). An improved data stream summary:
+    the count-min sketch and its applications. Journal of Algorithms, 55(1),
+    58-75.
+
+    Example:
+        >>> import textdescriptives as td
+        >>> counter = td.CorpusDuplicateCounter()
+        >>> counter.update(texts)
+        >>> fractions = [counter.duplicate_chr_fractions(text) for text in texts]
+    """
+
+    def __init__(self, width: int = 2**20, depth: int = 4, seed: int = 1):
+        """Create an empty counter.
+
+        Args:
+            width (int, optional): Number of counters in each row of the sketch.
+                Rounded up to a power of two. Defaults to 2**20.
+            depth (int, optional): Number of rows of the sketch, each using a
+                different hash function. Defaults to 4.
+            seed (int, optional): Seed of the hash functions. Defaults to 1.
+        """
+        log_width = max(int(np.ceil(np.log2(width))), 1)
+        self._set_table(np.zeros((depth, 2**log_width), dtype=np.uint32), seed)
+        self.n_documents = 0
+
+    def _set_table(self, table: np.ndarray, seed: int) -> None:
+        """Set the table of counters and the hash functions of its rows."""
+        self.depth, self.width = table.shape
+        self._log_width = int(np.log2(self.width))
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # multiply-shift hash functions, with odd multipliers
+        self._multipliers = rng.integers(0, 2**64, self.depth, dtype=np.uint64) | 1
+        self._table = table
+
+    def _cells(self, keys: np.ndarray) -> np.ndarray:
+        """Get the flat index of the counter of each key in each row."""
+        columns = (self._multipliers[:, None] * keys[None, :]) >> np.uint64(
+            64 - self._log_width,
+        )
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None] * np.uint64(self.width)
+        return (rows + columns).astype(np.int64)
+
+    def _add(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        """Increment the counts of distinct keys with a conservative update, which
+        only increments the counters which are needed to keep the minimum of the
+        counters of a key at least its count."""
+        cells = self._cells(keys)
+        table = self._table.reshape(-1)
+        estimate = table[cells].min(axis=0) + counts
+        np.maximum.at(table, cells.reshape(-1), np.tile(estimate, self.depth))
+
+    def count(self, segments: Iterable[str]) -> np.ndarray:
+        """Get the (estimated) number of documents in which each segment occurs.
+
+        Args:
+            segments (Iterable[str]): Lines or paragraphs.
+
+        Returns:
+            np.ndarray: The number of documents of each segment.
+        """
+        keys = _hash_segments(segments)
+        return self._table.reshape(-1)[self._cells(keys)].min(axis=0)
+
+    def update(self, texts: Iterable[str], batch_size: int = 1000) -> None:
+        """Add the lines and paragraphs of documents to the counts.
+
+        Args:
+            texts (Iterable[str]): The documents, e.g. a generator.
+            batch_size (int, optional): Number of documents to add at once.
+                Defaults to 1000.
+        """
+        batch: list[np.ndarray] = []
+        for text in texts:
+            segments = _segments(text)
+            # count each segment once per document
+            batch.append(
+                np.unique(_hash_segments(segments["line"] + segments["paragraph"]))
+            )
+            self.n_documents += 1
+            if len(batch) == batch_size:
+                self._add(*np.unique(np.concatenate(batch), return_counts=True))
+                batch = []
+        if batch:
+            self._add(*np.unique(np.concatenate(batch), return_counts=True))
+
+    def duplicate_chr_fractions(
+        self,
+        text: str,
+        min_count: int = 2,
+    ) -> dict[str, float]:
+        """Calculate the fraction of the characters of a document which are in
+        lines and paragraphs that occur in at least `min_count` documents of the
+        corpus. The document should have been added with `update`.
+
+        Args:
+            text (str): The document.
+            min_count (int, optional): Number of documents a line or paragraph
+                must occur in to be a duplicate. Defaults to 2.
+
+        Returns:
+            dict[str, float]: The `corpus_duplicate_line_chr_fraction` and
+                `corpus_duplicate_paragraph_chr_fraction` of the document.
+        """
+        fractions = {}
+        for kind, segments in _segments(text).items():
+            duplicate_chr = 0
+            if segments and text:
+                is_duplicate = self.count(segments) >= min_count
+                duplicate_chr = sum(
+                    len(segment)
+                    for segment, duplicate in zip(segments, is_duplicate)
+                    if duplicate
+                )
+            fractions[f"corpus_duplicate_{kind}_chr_fraction"] = (
+                duplicate_chr / len(text) if text else 0.0
+            )
+        return fractions
+
+    def iter_duplicate_chr_fractions(
+        self,
+        texts: Iterable[str],
+        min_count: int = 2,
+    ) -> Iterator[dict[str, float]]:
+        """Calculate `duplicate_chr_fractions` for each of a number of documents.
+
+        Args:
+            texts (Iterable[str]): The documents.
+            min_count (int, optional): Number of documents a line or paragraph
+                must occur in to be a duplicate. Defaults to 2.
+
+        Yields:
+            dict[str, float]: The fractions of each document.
+        """
+        for text in texts:
+            yield self.duplicate_chr_fractions(text, min_count=min_count)
+
+    def save(self, path: str | Path) -> None:
+        """Save the counts to a file in the .npz format. The file is written to
+        `path` as is, i.e. no .npz suffix is added.
+
+        Args:
+            path (str | Path): The path of the file.
+        """
+        # np.savez appends .npz to paths, but not to open files
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                table=self._table,
+                seed=self.seed,
+                n_documents=self.n_documents,
+            )
+
+    @classmethod
+    def load(cls, path: str | Path) -> CorpusDuplicateCounter:
+        """Load counts saved with `save`.
+
+        Args:
+            path (str | Path): The path of the file.
+
+        Returns:
+            CorpusDuplicateCounter: The counter.
+        """
+        with np.load(path) as data:
+            # set the saved table rather than allocating an empty one
+            counter = cls.__new__(cls)
+            counter._set_table(data["table"], int(data["seed"]))
+            counter.n_documents = int(data["n_documents"])
+        return counter
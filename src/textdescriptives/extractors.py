@@ -1,13 +1,18 @@
 """Extract metrics as Pandas DataFrame."""
 
-from typing import Any, Dict, Iterable, List, Optional, Union
+from collections.abc import Iterable, Iterator
+from typing import Any, Callable, Optional, Union
 
+import numpy as np
 import pandas as pd
+from spacy.language import Language
 from spacy.tokens import Doc
 from wasabi import msg
 
 from textdescriptives.utils import (
+    _PIPELINE_POOL,
     _create_spacy_pipeline,
+    _get_eager_config,
     _remove_textdescriptives_extensions,
     get_valid_metrics,
 )
@@ -15,7 +20,7 @@ from textdescriptives.utils import (
 
 def __get_quality(doc: Doc) -> dict:
     """Get quality metrics as well as boolean indicator for passing filters."""
-    return doc._.quality.to_flat_value_dict()
+    return doc._.quality_result.to_flat_value_dict()
 
 
 def __get_descriptive_stats_dict(doc: Doc) -> dict:
@@ -28,11 +33,279 @@ def __get_descriptive_stats_dict(doc: Doc) -> dict:
     }
 
 
+_METRIC_EXTRACTORS: dict[str, Callable[[Doc], Optional[dict]]] = {
+    "quality": __get_quality,
+    "descriptive_stats": __get_descriptive_stats_dict,
+}
+
+
+def _get_metric_extractor(component: str) -> Callable[[Doc], Optional[dict]]:
+    """Get the function which extracts the metrics of a component from a Doc."""
+    if component in _METRIC_EXTRACTORS:
+        return _METRIC_EXTRACTORS[component]
+    return lambda doc: getattr(doc._, component)
+
+
+class ExtractionPlan:
+    """A compiled plan for extracting metrics from spaCy Docs.
+
+    Resolving and validating which metrics to extract requires a scan of the
+    registered spaCy factories. The plan does this once and afterwards only
+    applies the resolved extractors to each Doc, which makes it cheap to reuse
+    for a large number of Docs, e.g. once per pipeline.
+
+    Example:
+        >>> import spacy
+        >>> import textdescriptives as td
+        >>> nlp = spacy.blank("en")
+        >>> nlp.add_pipe("textdescriptives/descriptive_stats")
+        >>> plan = td.ExtractionPlan(metrics="descriptive_stats")
+        >>> rows = [plan(doc) for doc in nlp.pipe(["A text.", "Another text."])]
+    """
+
+    def __init__(
+        self,
+        metrics: Union[list[str], str, None] = None,
+        include_text: bool = True,
+    ):
+        """Resolve and validate the metrics to extract.
+
+        Args:
+            metrics (Union[list[str], str, None], optional): Which metrics to
+                extract. Defaults to None in which case it will extract metrics
+                for which a pipeline component has been set.
+            include_text (bool, optional): Whether to add an entry containing the
+                text. Defaults to True.
+        """
+        # extract textdescriptive metrics from the list of spacy Language factory
+        valid_metrics = get_valid_metrics()
+
+        if isinstance(metrics, str):
+            metrics = [metrics]
+
+        if metrics is None:
+            metrics = [
+                component for component in valid_metrics if Doc.has_extension(component)
+            ]
+
+        if not set(metrics).issubset(valid_metrics):
+            raise ValueError(
+                "'metrics' contained invalid metric.\n"
+                + f"Valid metrics are: {valid_metrics}",
+            )
+        self.metrics: list[str] = list(metrics)
+        self.include_text = include_text
+        self._extractors = [
+            _get_metric_extractor(component) for component in self.metrics
+        ]
+
+    def __call__(self, doc: Doc) -> dict[str, Any]:
+        """Extract the metrics from a single Doc.
+
+        Args:
+            doc (Doc): A spaCy Doc.
+
+        Returns:
+            dict[str, Any]: Dictionary with the extracted metrics.
+        """
+        extracted_metrics: dict[str, Any] = {}
+        if self.include_text:
+            extracted_metrics["text"] = doc.text
+        for extractor in self._extractors:
+            metric = extractor(doc)
+            if metric:
+                extracted_metrics.update(metric)
+        return extracted_metrics
+
+    def extract(self, docs: Union[Iterable[Doc], Doc]) -> list[dict[str, Any]]:
+        """Extract the metrics from a Doc or an iterable of Docs.
+
+        Args:
+            docs (Union[Iterable[Doc], Doc]): An iterable of spaCy Docs or a single
+                Doc.
+
+        Returns:
+            list[dict[str, Any]]: List of dictionaries for each Doc with extracted
+                metrics.
+        """
+        if isinstance(docs, Doc):
+            return [self(docs)]
+        return [self(doc) for doc in docs]
+
+
+_BOOL_TYPES = {bool, np.bool_}
+_INT_TYPES = {int, np.int32, np.int64}
+_NUMERIC_TYPES = _INT_TYPES | {float, np.float32, np.float64, type(None)}
+_COLUMN_DTYPES = {
+    "b": np.dtype(bool),
+    "i": np.dtype(np.int64),
+    "f": np.dtype(np.float64),
+    "n": np.dtype(object),
+    "O": np.dtype(object),
+}
+
+
+def _infer_column_kind(values: list[Any]) -> str:
+    """Infer the kind of a chunk of column values. One of "b" (bool), "i" (int),
+    "f" (float, possibly with missing values), "n" (only None) or "O" (object).
+    """
+    types = set(map(type, values))
+    if types == {type(None)}:
+        return "n"
+    if types <= _BOOL_TYPES:
+        return "b"
+    if types <= _INT_TYPES:
+        return "i"
+    if types <= _NUMERIC_TYPES:
+        return "f"
+    return "O"
+
+
+def _promote_column_kind(kind: Optional[str], other: str) -> str:
+    """Get the kind which can represent values of both kinds, following the
+    dtype pandas infers for a list of dictionaries."""
+    if kind is None or kind == other:
+        return other
+    kinds = {kind, other}
+    if kinds <= {"i", "f", "n"}:
+        return "f"
+    return "O"
+
+
+class ColumnarResultBuilder:
+    """Collects extracted metrics in typed, preallocated NumPy columns.
+
+    Rows are buffered in chunks of `chunk_size` rows, which are written into
+    one NumPy column per feature. The dtype of a column (bool, int64, float64 or
+    object) is inferred from its values and upcast if a later chunk does not
+    fit, mirroring the dtypes pandas infers from a list of dictionaries.
+    Features missing from a row are set to NaN. Columns grow geometrically, so
+    appending is amortised constant time, and are handed to pandas without
+    copying.
+
+    Example:
+        >>> builder = ColumnarResultBuilder()
+        >>> builder.append({"n_tokens": 4, "lix": 12.5})
+        >>> builder.append({"n_tokens": 2, "lix": 8.0})
+        >>> builder.to_df()
+           n_tokens   lix
+        0         4  12.5
+        1         2   8.0
+    """
+
+    def __init__(self, chunk_size: int = 1024):
+        """Initialise the builder.
+
+        Args:
+            chunk_size (int, optional): Number of rows to buffer before writing
+                them to the columns. Also the initial capacity of the columns.
+                Defaults to 1024.
+        """
+        self.chunk_size = max(chunk_size, 1)
+        self._capacity = self.chunk_size
+        self._n_rows = 0
+        self._n_pending = 0
+        self._columns: dict[str, np.ndarray] = {}
+        self._kinds: dict[str, str] = {}
+        self._pending: dict[str, list[Any]] = {}
+
+    def __len__(self) -> int:
+        return self._n_rows + self._n_pending
+
+    @property
+    def columns(self) -> list[str]:
+        """The names of the columns in the order they were first seen."""
+        return list(self._pending)
+
+    def append(self, row: dict[str, Any]) -> None:
+        """Append a row of extracted metrics.
+
+        Args:
+            row (dict[str, Any]): Mapping from feature name to value.
+        """
+        pending = self._pending
+        for name, value in row.items():
+            values = pending.get(name)
+            if values is None:
+                # the feature is missing from all previous rows in the chunk
+                values = pending[name] = [np.nan] * self._n_pending
+            values.append(value)
+        self._n_pending += 1
+        if len(row) < len(pending):
+            for values in pending.values():
+                if len(values) < self._n_pending:
+                    values.append(np.nan)
+        if self._n_pending == self.chunk_size:
+            self._flush()
+
+    def extend(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Append multiple rows of extracted metrics."""
+        for row in rows:
+            self.append(row)
+
+    def _flush(self) -> None:
+        """Write the buffered chunk of rows to the columns."""
+        start, end = self._n_rows, self._n_rows + self._n_pending
+        if end > self._capacity:
+            while end > self._capacity:
+                self._capacity *= 2
+            for name, column in self._columns.items():
+                self._columns[name] = self._resize(column, self._capacity)
+
+        for name, values in self._pending.items():
+            kind = _promote_column_kind(
+                self._kinds.get(name),
+                _infer_column_kind(values),
+            )
+            column = self._columns.get(name)
+            if column is None:
+                if start:
+                    # the feature is missing from all previously flushed rows
+                    kind = _promote_column_kind("f", kind)
+                    column = np.full(self._capacity, np.nan, _COLUMN_DTYPES[kind])
+                else:
+                    column = np.empty(self._capacity, dtype=_COLUMN_DTYPES[kind])
+                self._columns[name] = column
+            elif column.dtype != _COLUMN_DTYPES[kind]:
+                column = self._columns[name] = column.astype(_COLUMN_DTYPES[kind])
+            self._kinds[name] = kind
+            column[start:end] = values
+            values.clear()
+        self._n_rows = end
+        self._n_pending = 0
+
+    @staticmethod
+    def _resize(column: np.ndarray, capacity: int) -> np.ndarray:
+        resized = np.empty(capacity, dtype=column.dtype)
+        resized[: len(column)] = column
+        return resized
+
+    def to_df(self) -> pd.DataFrame:
+        """Create a DataFrame from the collected columns without copying the
+        numeric columns.
+
+        Returns:
+            pd.DataFrame: DataFrame with a row for each appended row and a column
+                for each feature.
+        """
+        if self._n_pending:
+            self._flush()
+        columns: dict[str, Any] = {}
+        for name, column in self._columns.items():
+            column = column[: self._n_rows]
+            if column.dtype == object:
+                # let pandas choose the dtype of columns which were upcast to
+                # object, without copying the numeric columns
+                column = pd.Series(column, copy=False).infer_objects().to_numpy()
+            columns[name] = column
+        return pd.DataFrame(columns, index=pd.RangeIndex(self._n_rows), copy=False)
+
+
 def extract_dict(
     docs: Union[Iterable[Doc], Doc],
-    metrics: Union[List[str], str, None] = None,
+    metrics: Union[list[str], str, None] = None,
     include_text: bool = True,
-) -> List[Dict[str, Any]]:
+) -> list[dict[str, Any]]:
     """Extract calculated metrics from a spaCy Doc or an iterable of Docs to a
     list of dictionaries.
 
@@ -47,46 +320,14 @@ def extract_dict(
             Defaults to True.
 
     Returns:
-        List[Dict[str, Any]]: List of dictionaries for each Doc with extracted metrics.
+        list[dict[str, Any]]: List of dictionaries for each Doc with extracted metrics.
     """
-    if not isinstance(docs, Doc):
-        return [extract_dict(doc, metrics, include_text)[0] for doc in docs]
-
-    # extract textdescriptive metrics from the list of spacy Language factory
-    valid_metrics = get_valid_metrics()
-
-    if isinstance(metrics, str):
-        metrics = [metrics]
-
-    if metrics is None:
-        metrics = [
-            component for component in valid_metrics if docs.has_extension(component)
-        ]
-
-    if not set(metrics).issubset(valid_metrics):
-        raise ValueError(
-            "'metrics' contained invalid metric.\n"
-            + f"Valid metrics are: {valid_metrics}",
-        )
-    extracted_metrics: Dict[str, Any] = {}
-    if include_text:
-        extracted_metrics["text"] = docs.text
-    for component in metrics:
-        if component == "quality":
-            metric = __get_quality(docs)
-        elif component == "descriptive_stats":
-            metric = __get_descriptive_stats_dict(docs)
-        else:
-            metric = getattr(docs._, component)
-        if metric:
-            extracted_metrics.update(metric)
-
-    return [extracted_metrics]
+    return ExtractionPlan(metrics, include_text).extract(docs)
 
 
 def extract_df(
     docs: Union[Iterable[Doc], Doc],
-    metrics: Union[List[str], str, None] = None,
+    metrics: Union[list[str], str, None] = None,
     include_text: bool = True,
 ) -> pd.DataFrame:
     """Extract calculated metrics from a spaCy Doc object or a generator of Docs
@@ -106,24 +347,128 @@ def extract_df(
     Returns:
         pd.DataFrame: DataFrame with a row for each doc and column for each metric.
     """
-    return pd.DataFrame(extract_dict(docs, metrics, include_text))
+    plan = ExtractionPlan(metrics, include_text)
+    builder = ColumnarResultBuilder()
+    if isinstance(docs, Doc):
+        docs = [docs]
+    for doc in docs:
+        builder.append(plan(doc))
+    return builder.to_df()
+
+
+def _load_pipeline_with_components(
+    spacy_model: Optional[str],
+    lang: Optional[str],
+    metrics: Iterable[str],
+    spacy_model_size: str,
+) -> Language:
+    """Load a spacy pipeline and add the textdescriptives components for the
+    metrics."""
+    # remove previously set metrics to avoid conflicts
+    _remove_textdescriptives_extensions()
 
+    # load spacy model if any component requires it
+    nlp = _create_spacy_pipeline(
+        spacy_model=spacy_model,
+        lang=lang,
+        metrics=metrics,
+        spacy_model_size=spacy_model_size,
+    )
 
-def extract_metrics(
-    text: Union[str, List[str]],
+    # add pipeline components. Metrics are computed eagerly when the pipeline is
+    # run, such that they are computed in the workers when using n_process > 1
+    components = ["all"] if "all" in metrics else metrics
+    for component in components:
+        factory_name = f"textdescriptives/{component}"
+        nlp.add_pipe(factory_name, config=_get_eager_config(factory_name, eager=True))
+    return nlp
+
+
+def _get_pipeline(
+    spacy_model: Optional[str],
+    lang: Optional[str],
+    metrics: Optional[Iterable[str]],
+    spacy_model_size: str,
+) -> Language:
+    """Get a pipeline with the textdescriptives components for the metrics,
+    reusing a pooled pipeline with the same configuration if available."""
+    if isinstance(metrics, str):
+        metrics = [metrics]
+
+    if spacy_model is None and lang is None:
+        raise ValueError("Either a spacy model or a language must be provided.")
+
+    if spacy_model is not None and lang is not None:
+        msg.info(
+            "Both a spacy model and a language were provided. "
+            + "Will use the spacy model and ignore language.",
+        )
+
+    if metrics is None:
+        metrics = get_valid_metrics()
+
+    # reuse a warm pipeline with the same configuration if available
+    pipeline_key = (spacy_model, lang, spacy_model_size, frozenset(metrics))
+    nlp = _PIPELINE_POOL.get(pipeline_key)
+    if nlp is None:
+        nlp = _load_pipeline_with_components(
+            spacy_model=spacy_model,
+            lang=lang,
+            metrics=metrics,
+            spacy_model_size=spacy_model_size,
+        )
+        _PIPELINE_POOL.add(pipeline_key, nlp)
+    return nlp
+
+
+def _iter_rows(
+    docs: Iterable[Doc],
+    plan: ExtractionPlan,
+    batch_size: Optional[int],
+) -> Iterator[Union[dict[str, Any], list[dict[str, Any]]]]:
+    """Apply an extraction plan to a stream of Docs, yielding single rows or
+    lists of `batch_size` rows."""
+    if batch_size is None:
+        for doc in docs:
+            yield plan(doc)
+        return
+
+    batch: list[dict[str, Any]] = []
+    for doc in docs:
+        batch.append(plan(doc))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def extract_iter(
+    text: Union[str, Iterable[str]],
     lang: Optional[str] = None,
     metrics: Optional[Iterable[str]] = None,
     spacy_model: Optional[str] = None,
     spacy_model_size: str = "lg",
-) -> pd.DataFrame:
-    """Extract metrics from a text or a list of texts to a Pandas dataframe.
+    batch_size: Optional[int] = None,
+    include_text: bool = True,
+    n_process: int = 1,
+) -> Iterator[Union[dict[str, Any], list[dict[str, Any]]]]:
+    """Lazily extract metrics from an iterable of texts.
+
+    Texts are consumed and processed with `nlp.pipe` as the result is iterated,
+    so memory use does not grow with the number of texts. This allows e.g.
+    streaming a large corpus from disk in a single pass.
+
+    Note that spaCy extensions are global, so iterating over two streams
+    with different configurations in an interleaved fashion is not supported.
 
     Args:
-        text (Union[str, List[str]]): A text or a list of texts.
+        text (Union[str, Iterable[str]]): A text or an iterable of texts, e.g. a
+            generator.
         lang (str, optional): Language of the text. If lang is set and no spacy
             model is provided, will automatically download and use a spacy
             model for the language. Defaults to None.
-        metrics (List[str]): Which metrics to extract.
+        metrics (list[str]): Which metrics to extract.
             One or more of ["descriptive_stats", "readability",
             "dependency_distance", "pos_proportions", "coherence", "quality",
             "information_theory"]. If None, will extract all metrics from
@@ -131,45 +476,94 @@ def extract_metrics(
         spacy_model (str, optional): The spacy model to use. If not set,
             will download one based on lang. Defaults to None.
         spacy_model_size (str, optional): Size of the spacy model to download.
+        batch_size (int, optional): If set, yields lists of `batch_size` rows
+            (the last one may be shorter) instead of single rows. Also used as the
+            batch size of `nlp.pipe`. Defaults to None.
+        include_text (bool, optional): Whether to add an entry containing the text.
+            Defaults to True.
+        n_process (int, optional): Number of processes to use for processing the
+            texts and computing the metrics. Defaults to 1.
 
     Returns:
-        pd.DataFrame: DataFrame with a row for each text and column for each metric.
+        Iterator[Union[dict[str, Any], list[dict[str, Any]]]]: An iterator of
+            dictionaries with the extracted metrics for each text, or of lists of
+            such dictionaries if `batch_size` is set.
+
+    Example:
+        >>> import textdescriptives as td
+        >>> texts = (line for line in open("corpus.txt"))
+        >>> for rows in td.extract_iter(
+        ...     texts, lang="en", metrics="readability", batch_size=1000
+        ... ):
+        ...     process(rows)
     """
-    if isinstance(metrics, str):
-        metrics = [metrics]
-
-    if spacy_model is None and lang is None:
-        raise ValueError("Either a spacy model or a language must be provided.")
-
-    if spacy_model is not None and lang is not None:
-        msg.info(
-            "Both a spacy model and a language were provided. "
-            + "Will use the spacy model and ignore language.",
-        )
-
-    if metrics is None:
-        metrics = get_valid_metrics()
-
-    # remove previously set metrics to avoid conflicts
-    _remove_textdescriptives_extensions()
-
-    # load spacy model if any component requires it
-    nlp = _create_spacy_pipeline(
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+    nlp = _get_pipeline(
         spacy_model=spacy_model,
         lang=lang,
         metrics=metrics,
         spacy_model_size=spacy_model_size,
     )
-
-    # add pipeline components
-    if "all" in metrics:
-        nlp.add_pipe("textdescriptives/all")
-    else:
-        for component in metrics:
-            nlp.add_pipe(f"textdescriptives/{component}")
+    plan = ExtractionPlan(include_text=include_text)
 
     if isinstance(text, str):
         text = [text]
-    docs = nlp.pipe(text)
+    docs = nlp.pipe(text, batch_size=batch_size, n_process=n_process)
+    return _iter_rows(docs, plan=plan, batch_size=batch_size)
+
+
+def extract_metrics(
+    text: Union[str, list[str]],
+    lang: Optional[str] = None,
+    metrics: Optional[Iterable[str]] = None,
+    spacy_model: Optional[str] = None,
+    spacy_model_size: str = "lg",
+    n_process: int = 1,
+    batch_size: Optional[int] = None,
+) -> pd.DataFrame:
+    """Extract metrics from a text or a list of texts to a Pandas dataframe.
+
+    Pipelines are kept in a process-wide pool and reused by subsequent calls with
+    the same configuration. Use `textdescriptives.set_pipeline_pool_size` to
+    change the number of pipelines kept in memory. See `extract_iter` for
+    extracting metrics from large corpora without keeping all rows in memory.
+
+    Args:
+        text (Union[str, list[str]]): A text or a list of texts.
+        lang (str, optional): Language of the text. If lang is set and no spacy
+            model is provided, will automatically download and use a spacy
+            model for the language. Defaults to None.
+        metrics (list[str]): Which metrics to extract.
+            One or more of ["descriptive_stats", "readability",
+            "dependency_distance", "pos_proportions", "coherence", "quality",
+            "information_theory"]. If None, will extract all metrics from
+            textdescriptives. Defaults to None.
+        spacy_model (str, optional): The spacy model to use. If not set,
+            will download one based on lang. Defaults to None.
+        spacy_model_size (str, optional): Size of the spacy model to download.
+        n_process (int, optional): Number of processes to use for processing the
+            texts and computing the metrics. Defaults to 1.
+        batch_size (int, optional): Number of texts to process in each batch. If
+            None, uses the default batch size of the spacy pipeline. Defaults to
+            None.
 
-    return extract_df(docs)
+    Returns:
+        pd.DataFrame: DataFrame with a row for each text and column for each metric.
+    """
+    batches = extract_iter(
+        text,
+        lang=lang,
+        metrics=metrics,
+        spacy_model=spacy_model,
+        spacy_model_size=spacy_model_size,
+        batch_size=batch_size,
+        n_process=n_process,
+    )
+    builder = ColumnarResultBuilder()
+    for batch in batches:
+        if batch_size is None:
+            builder.append(batch)  # type: ignore
+        else:
+            builder.extend(batch)  # type: ignore
+    return builder.to_df()
@@ -0,0 +1,326 @@
+"""Write extracted metrics incrementally to Parquet files or Arrow IPC streams."""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from spacy.language import Language
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError as e:
+    raise ImportError(
+        "Failed to import pyarrow. If you want to write metrics to Parquet or "
+        + "Arrow IPC files, please install it with `pip install pyarrow` or install "
+        + "textdescriptives with the [arrow] extra: "
+        + "pip install textdescriptives[arrow].",
+    ) from e
+
+from textdescriptives.components.pos_proportions import POSProportions
+from textdescriptives.extractors import (
+    ColumnarResultBuilder,
+    ExtractionPlan,
+    _get_pipeline,
+    extract_iter,
+)
+
+
+def _arrow_type(value: Any) -> pa.DataType:
+    """Get the arrow type used to store a metric value."""
+    if isinstance(value, (bool, np.bool_)):
+        return pa.bool_()
+    if isinstance(value, (int, np.integer)):
+        return pa.int64()
+    if isinstance(value, str):
+        return pa.string()
+    # floats, but also metrics which are None or NaN for an empty text
+    return pa.float64()
+
+
+def get_arrow_schema(
+    lang: str | None = None,
+    metrics: Iterable[str] | None = None,
+    spacy_model: str | None = None,
+    spacy_model_size: str = "lg",
+    include_text: bool = True,
+) -> pa.Schema:
+    """Get the arrow schema of the metrics extracted by the configured components.
+    Does this by extracting the metrics from an empty dummy text.
+
+    Args:
+        lang (str, optional): Language of the text. Defaults to None.
+        metrics (list[str]): Which metrics to extract. If None, will extract all
+            metrics from textdescriptives. Defaults to None.
+        spacy_model (str, optional): The spacy model to use. If not set,
+            will download one based on lang. Defaults to None.
+        spacy_model_size (str, optional): Size of the spacy model to download.
+        include_text (bool, optional): Whether to add a column containing the text.
+            Defaults to True.
+
+    Metrics which are only extracted for some texts, i.e. the proportions of the
+    POS tags when the `pos_proportions` component is configured with
+    `add_all_tags=False`, are added from the label scheme of the pipeline.
+
+    Returns:
+        pa.Schema: The schema with a field for each extracted metric.
+    """
+    nlp = _get_pipeline(
+        spacy_model=spacy_model,
+        lang=lang,
+        metrics=metrics,
+        spacy_model_size=spacy_model_size,
+    )
+    row = ExtractionPlan(include_text=include_text)(nlp(""))
+    fields = [(name, _arrow_type(value)) for name, value in row.items()]
+    fields.extend(
+        (name, pa.float64()) for name in _label_columns(nlp) if name not in row
+    )
+    return pa.schema(fields)
+
+
+def _label_columns(nlp: Language) -> list[str]:
+    """Get the metrics of a pipeline which are only extracted for the texts in
+    which a label occurs, from the labels of the pipeline."""
+    columns = []
+    for _, component in nlp.pipeline:
+        if isinstance(component, POSProportions) and not component.add_all_tags:
+            columns.extend(f"pos_prop_{tag}" for tag in component.model_tags)
+    return columns
+
+
+def _to_df(rows: list[dict[str, Any]]) -> pd.DataFrame:
+    """Convert a batch of extracted metrics to a DataFrame."""
+    builder = ColumnarResultBuilder(chunk_size=len(rows))
+    builder.extend(rows)
+    return builder.to_df()
+
+
+def _extend_schema(schema: pa.Schema, df: pd.DataFrame) -> pa.Schema:
+    """Add the columns of a batch of metrics which are not in the schema, e.g.
+    the proportions of the POS tags which occur in the batch, to the schema."""
+    new_columns = [name for name in df.columns if name not in schema.names]
+    if not new_columns:
+        return schema
+    fields = list(schema)
+    for field in pa.Schema.from_pandas(df[new_columns], preserve_index=False):
+        # columns which are missing from all rows of the batch are stored as floats
+        if pa.types.is_null(field.type):
+            field = field.with_type(pa.float64())
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def _to_record_batch(df: pd.DataFrame, schema: pa.Schema) -> pa.RecordBatch:
+    """Convert a batch of metrics to a record batch conforming to `schema`.
+    Features which are not in the batch are set to null."""
+    unknown_columns = [name for name in df.columns if name not in schema.names]
+    if unknown_columns:
+        raise ValueError(
+            f"The metrics {unknown_columns} are not part of the schema, which is "
+            + "determined from the labels of the pipeline and the first batch of "
+            + "texts. This happens if a metric is only extracted for some texts, "
+            + "e.g. the proportion of a POS tag which is not a label of the "
+            + "pipeline. Increase the batch size or configure the components to "
+            + "always extract the same metrics.",
+        )
+    df = df.reindex(columns=schema.names)
+    return pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def _record_batches(
+    text: str | Iterable[str],
+    lang: str | None,
+    metrics: Iterable[str] | None,
+    spacy_model: str | None,
+    spacy_model_size: str,
+    batch_size: int,
+    include_text: bool,
+    n_process: int,
+) -> tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+    """Extract metrics and yield them as record batches of `batch_size` rows.
+
+    The schema is determined from the configured components and their labels
+    (see `get_arrow_schema`) and extended with the metrics of the first batch,
+    which is extracted before returning.
+
+    Returns:
+        tuple[pa.Schema, Iterator[pa.RecordBatch]]: The schema and the record
+            batches conforming to it.
+    """
+    schema = get_arrow_schema(
+        lang=lang,
+        metrics=metrics,
+        spacy_model=spacy_model,
+        spacy_model_size=spacy_model_size,
+        include_text=include_text,
+    )
+    frames = (
+        _to_df(rows)
+        for rows in extract_iter(
+            text,
+            lang=lang,
+            metrics=metrics,
+            spacy_model=spacy_model,
+            spacy_model_size=spacy_model_size,
+            batch_size=batch_size,
+            include_text=include_text,
+            n_process=n_process,
+        )
+    )
+    first = next(frames, None)
+    if first is None:
+        return schema, iter([])
+    schema = _extend_schema(schema, first)
+    batches = (_to_record_batch(df, schema) for df in itertools.chain([first], frames))
+    return schema, batches
+
+
+@contextmanager
+def _write_atomically(path: str | Path) -> Iterator[str]:
+    """Get a temporary path next to `path` to write to, which is moved to `path`
+    if writing succeeds and removed otherwise, such that a failed extraction
+    does not leave a truncated file."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        yield str(tmp_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(path)
+
+
+def extract_to_parquet(
+    text: str | Iterable[str],
+    path: str | Path,
+    lang: str | None = None,
+    metrics: Iterable[str] | None = None,
+    spacy_model: str | None = None,
+    spacy_model_size: str = "lg",
+    row_group_size: int = 10_000,
+    include_text: bool = True,
+    n_process: int = 1,
+) -> pa.Schema:
+    """Extract metrics from an iterable of texts and write them to a Parquet file.
+
+    Texts are processed lazily and written in row groups of `row_group_size`
+    rows, so memory use does not grow with the number of texts. The schema is
+    determined from the configured components, their labels and the metrics of
+    the first batch of texts. The file is only created at `path` once all texts
+    are written, so a failed extraction does not leave a truncated file.
+
+    Args:
+        text (str | Iterable[str]): A text or an iterable of texts, e.g. a
+            generator.
+        path (str | Path): Path of the Parquet file to write.
+        lang (str, optional): Language of the text. If lang is set and no spacy
+            model is provided, will automatically download and use a spacy
+            model for the language. Defaults to None.
+        metrics (list[str]): Which metrics to extract.
+            One or more of ["descriptive_stats", "readability",
+            "dependency_distance", "pos_proportions", "coherence", "quality",
+            "information_theory"]. If None, will extract all metrics from
+            textdescriptives. Defaults to None.
+        spacy_model (str, optional): The spacy model to use. If not set,
+            will download one based on lang. Defaults to None.
+        spacy_model_size (str, optional): Size of the spacy model to download.
+        row_group_size (int, optional): Number of rows in each row group.
+            Defaults to 10_000.
+        include_text (bool, optional): Whether to add a column containing the text.
+            Defaults to True.
+        n_process (int, optional): Number of processes to use for processing the
+            texts and computing the metrics. Defaults to 1.
+
+    Returns:
+        pa.Schema: The schema of the written file.
+
+    Example:
+        >>> from textdescriptives.integrations.arrow import extract_to_parquet
+        >>> texts = (line for line in open("corpus.txt"))
+        >>> extract_to_parquet(texts, "metrics.parquet", lang="en")
+    """
+    schema, batches = _record_batches(
+        text,
+        lang=lang,
+        metrics=metrics,
+        spacy_model=spacy_model,
+        spacy_model_size=spacy_model_size,
+        batch_size=row_group_size,
+        include_text=include_text,
+        n_process=n_process,
+    )
+    with _write_atomically(path) as tmp_path:
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch, row_group_size=row_group_size)
+    return schema
+
+
+def extract_to_arrow_ipc(
+    text: str | Iterable[str],
+    path: str | Path,
+    lang: str | None = None,
+    metrics: Iterable[str] | None = None,
+    spacy_model: str | None = None,
+    spacy_model_size: str = "lg",
+    batch_size: int = 10_000,
+    include_text: bool = True,
+    n_process: int = 1,
+) -> pa.Schema:
+    """Extract metrics from an iterable of texts and write them to an Arrow IPC
+    stream file.
+
+    Texts are processed lazily and written in record batches of `batch_size`
+    rows, so memory use does not grow with the number of texts. The schema is
+    determined from the configured components, their labels and the metrics of
+    the first batch of texts. The file is only created at `path` once all texts
+    are written, so a failed extraction does not leave a truncated file.
+
+    Args:
+        text (str | Iterable[str]): A text or an iterable of texts, e.g. a
+            generator.
+        path (str | Path): Path of the Arrow IPC stream file to write.
+        lang (str, optional): Language of the text. If lang is set and no spacy
+            model is provided, will automatically download and use a spacy
+            model for the language. Defaults to None.
+        metrics (list[str]): Which metrics to extract.
+            One or more of ["descriptive_stats", "readability",
+            "dependency_distance", "pos_proportions", "coherence", "quality",
+            "information_theory"]. If None, will extract all metrics from
+            textdescriptives. Defaults to None.
+        spacy_model (str, optional): The spacy model to use. If not set,
+            will download one based on lang. Defaults to None.
+        spacy_model_size (str, optional): Size of the spacy model to download.
+        batch_size (int, optional): Number of rows in each record batch.
+            Defaults to 10_000.
+        include_text (bool, optional): Whether to add a column containing the text.
+            Defaults to True.
+        n_process (int, optional): Number of processes to use for processing the
+            texts and computing the metrics. Defaults to 1.
+
+    Returns:
+        pa.Schema: The schema of the written stream.
+    """
+    schema, batches = _record_batches(
+        text,
+        lang=lang,
+        metrics=metrics,
+        spacy_model=spacy_model,
+        spacy_model_size=spacy_model_size,
+        batch_size=batch_size,
+        include_text=include_text,
+        n_process=n_process,
+    )
+    with _write_atomically(path) as tmp_path:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_stream(sink, schema) as writer:
+                for batch in batches:
+                    writer.write_batch(batch)
+    return schema
@@ -3,6 +3,8 @@
 from spacy.language import Language
 from spacy.tokens import Doc
 
+from .utils import _get_eager_config
+
 
 class TextDescriptives:
     """Utility spaCy v3.0 component to add all functionality from the
@@ -29,8 +31,16 @@ class TextDescriptives:
         return doc
 
 
-@Language.factory("textdescriptives/all")
-def create_textdescriptives_component(nlp: Language, name: str):
+@Language.factory("textdescriptives/all", default_config={"eager": False})
+def create_textdescriptives_component(nlp: Language, name: str, eager: bool):
+    """Adds all textdescriptives components to the pipeline.
+
+    Args:
+        nlp (Language): spaCy language object.
+        name (str): name of the component.
+        eager (bool): Passed on to the components which support computing their
+            `Doc` level attributes when they are run. Defaults to False.
+    """
     components = [
         k
         for k in Language.factories.keys()
@@ -38,5 +48,5 @@ def create_textdescriptives_component(nlp: Language, name: str):
     ]
 
     for component in components:
-        nlp.add_pipe(component, last=True)
+        nlp.add_pipe(component, last=True, config=_get_eager_config(component, eager))
     return TextDescriptives(nlp)
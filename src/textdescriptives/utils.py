@@ -1,5 +1,8 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
 from pathlib import Path
-from typing import Iterable, List, Optional, Type, Union
+from typing import Any, Optional, Union
 
 import pandas as pd
 import spacy
@@ -7,6 +10,8 @@ from spacy.language import Language
 from spacy.tokens import Doc, Span, Token
 from wasabi import msg
 
+from .components.utils import _SYLLABLE_CACHE
+
 
 def get_valid_metrics() -> set:
     """Get valid metrics for extractor.
@@ -22,7 +27,7 @@ def get_valid_metrics() -> set:
     }
 
 
-def get_doc_assigns(metric: str) -> List[str]:
+def get_doc_assigns(metric: str) -> list[str]:
     """Get doc extension attributes for a given metric.
 
     Args:
@@ -46,7 +51,15 @@ def get_doc_assigns(metric: str) -> List[str]:
     ]
 
 
-def get_span_assigns(metric: str) -> List[str]:
+def _get_eager_config(factory_name: str, eager: bool) -> dict[str, bool]:
+    """Get the config setting `eager` for a textdescriptives component, or an
+    empty config if the component does not support eager computation."""
+    if "eager" in Language.get_factory_meta(factory_name).default_config:
+        return {"eager": eager}
+    return {}
+
+
+def get_span_assigns(metric: str) -> list[str]:
     """Get span extension attributes for a given metric.
 
     Args:
@@ -59,7 +72,7 @@ def get_span_assigns(metric: str) -> List[str]:
     ]
 
 
-def get_token_assigns(metric: str) -> List[str]:
+def get_token_assigns(metric: str) -> list[str]:
     """Get token extension attributes for a given metric.
 
     Args:
@@ -102,7 +115,7 @@ def _download_spacy_model(lang: str, size: str) -> str:
 
 
 def _remove_spacy_extension(
-    spacy_language: Union[Type[Doc], Type[Span], Type[Token]],
+    spacy_language: Union[type[Doc], type[Span], type[Token]],
     extension: str,
 ) -> None:
     """Remove spacy extension from a Language object if it exists."""
@@ -185,3 +198,187 @@ def _create_spacy_pipeline(
         )
         spacy.cli.download(spacy_model)
         return spacy.load(spacy_model)
+
+
+ExtensionSnapshot = dict[tuple[str, str], tuple[Any, Any, Any, Any]]
+
+_EXTENSION_TARGETS: dict[str, Union[type[Doc], type[Span], type[Token]]] = {
+    "doc": Doc,
+    "span": Span,
+    "token": Token,
+}
+
+
+def _get_textdescriptives_extensions() -> ExtensionSnapshot:
+    """Take a snapshot of the currently registered textdescriptives extensions.
+
+    Returns:
+        ExtensionSnapshot: Mapping from (object type, extension name) to the
+            (default, method, getter, setter) tuple registered in spaCy.
+    """
+    getters = {
+        "doc": get_doc_assigns,
+        "span": get_span_assigns,
+        "token": get_token_assigns,
+    }
+    snapshot: ExtensionSnapshot = {}
+    for metric in get_valid_metrics():
+        for target, get_assigns in getters.items():
+            spacy_object = _EXTENSION_TARGETS[target]
+            for extension in get_assigns(metric):
+                if spacy_object.has_extension(extension):
+                    snapshot[(target, extension)] = spacy_object.get_extension(
+                        extension,
+                    )
+    return snapshot
+
+
+def _set_textdescriptives_extensions(snapshot: ExtensionSnapshot) -> None:
+    """Remove all textdescriptives extensions and restore them from a snapshot
+    created with `_get_textdescriptives_extensions`."""
+    _remove_textdescriptives_extensions()
+    for (target, extension), (default, method, getter, setter) in snapshot.items():
+        spacy_object = _EXTENSION_TARGETS[target]
+        if getter is not None:
+            spacy_object.set_extension(extension, getter=getter, setter=setter)
+        elif method is not None:
+            spacy_object.set_extension(extension, method=method)
+        else:
+            spacy_object.set_extension(extension, default=default)
+
+
+class PipelinePool:
+    """Process-wide, LRU-bounded pool of spaCy pipelines with textdescriptives
+    components added.
+
+    Loading a spaCy model is by far the most expensive part of
+    `extract_metrics`. The pool keeps up to `max_size` ready pipelines keyed by
+    their configuration and evicts the least recently used one when full. As
+    spaCy extensions are global, the extensions registered by a pipeline are
+    stored alongside it and restored when the pipeline is reused.
+    """
+
+    def __init__(self, max_size: int = 4):
+        """Initialise the pool.
+
+        Args:
+            max_size (int): Maximum number of pipelines to keep in memory. Set to 0
+                to disable pooling. Defaults to 4.
+        """
+        self.max_size = max_size
+        self._pipelines: OrderedDict[
+            Hashable,
+            tuple[Language, ExtensionSnapshot],
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pipelines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pipelines
+
+    def get(self, key: Hashable) -> Optional[Language]:
+        """Get a pipeline from the pool and restore its extensions.
+
+        Args:
+            key (Hashable): The configuration key of the pipeline.
+
+        Returns:
+            Optional[Language]: The pipeline or None if it is not in the pool.
+        """
+        with self._lock:
+            if key not in self._pipelines:
+                return None
+            self._pipelines.move_to_end(key)
+            nlp, extensions = self._pipelines[key]
+            _set_textdescriptives_extensions(extensions)
+        return nlp
+
+    def add(self, key: Hashable, nlp: Language) -> None:
+        """Add a pipeline to the pool along with the currently registered
+        textdescriptives extensions. Evicts the least recently used pipelines if
+        the pool is full.
+
+        Args:
+            key (Hashable): The configuration key of the pipeline.
+            nlp (Language): The pipeline.
+        """
+        with self._lock:
+            if self.max_size <= 0:
+                return
+            self._pipelines[key] = (nlp, _get_textdescriptives_extensions())
+            self._pipelines.move_to_end(key)
+            while len(self._pipelines) > self.max_size:
+                self._pipelines.popitem(last=False)
+
+    def resize(self, max_size: int) -> None:
+        """Change the maximum number of pipelines kept in the pool, evicting the
+        least recently used pipelines if necessary."""
+        with self._lock:
+            self.max_size = max_size
+            while len(self._pipelines) > max(max_size, 0):
+                self._pipelines.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all pipelines from the pool."""
+        with self._lock:
+            self._pipelines.clear()
+
+
+_PIPELINE_POOL = PipelinePool()
+
+
+def set_pipeline_pool_size(max_size: int) -> None:
+    """Set the maximum number of pipelines `extract_metrics` keeps in memory for
+    reuse. Set to 0 to disable pooling.
+
+    Args:
+        max_size (int): Maximum number of pipelines to keep in memory.
+    """
+    _PIPELINE_POOL.resize(max_size)
+
+
+def clear_pipeline_pool() -> None:
+    """Remove all pipelines kept in memory by `extract_metrics`."""
+    _PIPELINE_POOL.clear()
+
+
+def set_syllable_cache_size(max_size: int) -> None:
+    """Set the maximum number of words for which the number of syllables is kept
+    in memory. Set to 0 to disable caching.
+
+    Args:
+        max_size (int): Maximum number of words to keep in memory.
+    """
+    _SYLLABLE_CACHE.resize(max_size)
+
+
+def clear_syllable_cache() -> None:
+    """Remove all words from the syllable cache."""
+    _SYLLABLE_CACHE.clear()
+
+
+def save_syllable_cache(path: Union[str, Path]) -> None:
+    """Save the syllable cache to a JSON file, such that it can be reused in a
+    later run with `load_syllable_cache`.
+
+    Args:
+        path (Union[str, Path]): Path of the file to write.
+
+    Example:
+        >>> import textdescriptives as td
+        >>> td.load_syllable_cache("syllables.json")
+        >>> df = td.extract_metrics(texts, lang="en", metrics=["readability"])
+        >>> td.save_syllable_cache("syllables.json")
+    """
+    _SYLLABLE_CACHE.save(path)
+
+
+def load_syllable_cache(path: Union[str, Path]) -> None:
+    """Load words saved with `save_syllable_cache` into the syllable cache.
+
+    Args:
+        path (Union[str, Path]): Path of the file to read.
+    """
+    _SYLLABLE_CACHE.load(path)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+import spacy
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from textdescriptives.integrations.arrow import (  # noqa: E402
+    _extend_schema,
+    _label_columns,
+    _to_record_batch,
+    _write_atomically,
+    extract_to_arrow_ipc,
+    extract_to_parquet,
+    get_arrow_schema,
+)
+
+TEXTS = [f"This is text number {i}. It has two sentences." for i in range(5)]
+
+
+def test_get_arrow_schema():
+    schema = get_arrow_schema(lang="en", metrics="descriptive_stats")
+    assert schema.field("text").type == pa.string()
+    assert schema.field("n_tokens").type == pa.int64()
+    assert schema.field("token_length_mean").type == pa.float64()
+
+
+def test_extract_to_parquet(tmp_path):
+    path = tmp_path / "metrics.parquet"
+    schema = extract_to_parquet(
+        (text for text in TEXTS),
+        path,
+        lang="en",
+        metrics="readability",
+        row_group_size=2,
+    )
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.schema == schema
+    assert table.num_rows == len(TEXTS)
+    assert table.column("text").to_pylist() == TEXTS
+
+
+def test_extract_to_arrow_ipc(tmp_path):
+    path = tmp_path / "metrics.arrows"
+    extract_to_arrow_ipc(TEXTS, path, lang="en", metrics="readability", batch_size=2)
+    with pa.OSFile(str(path), "rb") as source:
+        table = pa.ipc.open_stream(source).read_all()
+    assert table.num_rows == len(TEXTS)
+    assert "lix" in table.column_names
+
+
+def test_schema_is_extended_with_first_batch():
+    schema = pa.schema([("text", pa.string()), ("n_tokens", pa.int64())])
+    first = pd.DataFrame({"text": ["a"], "n_tokens": [1], "pos_prop_NOUN": [0.5]})
+    schema = _extend_schema(schema, first)
+    assert schema.names == ["text", "n_tokens", "pos_prop_NOUN"]
+    batch = _to_record_batch(pd.DataFrame({"text": ["b"], "n_tokens": [2]}), schema)
+    assert batch.column("pos_prop_NOUN").to_pylist() == [None]
+    with pytest.raises(ValueError, match="pos_prop_VERB"):
+        _to_record_batch(pd.DataFrame({"text": ["c"], "pos_prop_VERB": [0.1]}), schema)
+
+
+def test_label_columns():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("attribute_ruler")
+    nlp.add_pipe("textdescriptives/pos_proportions", config={"add_all_tags": False})
+    assert "pos_prop_NOUN" in _label_columns(nlp)
+    assert len(_label_columns(nlp)) == 17
+
+
+def test_failed_write_leaves_no_file(tmp_path):
+    path = tmp_path / "metrics.parquet"
+    with pytest.raises(ValueError):
+        with _write_atomically(path) as tmp:
+            with open(tmp, "wb") as f:
+                f.write(b"truncated")
+            raise ValueError("a later batch failed")
+    assert list(tmp_path.iterdir()) == []
+
+    with _write_atomically(path) as tmp:
+        with open(tmp, "wb") as f:
+            f.write(b"complete")
+    assert path.read_bytes() == b"complete"
+    assert list(tmp_path.iterdir()) == [path]
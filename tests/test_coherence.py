@@ -7,6 +7,7 @@ import pytest
 import spacy
 
 import textdescriptives as td  # noqa: F401
+from textdescriptives.components.coherence import _sentence_keys
 
 
 @pytest.fixture(scope="function")
@@ -94,3 +95,42 @@ def test_no_warnings(nlp):
     with warnings.catch_warnings():
         warnings.simplefilter("error")  # raise error is warning is raised
         doc = nlp("hello there!")  # noqa F841
+
+
+def test_coherence_max_order():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("textdescriptives/coherence", config={"max_order": 3})
+    rng = np.random.default_rng(0)
+    for word in ["dogs", "cats", "are", "animals", "houses", "pancakes"]:
+        nlp.vocab.set_vector(word, rng.normal(size=10).astype("f"))
+
+    doc = nlp(
+        "Dogs are animals. Cats are animals. Houses are pancakes. Dogs are animals."
+        + " Unknown words.",
+    )
+    sents = list(doc.sents)
+    for order in range(1, 4):
+        expected = [sent.similarity(other) for sent, other in zip(sents, sents[order:])]
+        assert doc._.coherence_values[order] == pytest.approx(expected, abs=1e-6)
+    # identical sentences and sentences without vectors
+    assert doc._.coherence_values[3][0] == 1.0
+    assert doc._.first_order_coherence_values[-1] == 0.0
+    assert set(doc._.coherence) == {
+        "first_order_coherence",
+        "second_order_coherence",
+        "third_order_coherence",
+    }
+
+
+def test_sentence_keys_without_sentence_boundaries():
+    nlp = spacy.blank("en")
+    doc = nlp("Dogs are animals. Cats are animals.")
+    # like Doc.sents, rather than failing on the missing boundaries
+    with pytest.raises(ValueError, match="Sentence boundaries unset"):
+        _sentence_keys(doc)
+
+    doc.user_hooks["sents"] = lambda doc: iter([doc[0:4], doc[4:]])
+    keys = _sentence_keys(doc)
+    assert len(keys) == 2
+    assert keys[0] != keys[1]
@@ -0,0 +1,49 @@
+"""Tests for counting duplicates across a corpus."""
+
+from __future__ import annotations
+
+import textdescriptives as td
+
+from .books import flatland, oliver_twist, secret_garden
+
+
+def test_corpus_duplicate_chr_fractions(tmp_path):
+    """Test that only lines and paragraphs shared between documents are
+    duplicates."""
+    footer = "Copyright Example Inc."
+    texts = [
+        oliver_twist[:500] + "\n\n" + footer,
+        flatland[:500] + "\n\n" + footer,
+        secret_garden[:500],
+    ]
+    counter = td.CorpusDuplicateCounter(width=2**16)
+    counter.update(iter(texts))
+    assert counter.n_documents == 3
+
+    fractions = list(counter.iter_duplicate_chr_fractions(texts))
+    expected = len(footer) / len(texts[0])
+    assert fractions[0]["corpus_duplicate_line_chr_fraction"] == expected
+    assert fractions[0]["corpus_duplicate_paragraph_chr_fraction"] == expected
+    assert fractions[2] == {
+        "corpus_duplicate_line_chr_fraction": 0.0,
+        "corpus_duplicate_paragraph_chr_fraction": 0.0,
+    }
+    assert (
+        counter.duplicate_chr_fractions(texts[0], min_count=3)[
+            "corpus_duplicate_line_chr_fraction"
+        ]
+        == 0.0
+    )
+
+    # the file is written to the given path, with or without a .npz suffix
+    for path in [tmp_path / "counts.npz", tmp_path / "counts"]:
+        counter.save(path)
+        loaded = td.CorpusDuplicateCounter.load(path)
+        assert list(loaded.count([footer, "unseen line"])) == [2, 0]
+        assert (loaded.width, loaded.depth) == (counter.width, counter.depth)
+
+
+def test_corpus_duplicates_counted_once_per_document():
+    counter = td.CorpusDuplicateCounter(width=2**16)
+    counter.update(["a line\na line\nanother line", "different"])
+    assert list(counter.count(["a line"])) == [1]
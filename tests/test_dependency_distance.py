@@ -4,6 +4,7 @@ import ftfy
 import numpy as np
 import pytest
 import spacy
+from spacy.tokens import Doc
 
 import textdescriptives as td  # noqa: F401
 
@@ -123,3 +124,38 @@ def test_dependency_distance_multi_process(nlp):
     docs = nlp.pipe(texts, n_process=3)
     for doc in docs:
         assert doc._.dependency_distance
+
+
+def test_dependency_distance_from_arrays():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("textdescriptives/dependency_distance")
+    # two sentences: "a b c ." with root "b", and "d e" with root "e"
+    doc = Doc(
+        nlp.vocab,
+        words=["a", "b", "c", ".", "d", "e"],
+        heads=[1, 1, 1, 1, 5, 5],
+        deps=["dep", "ROOT", "dep", "punct", "dep", "ROOT"],
+    )
+    distances = [token._.dependency_distance["dependency_distance"] for token in doc]
+    assert distances == [1, 0, 1, 2, 1, 0]
+    assert doc[3]._.dependency_distance["adjacent_dependency"] is False
+
+    assert doc[0:4]._.dependency_distance == {
+        "dependency_distance_mean": 1.0,
+        "prop_adjacent_dependency_relation": 0.5,
+    }
+    # sentence means of 1.0 and 0.5, and proportions of 0.5 and 0.5
+    assert doc._.dependency_distance == pytest.approx(
+        {
+            "dependency_distance_mean": 0.75,
+            "dependency_distance_std": 0.25,
+            "prop_adjacent_dependency_relation_mean": 0.5,
+            "prop_adjacent_dependency_relation_std": 0.0,
+        },
+    )
+
+    # the distances follow edits of the parse once the Doc is processed again
+    doc[3].head = doc[2]
+    nlp.get_pipe("textdescriptives/dependency_distance")(doc)
+    assert doc[3]._.dependency_distance["dependency_distance"] == 1
+    assert doc[0:4]._.dependency_distance["prop_adjacent_dependency_relation"] == 0.75
@@ -6,7 +6,9 @@ import ftfy
 import pytest
 from spacy.lang.en import English
 
+import textdescriptives as td
 from textdescriptives.components import DescriptiveStatistics  # noqa: F401
+from textdescriptives.components.utils import _SYLLABLE_CACHE, SyllableCache
 
 from .books import flatland, oliver_twist, secret_garden
 
@@ -107,3 +109,38 @@ def test_descriptive_multi_process(nlp):
     docs = nlp.pipe(texts, n_process=3)
     for doc in docs:
         assert doc._.descriptive_stats
+
+
+def test_descriptive_stats_memoized(nlp):
+    doc = nlp("This is a short sentence. And one more sentence.")
+    counts = doc._.counts
+    assert doc._.counts is counts
+    assert doc.user_data[("textdescriptives", "counts")] == counts
+
+    # retokenizing the doc invalidates the memoized values when it is processed
+    # by the component again
+    with doc.retokenize() as retokenizer:
+        retokenizer.merge(doc[0:2])
+    nlp.get_pipe("textdescriptives/descriptive_stats")(doc)
+    assert doc._.counts["n_tokens"] == counts["n_tokens"] - 1
+
+
+def test_syllable_cache(nlp, tmp_path):
+    td.clear_syllable_cache()
+    doc = nlp("Antidisestablishmentarianism is a word. A word indeed.")
+    expected = doc._._n_syllables
+    assert len(_SYLLABLE_CACHE) == 5
+
+    path = tmp_path / "syllables.json"
+    td.save_syllable_cache(path)
+    cache = SyllableCache(max_size=2)
+    cache.load(path)
+    # only the most recently used words are kept
+    assert len(cache) == 2
+    assert cache.count(["antidisestablishmentarianism", "word"], lang="en") == [
+        expected[0],
+        1,
+    ]
+
+    td.clear_syllable_cache()
+    assert nlp(doc.text)._._n_syllables == expected
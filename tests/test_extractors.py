@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import numpy as np
+import pandas as pd
 import pytest
 import spacy
 
 import textdescriptives as td
-from textdescriptives.utils import _create_spacy_pipeline, _download_spacy_model
+from textdescriptives.extractors import ColumnarResultBuilder
+from textdescriptives.utils import (
+    _PIPELINE_POOL,
+    _create_spacy_pipeline,
+    _download_spacy_model,
+)
 
 # pylint: disable=missing-function-docstring
 
@@ -195,3 +202,103 @@ def test_extract_metrics_multiple_metrics():
 def test_extract_metrics_all_metrics(text: str):
     df = td.extract_metrics(text=text, spacy_model="en_core_web_sm", metrics=None)
     assert "n_tokens" in df.columns
+
+
+def test_extract_metrics_reuses_pipeline():
+    td.clear_pipeline_pool()
+    text = "This is just a cute little text. Actually, it's two sentences."
+    df = td.extract_metrics(text, metrics="readability", lang="en")
+    assert len(_PIPELINE_POOL) == 1
+    df_stats = td.extract_metrics(text, metrics="descriptive_stats", lang="en")
+    assert len(_PIPELINE_POOL) == 2
+    assert "lix" not in df_stats.columns
+    # reusing the first pipeline restores its extensions
+    df2 = td.extract_metrics(text, metrics="readability", lang="en")
+    assert len(_PIPELINE_POOL) == 2
+    assert df.equals(df2)
+
+
+def test_pipeline_pool_evicts_least_recently_used():
+    td.clear_pipeline_pool()
+    td.set_pipeline_pool_size(1)
+    try:
+        td.extract_metrics("A text.", metrics="readability", lang="en")
+        td.extract_metrics("A text.", metrics="descriptive_stats", lang="en")
+        assert len(_PIPELINE_POOL) == 1
+        assert (None, "en", "lg", frozenset(["descriptive_stats"])) in _PIPELINE_POOL
+    finally:
+        td.set_pipeline_pool_size(4)
+        td.clear_pipeline_pool()
+
+
+def test_extraction_plan():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("textdescriptives/descriptive_stats")
+    docs = list(nlp.pipe(["A short text.", "Another text. With two sentences."]))
+    plan = td.ExtractionPlan(metrics="descriptive_stats", include_text=False)
+    rows = plan.extract(docs)
+    assert rows == td.extract_dict(
+        docs, metrics="descriptive_stats", include_text=False
+    )
+    assert "text" not in rows[0]
+    assert rows[1]["n_sentences"] == 2
+    with pytest.raises(ValueError):
+        td.ExtractionPlan(metrics="not_a_metric")
+
+
+@pytest.mark.parametrize("batch_size", [None, 1, 2])
+def test_extract_iter(batch_size):
+    texts = (f"This is text number {i}. It has two sentences." for i in range(3))
+    rows = td.extract_iter(
+        texts,
+        lang="en",
+        metrics="descriptive_stats",
+        batch_size=batch_size,
+    )
+    if batch_size is None:
+        rows = list(rows)
+    else:
+        batches = list(rows)
+        assert all(len(batch) <= batch_size for batch in batches)
+        rows = [row for batch in batches for row in batch]
+    assert len(rows) == 3
+    assert rows[2]["text"] == "This is text number 2. It has two sentences."
+    assert rows[0]["n_sentences"] == 2
+
+
+def test_columnar_result_builder():
+    rows = [
+        {"text": "a", "n_tokens": 1, "lix": 2.5, "passed": True},
+        {"text": "b", "n_tokens": 2, "lix": None, "passed": False},
+        {"text": "c", "lix": 1.0, "passed": True, "pos_prop_X": 0.5},
+    ]
+    builder = ColumnarResultBuilder(chunk_size=1)
+    builder.extend(rows)
+    df = builder.to_df()
+    expected = pd.DataFrame(rows)
+    assert list(df.columns) == list(expected.columns)
+    assert df.dtypes.to_dict() == expected.dtypes.to_dict()
+    assert df.equals(expected)
+
+
+def test_columnar_result_builder_does_not_copy_numeric_columns():
+    builder = ColumnarResultBuilder(chunk_size=2)
+    builder.extend([{"lix": 1.0, "mixed": None}, {"lix": 2.0, "mixed": None}])
+    builder.append({"lix": 3.0, "mixed": 1.5})
+    df = builder.to_df()
+    assert np.shares_memory(df["lix"].to_numpy(), builder._columns["lix"])
+    # the column of only None values is upcast to object and inferred as float
+    assert df["mixed"].dtype == np.float64
+
+
+def test_extract_metrics_multi_process():
+    texts = [f"This is text number {i}. It has two sentences." for i in range(6)]
+    df = td.extract_metrics(texts, metrics="readability", lang="en")
+    df_multi = td.extract_metrics(
+        texts,
+        metrics="readability",
+        lang="en",
+        n_process=2,
+        batch_size=2,
+    )
+    assert df.equals(df_multi)
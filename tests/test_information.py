@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import pickle
+
 import numpy as np
 import pytest
 import spacy
+from spacy.lookups import Lookups
 
 import textdescriptives as td
 from textdescriptives.components.information_theory import (
     entropy_getter,
+    lexeme_log_probs,
     per_word_perplexity_getter,
     perplexity_getter,
     set_lexeme_prob_table,
@@ -31,6 +35,53 @@ def test_unigram_information_metrics(nlp):  # noqa F811
     assert entropy_getter(doc1) > entropy_getter(doc2)
 
 
+def test_lexeme_log_probs(nlp):  # noqa F811
+    set_lexeme_prob_table(nlp.vocab)
+    doc = nlp("This is a unlikely sentence sadsatrsxss.")
+    np.testing.assert_array_equal(
+        lexeme_log_probs(doc),
+        [token.prob for token in doc],
+    )
+    span = doc[2:5]
+    np.testing.assert_array_equal(
+        lexeme_log_probs(span),
+        [token.prob for token in span],
+    )
+
+    # changing a probability after the first use updates the log probabilities
+    # of the pipeline, but not those of other pipelines of the language
+    prob = nlp.vocab["sentence"].prob
+    nlp.vocab["sentence"].prob = -1.0
+    assert lexeme_log_probs(doc)[4] == -1.0
+    other_nlp = spacy.blank("en")
+    set_lexeme_prob_table(other_nlp.vocab)
+    assert other_nlp.vocab["sentence"].prob == prob
+    assert lexeme_log_probs(other_nlp("sentence"))[0] == prob
+
+    # the probabilities set on the table are kept when it is serialized
+    for copy in [
+        pickle.loads(pickle.dumps(nlp.vocab.lookups)),
+        Lookups().from_bytes(nlp.vocab.lookups.to_bytes()),
+    ]:
+        table = copy.get_table("lexeme_prob")
+        assert table["sentence"] == -1.0
+        assert table["this"] == nlp.vocab["this"].prob
+        assert len(table) == len(nlp.vocab.lookups.get_table("lexeme_prob"))
+
+
+def test_lexeme_log_probs_custom_table():
+    nlp = spacy.blank("xx")
+    table = nlp.vocab.lookups.add_table("lexeme_prob", {"a": -1.0})
+    doc = nlp("a b")
+    np.testing.assert_array_equal(lexeme_log_probs(doc), [-1.0, -20.0])
+    # words added to the table or changed are used
+    nlp.vocab["b"].prob = -2.0
+    np.testing.assert_array_equal(lexeme_log_probs(doc), [-1.0, -2.0])
+    nlp.vocab["a"].prob = -3.0
+    np.testing.assert_array_equal(lexeme_log_probs(doc), [-3.0, -2.0])
+    assert nlp.vocab.lookups.get_table("lexeme_prob") is table
+
+
 def test_extract_df(nlp):  # noqa F811
     _remove_textdescriptives_extensions()
     nlp.add_pipe("textdescriptives/information_theory")
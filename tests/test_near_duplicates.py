@@ -0,0 +1,75 @@
+"""Tests for the near-duplicate index."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import spacy
+
+import textdescriptives as td
+
+from .books import flatland, oliver_twist
+
+
+@pytest.fixture
+def nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe(
+        "textdescriptives/quality",
+        config={
+            "force": True,
+            "top_ngram_range": (2, 4),
+            "duplicate_n_gram_fraction_range": (5, 10),
+        },
+    )
+    return nlp
+
+
+def test_minhash_jaccard():
+    """Test that the signatures estimate the Jaccard similarity."""
+    rng = np.random.default_rng(0)
+    index = td.MinHashLSH(threshold=0.5, num_perm=256)
+    shingles = rng.integers(0, 2**63, 1000, dtype=np.uint64)
+    index.insert(index.signature(shingles))
+    # 900 shared shingles out of 1100 distinct
+    similar = np.concatenate(
+        [shingles[:900], rng.integers(0, 2**63, 100, dtype=np.uint64)],
+    )
+    assert abs(index.jaccard(index.signature(similar)) - 900 / 1100) < 0.1
+    different = rng.integers(0, 2**63, 1000, dtype=np.uint64)
+    assert index.query(index.signature(different)) == []
+    assert index.jaccard(index.signature(different)) == 0.0
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_quality_near_duplicates(nlp: spacy.Language, tmp_path, in_memory: bool):
+    """Test that near-duplicates of earlier documents fail the quality check."""
+    quality_pipe = nlp.get_pipe("textdescriptives/quality")
+    quality_pipe.set_quality_thresholds(
+        td.QualityThresholds(
+            near_duplicate_jaccard=(None, 0.8),
+            duplicate_ngram_chr_fraction={},
+        ),
+    )
+    path = None if in_memory else tmp_path / "index.db"
+    texts = [oliver_twist[:2000], flatland[:2000], oliver_twist[:1990] + " The end."]
+    with td.MinHashLSH(threshold=0.8, path=path) as index:
+        quality_pipe.set_near_duplicate_index(index)
+        docs = list(nlp.pipe(texts))
+        assert len(index) == 3
+    similarities = [doc._.quality.near_duplicate_jaccard.value for doc in docs]
+    assert similarities[:2] == [0.0, 0.0]
+    assert similarities[2] > 0.8
+    assert "near_duplicate_jaccard" in docs[2]._.quality_result.failed_checks()
+
+    if not in_memory:
+        # the index is stored and can be reopened
+        assert len(td.MinHashLSH(threshold=0.8, path=path)) == 3
+
+
+def test_quality_without_near_duplicate_index(nlp: spacy.Language):
+    doc = nlp("This is a test. This is a test. This is a test.")
+    assert doc._.quality.near_duplicate_jaccard is None
+    # the metric is not part of the outputs without an index
+    assert "near_duplicate_jaccard" not in doc._.quality_result.to_flat_value_dict()
+    assert "near_duplicate_jaccard" not in doc._.quality.to_flat_value_dict()
@@ -0,0 +1,114 @@
+"""Tests for the n-gram language model and its use in the information theory
+component."""
+
+from __future__ import annotations
+
+import pickle
+from collections import Counter
+
+import numpy as np
+import pytest
+import spacy
+
+import textdescriptives as td
+from textdescriptives.components.ngram_lm import _NgramCounts
+
+from .books import flatland, oliver_twist, secret_garden
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("models") / "bigram"
+    texts = (oliver_twist + flatland + secret_garden).split("\n\n")
+    td.NgramLanguageModel.train(texts, path, spacy.blank("en"), order=2)
+    return path
+
+
+def test_ngram_model_probabilities(model_path):
+    model = td.NgramLanguageModel(model_path)
+    assert model.order == 2
+    assert model._keys[0].dtype == np.uint64
+    assert model._log_probs[0].dtype == np.float16
+    assert isinstance(model._keys[0], np.memmap)
+
+    # the probabilities of all words following a context sum to one
+    nlp = spacy.blank("en")
+    context = nlp.make_doc("the").to_array("LOWER")
+    words = np.append(np.asarray(model._keys[0]), np.uint64(42))
+    sequences = np.stack([np.repeat(context, len(words)), words], axis=1)
+    probs = np.exp([model.token_log_probs(sequence)[-1] for sequence in sequences])
+    assert probs.sum() == pytest.approx(1, abs=1e-2)
+
+    likely = model(nlp("The old man was tired."))
+    unlikely = model(nlp("Tired man the old was."))
+    assert likely.shape == (6,)
+    assert likely.sum() > unlikely.sum()
+
+    # the model is reopened rather than copied when pickled
+    copy = pickle.loads(pickle.dumps(model))
+    np.testing.assert_array_equal(copy(nlp("The old man.")), model(nlp("The old man.")))
+
+
+def test_information_theory_ngram_model(model_path):
+    # a language without a lexeme probability table
+    nlp = spacy.blank("hr")
+    nlp.add_pipe(
+        "textdescriptives/information_theory",
+        config={"ngram_model": str(model_path)},
+    )
+    doc = nlp("The old man was tired. Zorblax quuxed the flimflam.")
+    assert not np.isnan(doc._.perplexity)
+    assert doc._.information_theory["entropy"] == doc._.entropy
+
+    # spans use the probabilities of the tokens given the preceding tokens
+    log_probs = td.NgramLanguageModel(model_path)(doc)
+    span = doc[2:5]
+    expected = -np.sum(np.exp(log_probs[2:5]) * log_probs[2:5])
+    assert span._.entropy == pytest.approx(expected)
+
+
+def test_ngram_counts_are_merged():
+    rng = np.random.default_rng(0)
+    batches = [rng.integers(0, 50, 20).astype(np.uint64) for _ in range(10)]
+    counts = _NgramCounts(merge_size=10)
+    n_merges = 0
+    for batch in batches:
+        counts.add(batch, batch + np.uint64(1))
+        n_merges += counts._n_pending == 0
+    counts.merge()
+    assert n_merges >= 2
+    expected = Counter(np.concatenate(batches).tolist())
+    assert dict(zip(counts.keys.tolist(), counts.counts.tolist())) == expected
+    np.testing.assert_array_equal(counts.contexts, counts.keys + np.uint64(1))
+
+
+def test_train_multi_batch_corpus(tmp_path):
+    nlp = spacy.blank("en")
+    texts = (oliver_twist + flatland).split("\n\n")
+    model = td.NgramLanguageModel.train(
+        texts,
+        tmp_path / "model",
+        nlp,
+        order=2,
+        batch_size=3,
+        merge_size=100,
+    )
+    tokens = Counter(token.lower for doc in nlp.tokenizer.pipe(texts) for token in doc)
+    assert model.n_tokens == sum(tokens.values())
+    assert sorted(model._keys[0].tolist()) == sorted(tokens)
+    n_types, discount = len(tokens), model.discount
+    uniform = discount * n_types / model.n_tokens / (n_types + 1)
+    expected = [
+        np.log((tokens[key] - discount) / model.n_tokens + uniform)
+        for key in model._keys[0].tolist()
+    ]
+    np.testing.assert_allclose(model._log_probs[0], expected, rtol=1e-3)
+
+    # retraining with a lower order replaces the files of the previous model
+    model = td.NgramLanguageModel.train(texts, tmp_path / "model", nlp, order=1)
+    assert model.order == 1
+    assert sorted(file.name for file in (tmp_path / "model").iterdir()) == [
+        "1_keys.npy",
+        "1_log_probs.npy",
+        "meta.json",
+    ]
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import itertools
+
+import pandas as pd
 import pytest
 import spacy
+from spacy.tokens import Doc
 
 import textdescriptives as td
 from textdescriptives.components.quality import (
@@ -11,6 +15,8 @@ from textdescriptives.components.quality import (
     duplicate_ngram_fraction,
     mean_word_length,
     n_stop_words,
+    ngram_hashes,
+    ngram_index,
     oov_ratio,
     proportion_bullet_points,
     proportion_ellipsis,
@@ -178,6 +184,42 @@ def test_top_ngram_chr_fraction(
         assert abs(i - j) < 0.01
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "This is a test. This is a test. This is not a test.",
+        "a b a  b a\nb ab a b",
+    ],
+)
+def test_ngram_hashes(text: str, nlp: spacy.Language):
+    """Test that n-grams have the same hash if and only if they have the same
+    text."""
+    doc = nlp(text)
+    for n, hashes in ngram_hashes(doc, ngram_range=(1, 4)).items():
+        ngram_texts = [doc[i : i + n].text for i in range(len(doc) - n + 1)]
+        assert len(hashes) == len(ngram_texts)
+        for i, j in itertools.combinations(range(len(hashes)), 2):
+            assert (hashes[i] == hashes[j]) == (ngram_texts[i] == ngram_texts[j])
+
+
+def test_ngram_index_shared_by_spans(nlp: spacy.Language):
+    """Test that the n-gram hashes of a span are a slice of those of its doc."""
+    doc = nlp("This is a test. This is a test. Once upon a time.")
+    index = ngram_index(doc)
+    doc_hashes = ngram_hashes(doc, ngram_range=(1, 3))
+    span_hashes = ngram_hashes(doc[2:9], ngram_range=(1, 3))
+    for n, hashes in span_hashes.items():
+        assert list(hashes) == list(doc_hashes[n][2 : 9 - n + 1])
+    assert ngram_index(doc) is index
+
+
+def test_duplicate_ngram_chr_fraction_span(nlp: spacy.Language):
+    """Test that the duplicate n-grams of a span are found within the span."""
+    doc = nlp("Once upon a time. This is a test. This is a test.")
+    span = doc[5:]
+    assert duplicate_ngram_fraction(span, ngram_range=(4, 4)) == {4: 1.0}
+
+
 def test_quality_component(nlp: spacy.Language):
     """Test the quality component."""
     nlp.add_pipe("textdescriptives/quality", config={"force": True})
@@ -196,6 +238,103 @@ def test_quality_component(nlp: spacy.Language):
     assert quality.passed is False
 
 
+def test_quality_result(nlp: spacy.Language):
+    """Test that the quality result matches the quality output, also after
+    serialization."""
+    nlp.add_pipe(
+        "textdescriptives/quality",
+        config={
+            "force": True,
+            "top_ngram_range": (2, 4),
+            "duplicate_n_gram_fraction_range": (5, 10),
+        },
+    )
+    doc = nlp("This is a test. This is a test. This is a test.")
+    result = doc._.quality_result
+    assert result.to_flat_value_dict() == doc._.quality.to_flat_value_dict()
+    assert result.passed == doc._.passed_quality_check
+    assert result.to_output() == doc._.quality
+
+    doc_copy = Doc(nlp.vocab).from_bytes(doc.to_bytes())
+    assert doc_copy._.quality == doc._.quality
+
+    span = doc[:5]
+    assert span._.quality_result.to_flat_value_dict() == (
+        span._.quality.to_flat_value_dict()
+    )
+
+
+def test_apply_quality_thresholds(nlp: spacy.Language):
+    """Test that thresholds applied to extracted values match the component."""
+    quality_pipe = nlp.add_pipe(
+        "textdescriptives/quality",
+        config={
+            "force": True,
+            "top_ngram_range": (2, 4),
+            "duplicate_n_gram_fraction_range": (5, 10),
+        },
+    )
+    texts = [
+        "This is a test. This is a test. This is a test.",
+        "The world is changed. I feel it in the water. I feel it in the earth.",
+        "lorem ipsum dolor sit amet, consectetur adipiscing elit",
+        "#hashtag #text #only",
+    ]
+    docs = list(nlp.pipe(texts))
+    df = pd.DataFrame([doc._.quality_result.to_flat_value_dict() for doc in docs])
+
+    thresholds = td.QualityThresholds(
+        n_stop_words=(3, None),
+        top_ngram_chr_fraction={"2": (None, 0.6)},
+    )
+    quality_pipe.set_quality_thresholds(thresholds)
+    checks = td.apply_quality_thresholds(df, thresholds)
+    expected = [doc._.passed_quality_check for doc in nlp.pipe(texts)]
+    assert checks["passed_quality_check"].tolist() == expected
+    assert checks["n_stop_words"].tolist() == [True, True, False, False]
+
+    compiled = td.CompiledQualityThresholds(thresholds)
+    # near_duplicate_jaccard is not extracted without an index
+    matrix = df.reindex(columns=compiled.columns).to_numpy(dtype=float)
+    assert compiled(matrix)["passed_quality_check"].tolist() == expected
+
+    with pytest.raises(ValueError):
+        compiled(df.drop(columns="n_stop_words"))
+
+
+def test_quality_failure_mask(nlp: spacy.Language):
+    """Test that the failure mask records which checks failed."""
+    quality_pipe = nlp.add_pipe(
+        "textdescriptives/quality",
+        config={
+            "force": True,
+            # n-gram sizes without a threshold are computed, but have no bit
+            "top_ngram_range": (2, 6),
+            "duplicate_n_gram_fraction_range": (3, 10),
+        },
+    )
+    assert quality_pipe.check_names == td.quality_check_names(td.QualityThresholds())
+    doc = nlp("This is a test. This is a test. This is a test.")
+    failed = doc._.quality_result.failed_checks()
+    assert failed[:2] == ["mean_word_length", "duplicate_ngram_chr_fraction_5"]
+    assert doc._.quality_failure_mask == sum(
+        1 << quality_pipe.check_names.index(name) for name in failed
+    )
+    assert doc._.quality.failure_mask == doc._.quality_failure_mask
+
+    df = pd.DataFrame([doc._.quality_result.to_flat_value_dict()])
+    checks = td.apply_quality_thresholds(df)
+    assert checks["quality_failure_mask"].tolist() == [doc._.quality_failure_mask]
+
+
+def test_quality_check_names_fit_in_int64():
+    thresholds = td.QualityThresholds(contains={str(i): False for i in range(50)})
+    with pytest.raises(ValueError, match="failure mask"):
+        td.quality_check_names(thresholds)
+    with pytest.raises(ValueError, match="failure mask"):
+        td.CompiledQualityThresholds(thresholds)
+
+
 def test_quality_component_with_config(nlp: spacy.Language):
     """Test the quality component with config."""
     quality_thresholds = td.QualityThresholds(
@@ -261,6 +400,36 @@ def test_passed_quality_check(text: str, passed: bool, nlp: spacy.Language):
     assert doc._.passed_quality_check == passed
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "This is a reasonable text, which has a very good sentence structure and "
+        + "will therefore pass the quality check.",
+        "This is repitious text, This is repitious text, This is repitious text.",
+        "lorem ipsum is a placeholder text, which is commonly used in design.",
+    ],
+)
+def test_quality_filter_mode(text: str, nlp: spacy.Language):
+    """Test that filter mode decides passed_quality_check like the full
+    evaluation, but does not compute the metrics after the first failure."""
+    full_nlp = spacy.blank("en")
+    full_nlp.add_pipe("textdescriptives/quality", config={"force": True})
+    expected = full_nlp(text)._.passed_quality_check
+
+    nlp.add_pipe("textdescriptives/quality", config={"filter_mode": True})
+    doc = nlp(text)
+    assert doc._.passed_quality_check == expected
+    quality = doc._.quality
+    if expected:
+        assert all(v.value is not None for v in quality.top_ngram_chr_fraction.values())
+    else:
+        # the n-grams are the most expensive metrics and computed last
+        assert all(
+            v.value is None for v in quality.duplicate_ngram_chr_fraction.values()
+        )
+
+
 def test_quality_multi_process(nlp):
     texts = [
         "A couple of texts here, yeah yeah yeah.",
@@ -293,3 +462,37 @@ def test_oov_ratio_small_model():
     nlp.add_pipe("textdescriptives/quality")
     doc = nlp("This is a test")
     assert doc._.quality.oov_ratio.value is None
+
+
+@pytest.mark.parametrize(
+    "text, passed",
+    [
+        ("", False),
+        ("Too short", False),
+        ("lorem ipsum dolor sit amet, consectetur adipiscing elit", False),
+        ("- a point\n- another point\n- and one more", False),
+        ("This line repeats.\nThis line repeats.\nThis line repeats.", False),
+        ("#great #day #at #the #beach, with #friends", False),
+        ("###### " * 5, True),  # no words, so the symbol ratio is 0
+        (
+            "This is a reasonable text, which has a very good sentence structure and "
+            + "will therefore pass the quality check.",
+            True,
+        ),
+    ],
+)
+def test_quality_prefilter(text: str, passed: bool):
+    assert list(td.quality_prefilter([text])) == ([text] if passed else [])
+    assert list(td.quality_prefilter([(text, 0)], as_tuples=True)) == (
+        [(text, 0)] if passed else []
+    )
+
+
+def test_quality_prefilter_thresholds():
+    thresholds = td.QualityThresholds(contains={"cat": True}, doc_length=(1, 5))
+    texts = [
+        "A text about a cat.",
+        "A text about a dog.",
+        "one two three four five six",
+    ]
+    assert list(td.quality_prefilter(texts, thresholds)) == texts[:1]
@@ -7,6 +7,7 @@ import numpy as np
 import pytest
 import spacy
 from spacy.lang.en import English
+from spacy.tokens import Doc
 
 from textdescriptives.utils import _remove_textdescriptives_extensions  # noqa: F401
 
@@ -225,3 +226,16 @@ def test_language_not_in_pyphen():
     doc = nlp("Tämä on suomenkielinen lause.")
 
     assert np.isnan(doc._.readability["flesch_reading_ease"])
+
+
+def test_readability_eager():
+    _remove_textdescriptives_extensions()
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("textdescriptives/readability", config={"eager": True})
+    doc = nlp("The world is changed. I feel it in the water. I feel it in the earth.")
+    assert ("textdescriptives", "readability") in doc.user_data
+    assert ("textdescriptives", "sentence_length") in doc.user_data
+    # values are serialized with the doc
+    doc_copy = Doc(nlp.vocab).from_bytes(doc.to_bytes())
+    assert doc_copy._.readability == doc._.readability
@@ -0,0 +1,96 @@
+"""Tests for the sentence embedder and its use in the coherence component."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import spacy
+
+import textdescriptives as td
+
+
+class CountingModel:
+    """A bag-of-characters embedding model which records its calls."""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, sentences: list[str]) -> np.ndarray:
+        self.calls.append(list(sentences))
+        embeddings = np.zeros((len(sentences), 26), dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            for char in sentence.lower():
+                if "a" <= char <= "z":
+                    embeddings[i, ord(char) - ord("a")] += 1
+        return embeddings
+
+
+@pytest.fixture
+def nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("textdescriptives/coherence")
+    return nlp
+
+
+def test_sentence_embedder_cache(tmp_path):
+    model = CountingModel()
+    path = tmp_path / "embeddings.db"
+    with td.SentenceEmbedder(model, batch_size=2, cache_size=2, path=path) as embedder:
+        embeddings = embedder.embed(["a b", "b c", "a b", "c d", "d e"])
+        assert embeddings.shape == (5, 26)
+        np.testing.assert_array_equal(embeddings[0], embeddings[2])
+        # each distinct sentence is embedded once, in batches of at most 2
+        assert model.calls == [["a b", "b c"], ["c d", "d e"]]
+        assert len(embedder) == 2
+        # evicted sentences are read from the database
+        embedder.embed(["a b", "d e"])
+        assert len(model.calls) == 2
+
+    model = CountingModel()
+    embedder = td.SentenceEmbedder(model, path=path)
+    embedder.add(["x y"], np.ones((1, 26)))
+    np.testing.assert_array_equal(embedder.embed(["x y", "b c"])[0], np.ones(26))
+    assert model.calls == []
+
+
+def test_coherence_sentence_embedder(nlp: spacy.Language):
+    texts = [
+        "Cats are animals. Dogs are animals. Cats are animals.",
+        "A single sentence.",
+        "Cats are animals. Houses made of pancakes.",
+    ]
+    model = CountingModel()
+    coherence = nlp.get_pipe("textdescriptives/coherence")
+    coherence.set_sentence_embedder(td.SentenceEmbedder(model))
+    docs = list(nlp.pipe(texts))
+    # the sentences of all documents are embedded in one call, once each
+    assert len(model.calls) == 1
+    assert sorted(model.calls[0]) == sorted(
+        ["Cats are animals.", "Dogs are animals.", "Houses made of pancakes."],
+    )
+
+    embeddings = model(["Cats are animals.", "Dogs are animals."])
+    expected = float(
+        embeddings[0]
+        @ embeddings[1]
+        / np.linalg.norm(embeddings[0])
+        / np.linalg.norm(embeddings[1]),
+    )
+    assert docs[0]._.first_order_coherence_values == pytest.approx(
+        [expected, expected],
+    )
+    assert docs[0]._.second_order_coherence_values == pytest.approx([1.0])
+    assert np.isnan(docs[1]._.coherence["first_order_coherence"])
+    assert docs[2]._.coherence["first_order_coherence"] < expected
+
+
+def test_coherence_precomputed_embeddings(nlp: spacy.Language):
+    doc = nlp.make_doc("One. Two. Three.")
+    doc = nlp.get_pipe("sentencizer")(doc)
+    doc._.sentence_embeddings = np.array([[1, 0], [1, 1], [0, 1]])
+    nlp.get_pipe("textdescriptives/coherence")(doc)
+    assert doc._.first_order_coherence_values == pytest.approx(
+        [np.sqrt(0.5), np.sqrt(0.5)],
+    )
+    assert doc._.second_order_coherence_values == pytest.approx([0.0])
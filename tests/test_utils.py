@@ -1,6 +1,17 @@
 from __future__ import annotations
 
+import numpy as np
+import spacy
+from spacy.tokens import Doc
+
 import textdescriptives as td
+from textdescriptives.components.utils import (
+    LexemeFeatures,
+    clear_memo,
+    memoized_getter,
+    token_features,
+    validate_memo,
+)
 
 
 def test_get_valid_metrics():
@@ -20,3 +31,109 @@ def test_get_columns():
         columns_.update(columns)
     columns_all = td.get_doc_assigns("all")
     assert set(columns_all) == columns_
+
+
+def test_token_features_match_token_attributes():
+    nlp = spacy.blank("en")
+    doc = Doc(
+        nlp.vocab,
+        words=["I", "don't", "like", "cats", ".", "Dogs", "bark", "!"],
+        heads=[2, 2, 2, 2, 2, 6, 6, 6],
+        deps=["nsubj", "aux", "ROOT", "dobj", "punct", "nsubj", "ROOT", "punct"],
+        pos=["PRON", "AUX", "VERB", "NOUN", "PUNCT", "NOUN", "VERB", "PUNCT"],
+        tags=["PRP", "VBP", "VB", "NNS", ".", "NNS", "VBP", "."],
+    )
+    features = token_features(doc)
+    assert features.length.tolist() == [len(token) for token in doc]
+    assert features.is_stop.tolist() == [token.is_stop for token in doc]
+    assert features.is_punct.tolist() == [token.is_punct for token in doc]
+    assert [doc.vocab.strings[int(pos)] for pos in features.pos] == [
+        token.pos_ for token in doc
+    ]
+    assert [doc.vocab.strings[int(tag)] for tag in features.tag] == [
+        token.tag_ for token in doc
+    ]
+    assert features.head.tolist() == [token.head.i - token.i for token in doc]
+    assert features.sent_starts.tolist() == [sent.start for sent in doc.sents]
+    assert features.is_filtered.tolist() == [
+        not token.is_punct and "'" not in token.text for token in doc
+    ]
+
+    span_features = token_features(doc[2:6])
+    assert np.array_equal(span_features.head, features.head[2:6])
+    assert span_features.sent_starts is None
+
+
+def test_token_features_are_recomputed_after_edits():
+    nlp = spacy.blank("en")
+    doc = Doc(
+        nlp.vocab,
+        words=["Dogs", "bark", "at", "cats"],
+        heads=[1, 1, 1, 2],
+        deps=["nsubj", "ROOT", "prep", "pobj"],
+        pos=["NOUN", "VERB", "ADP", "NOUN"],
+    )
+    getter = memoized_getter("_test_heads", lambda doc: [t.head.i for t in doc])
+    assert getter(doc) == [1, 1, 1, 2]
+    assert token_features(doc).head.tolist() == [1, 0, -1, -1]
+
+    # edits after processing are only detected when the Doc is validated again,
+    # e.g. by a component
+    doc[3].head = doc[1]
+    assert getter(doc) == [1, 1, 1, 2]
+    validate_memo(doc)
+    assert getter(doc) == [1, 1, 1, 1]
+    assert token_features(doc).head.tolist() == [1, 0, -1, -2]
+
+    doc[0].pos_ = "PROPN"
+    assert token_features(doc).pos[0] == doc.vocab.strings["NOUN"]
+    clear_memo(doc)
+    assert token_features(doc).pos[0] == doc.vocab.strings["PROPN"]
+
+    with doc.retokenize() as retokenizer:
+        retokenizer.merge(doc[2:4])
+        retokenizer.split(doc[0], ["Do", "gs"], heads=[(doc[0], 1), doc[1]])
+    validate_memo(doc)
+    assert getter(doc) == [token.head.i for token in doc]
+    assert token_features(doc).orth.tolist() == [token.orth for token in doc]
+
+
+def test_lexeme_features_are_shared_across_docs():
+    nlp = spacy.blank("en")
+    table = LexemeFeatures(capacity=1)
+    doc = nlp("I'm not 123 not")
+    orths = np.array([token.orth for token in doc], dtype=np.uint64)
+    rows = table.rows(orths, doc.vocab.strings)
+    assert rows[2] == rows[4]
+    assert len(table) == 4
+    assert table.contains_alpha[rows].tolist() == [True, True, True, False, True]
+    assert table.has_apostrophe[rows].tolist() == [False, True, False, False, False]
+
+    # types which are already in the table keep their rows
+    other_doc = spacy.blank("da")("not nu")
+    other_orths = np.array([token.orth for token in other_doc], dtype=np.uint64)
+    other_rows = table.rows(other_orths, other_doc.vocab.strings)
+    assert other_rows[0] == rows[2]
+    assert len(table) == 5
+
+
+def test_lexeme_features_evict_least_recently_used_types():
+    nlp = spacy.blank("en")
+    table = LexemeFeatures(max_size=2, capacity=1)
+    strings = nlp.vocab.strings
+    orths = np.array([strings.add(text) for text in ["a", "b", "c"]], dtype=np.uint64)
+    rows = table.rows(orths[:2], strings)
+    table.rows(orths[:1], strings)
+    # "b" is evicted and its row reused for "c"
+    assert table.rows(orths[2:], strings)[0] == rows[1]
+    assert len(table) == 2
+    # a call with more types than fit in the table keeps all of them
+    assert len(set(table.rows(orths, strings).tolist())) == 3
+
+    vocabulary = {"a", "c"}
+    assert table.in_vocabulary(orths, strings, vocabulary).tolist() == [
+        True,
+        False,
+        True,
+    ]
+    assert table.in_vocabulary(orths[1:], strings, {"b"}).tolist() == [True, False]